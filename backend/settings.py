@@ -173,15 +173,46 @@ DATABASES = {
 }
 
 
-# Cache Configuration (database cache for multi-worker support)
+# Cache Configuration
+# default:  per-process LRU with a short TTL in front of the shared tier
+# shared:   database cache visible to every worker (atomic add, strict counters)
+# throttle: per-process counters for the global DRF rate limits
 CACHES = {
     'default': {
+        'BACKEND': 'core.cache.TwoTierCache',
+        'LOCATION': 'shared',
+        'OPTIONS': {
+            'LOCAL_MAX_ENTRIES': 1024,
+            'LOCAL_TIMEOUT': 5,  # Max staleness of another worker's write, seconds
+        },
+    },
+    'shared': {
         'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
         'LOCATION': 'django_cache',
-    }
+    },
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'throttle',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
 }
 
 
+# Idempotency keys (X-Idempotency-Key on POST/PUT/PATCH)
+# Store options (core.services.idempotency):
+#   DatabaseIdempotencyStore - dedicated table, safe across workers (default)
+#   CacheIdempotencyStore    - cache.add claims; use with a shared cache (Redis)
+#   InMemoryIdempotencyStore - process-local, single-node deployments only
+# Expired rows are removed by: python manage.py purge_idempotency_keys
+IDEMPOTENCY_STORE = os.environ.get(
+    'IDEMPOTENCY_STORE', 'core.services.idempotency.DatabaseIdempotencyStore'
+)
+IDEMPOTENCY_TTL = 300  # Seconds a completed response is replayed
+IDEMPOTENCY_LOCK_TIMEOUT = 60  # Seconds before an unfinished claim can be retaken
+IDEMPOTENCY_WAIT_SECONDS = 2  # How long a duplicate waits for the original response
+IDEMPOTENCY_CACHE_ALIAS = 'shared'  # CacheIdempotencyStore needs the shared tier
+
+
 # Security Settings
 # https://docs.djangoproject.com/en/6.0/topics/security/
 
@@ -274,9 +305,10 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 50,
+    # Counted per worker process (see core.throttling)
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'core.throttling.ProcessAnonRateThrottle',
+        'core.throttling.ProcessUserRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/minute',
@@ -0,0 +1,19 @@
+"""Shared pytest fixtures."""
+import pytest
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from core.cache import TwoTierCache
+
+
+@pytest.fixture(autouse=True)
+def _reset_process_caches():
+    """Per-process cache tiers outlive the per-test database rollback; start each test empty."""
+    for alias in caches.settings:
+        backend = caches[alias]
+        if isinstance(backend, TwoTierCache):
+            backend.clear_local()
+            backend.reset_stats()
+        elif isinstance(backend, LocMemCache):
+            backend.clear()
+    yield
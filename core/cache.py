@@ -0,0 +1,200 @@
+"""
+Two-tier cache backend and versioned cache namespaces.
+
+TwoTierCache keeps a bounded, short-TTL LRU in each worker process in front of
+a shared backend (DatabaseCache today). Reads are served from process memory
+when possible; writes go to both tiers. Another worker may serve a stale local
+entry for at most LOCAL_TIMEOUT seconds after a write or delete elsewhere.
+
+Configure in settings.CACHES:
+    'default': {
+        'BACKEND': 'core.cache.TwoTierCache',
+        'LOCATION': 'shared',  # alias of the shared cache
+        'OPTIONS': {'LOCAL_MAX_ENTRIES': 1024, 'LOCAL_TIMEOUT': 5},
+    }
+
+Cached payloads that must be invalidated as a group are keyed by a namespace
+version (see cache_namespace_version / bump_cache_namespace); bumping the
+version in the shared tier makes every worker miss old keys.
+"""
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache as default_cache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# Per-process local tiers, shared by every thread's backend instance
+_local_stores = {}
+_local_stats = {}
+_local_locks = {}
+_registry_lock = threading.Lock()
+
+_MISSING = object()
+
+
+class TwoTierCache(BaseCache):
+    """Process-local LRU (first tier) in front of a shared cache alias (second tier)."""
+
+    DEFAULT_LOCAL_MAX_ENTRIES = 1024
+    DEFAULT_LOCAL_TIMEOUT = 5
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._shared_alias = location
+        self.local_max_entries = int(options.get('LOCAL_MAX_ENTRIES', self.DEFAULT_LOCAL_MAX_ENTRIES))
+        self.local_timeout = float(options.get('LOCAL_TIMEOUT', self.DEFAULT_LOCAL_TIMEOUT))
+        with _registry_lock:
+            self._local = _local_stores.setdefault(location, OrderedDict())
+            self._stats = _local_stats.setdefault(
+                location, {'hits': 0, 'misses': 0, 'evictions': 0}
+            )
+            self._lock = _local_locks.setdefault(location, threading.Lock())
+
+    @property
+    def shared(self):
+        return caches[self._shared_alias]
+
+    # --- local tier -----------------------------------------------------
+
+    def _local_expiry(self, timeout):
+        expiry = time.monotonic() + self.local_timeout
+        if timeout is not None:
+            expiry = min(expiry, time.monotonic() + timeout)
+        return expiry
+
+    def _local_get(self, local_key):
+        with self._lock:
+            entry = self._local.get(local_key)
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._local[local_key]
+                entry = None
+            if entry is None:
+                self._stats['misses'] += 1
+                return _MISSING
+            self._stats['hits'] += 1
+            self._local.move_to_end(local_key)
+            pickled = entry[0]
+        # Values are pickled like LocMemCache so callers cannot mutate cached state.
+        return pickle.loads(pickled)
+
+    def _local_set(self, local_key, value, timeout):
+        if timeout is not None and timeout <= 0:
+            self._local_delete(local_key)
+            return
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._local[local_key] = (pickled, self._local_expiry(timeout))
+            self._local.move_to_end(local_key)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def _local_delete(self, local_key):
+        with self._lock:
+            self._local.pop(local_key, None)
+
+    def _local_timeout(self, timeout):
+        """Resolve a cache timeout to seconds (None = never expires)."""
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        return timeout
+
+    # --- cache API ------------------------------------------------------
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        value = self._local_get(local_key)
+        if value is not _MISSING:
+            return value
+        value = self.shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            return default
+        # The shared tier does not expose remaining TTL; LOCAL_TIMEOUT bounds it.
+        self._local_set(local_key, value, None)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        self.shared.set(key, value, timeout=timeout, version=version)
+        self._local_set(local_key, value, self._local_timeout(timeout))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        added = self.shared.add(key, value, timeout=timeout, version=version)
+        if added:
+            self._local_set(local_key, value, self._local_timeout(timeout))
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        self._local_delete(local_key)
+        return self.shared.touch(key, timeout=timeout, version=version)
+
+    def delete(self, key, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        self._local_delete(local_key)
+        return self.shared.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        for key in keys:
+            self._local_delete(self.make_and_validate_key(key, version=version))
+        self.shared.delete_many(keys, version=version)
+
+    def has_key(self, key, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        if self._local_get(local_key) is not _MISSING:
+            return True
+        return self.shared.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        # Counters must be atomic in the shared tier; never serve them locally.
+        local_key = self.make_and_validate_key(key, version=version)
+        self._local_delete(local_key)
+        return self.shared.incr(key, delta=delta, version=version)
+
+    def clear(self):
+        self.clear_local()
+        self.shared.clear()
+
+    def clear_local(self):
+        """Drop this process's first tier only."""
+        with self._lock:
+            self._local.clear()
+
+    def get_stats(self):
+        """Return first-tier hit/miss/eviction counters for this process."""
+        with self._lock:
+            return {**self._stats, 'size': len(self._local), 'max_entries': self.local_max_entries}
+
+    def reset_stats(self):
+        with self._lock:
+            for counter in self._stats:
+                self._stats[counter] = 0
+
+
+def _namespace_key(namespace):
+    return f"cache-ns:{namespace}"
+
+
+def cache_namespace_version(namespace, cache=None):
+    """Return the current version number for a group of cached payloads."""
+    cache = cache or default_cache
+    version = cache.get(_namespace_key(namespace))
+    if version is None:
+        cache.add(_namespace_key(namespace), 1, None)
+        version = cache.get(_namespace_key(namespace)) or 1
+    return version
+
+
+def bump_cache_namespace(namespace, cache=None):
+    """Invalidate every payload keyed by ``namespace``'s current version."""
+    cache = cache or default_cache
+    try:
+        return cache.incr(_namespace_key(namespace))
+    except ValueError:
+        cache.add(_namespace_key(namespace), 2, None)
+        return cache.get(_namespace_key(namespace)) or 2
@@ -0,0 +1,17 @@
+"""
+Delete expired idempotency records.
+
+Intended for a periodic cron alongside the database idempotency store:
+    */15 * * * * cd /app && python manage.py purge_idempotency_keys
+"""
+from django.core.management.base import BaseCommand
+
+from core.services.idempotency import get_idempotency_store
+
+
+class Command(BaseCommand):
+    help = "Delete expired X-Idempotency-Key records from the configured store"
+
+    def handle(self, *args, **options):
+        deleted = get_idempotency_store().purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} expired idempotency records"))
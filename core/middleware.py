@@ -3,24 +3,37 @@ Custom middleware for the Leave Management System.
 """
 import hashlib
 import json
+import time
 import uuid
-from django.core.cache import cache
+from django.conf import settings
 from django.http import JsonResponse
 
+from core.services.idempotency import COMPLETED, get_idempotency_store
+
 
 class IdempotencyMiddleware:
     """
     Middleware to prevent duplicate POST/PUT/PATCH requests using idempotency keys.
 
     Client sends X-Idempotency-Key header with a unique UUID.
-    If the same key is seen again within the cache TTL, return the cached response.
+    The first request atomically claims the key before the view runs; a
+    concurrent duplicate waits briefly for that response and replays it, or
+    gets 409 if the first request is still in flight. Completed responses are
+    replayed for IDEMPOTENCY_TTL seconds.
     """
 
     CACHE_TTL = 300  # 5 minutes - enough for retries, not too long
+    LOCK_TIMEOUT = 60  # Reclaim keys held by requests that never finished
+    WAIT_SECONDS = 2.0
+    POLL_INTERVAL = 0.05
     IDEMPOTENT_METHODS = ('POST', 'PUT', 'PATCH')
 
     def __init__(self, get_response):
         self.get_response = get_response
+        self.store = get_idempotency_store()
+        self.ttl = getattr(settings, 'IDEMPOTENCY_TTL', self.CACHE_TTL)
+        self.lock_timeout = getattr(settings, 'IDEMPOTENCY_LOCK_TIMEOUT', self.LOCK_TIMEOUT)
+        self.wait_seconds = getattr(settings, 'IDEMPOTENCY_WAIT_SECONDS', self.WAIT_SECONDS)
 
     def __call__(self, request):
         # Only apply to mutating methods
@@ -33,45 +46,84 @@ class IdempotencyMiddleware:
             # No key provided - proceed normally (backward compatible)
             return self.get_response(request)
 
-        # Build cache key: user_id + endpoint + idempotency_key
-        user_id = getattr(request.user, 'id', 'anon') if hasattr(request, 'user') else 'anon'
-        cache_key = f"idempotency:{user_id}:{request.path}:{idempotency_key}"
-
-        # Check if we have a cached response
-        cached = cache.get(cache_key)
-        if cached is not None:
-            # Return cached response with indicator header
-            response = JsonResponse(
-                cached['data'],
-                status=cached['status'],
-                safe=isinstance(cached['data'], dict)
-            )
-            response['X-Idempotency-Replayed'] = 'true'
-            return response
+        store_key = self.store_key(request, idempotency_key)
+        if not self.store.claim(store_key, self.lock_timeout):
+            return self._duplicate_response(store_key)
 
-        # Process the request
-        response = self.get_response(request)
+        try:
+            response = self.get_response(request)
+        except Exception:
+            self.store.release(store_key)
+            raise
+
+        data = self._json_body(response) if 200 <= response.status_code < 300 else None
+        if data is not None:
+            self.store.complete(store_key, data, response.status_code, self.ttl)
+        else:
+            # Failed or non-JSON response: let the client retry with the same key
+            self.store.release(store_key)
+        return response
 
-        # Cache successful responses (2xx status codes)
-        if 200 <= response.status_code < 300:
-            try:
-                # Try to get JSON data from response
-                if hasattr(response, 'data'):
-                    data = response.data
-                elif hasattr(response, 'content'):
-                    data = json.loads(response.content.decode('utf-8'))
-                else:
-                    data = {}
-
-                cache.set(cache_key, {
-                    'data': data,
-                    'status': response.status_code,
-                }, self.CACHE_TTL)
-            except (json.JSONDecodeError, AttributeError):
-                # Non-JSON response, don't cache
-                pass
+    def store_key(self, request, idempotency_key):
+        """Hash user_id + endpoint + idempotency_key into a fixed-length store key."""
+        raw_key = f"{self._user_id(request)}:{request.path}:{idempotency_key}"
+        return hashlib.sha256(raw_key.encode('utf-8')).hexdigest()
+
+    def _duplicate_response(self, store_key):
+        """Replay the stored response, waiting briefly while the original is in flight."""
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            record = self.store.get(store_key)
+            if record is None:
+                # Original request failed and released its claim
+                return JsonResponse(
+                    {'error': 'The original request with this idempotency key did not complete. Retry.'},
+                    status=409,
+                )
+            if record['state'] == COMPLETED:
+                response = JsonResponse(
+                    record['data'],
+                    status=record['status'],
+                    safe=isinstance(record['data'], dict),
+                )
+                response['X-Idempotency-Replayed'] = 'true'
+                return response
+            if time.monotonic() >= deadline:
+                response = JsonResponse(
+                    {'error': 'A request with this idempotency key is already in progress.'},
+                    status=409,
+                )
+                response['Retry-After'] = '1'
+                return response
+            time.sleep(self.POLL_INTERVAL)
 
-        return response
+    @staticmethod
+    def _user_id(request):
+        """Scope keys per user; JWT claims are read without a user query."""
+        user = getattr(request, 'user', None)
+        if user and user.is_authenticated:
+            return str(user.id)
+        try:
+            from rest_framework_simplejwt.authentication import JWTAuthentication
+            authenticator = JWTAuthentication()
+            header = authenticator.get_header(request)
+            raw_token = authenticator.get_raw_token(header) if header else None
+            if raw_token:
+                token = authenticator.get_validated_token(raw_token)
+                return str(token[settings.SIMPLE_JWT['USER_ID_CLAIM']])
+        except Exception:
+            pass
+        return 'anon'
+
+    @staticmethod
+    def _json_body(response):
+        """Return the decoded JSON body, or None when the response cannot be replayed."""
+        if not response.get('Content-Type', '').startswith('application/json'):
+            return None
+        try:
+            return json.loads(response.content.decode('utf-8'))
+        except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+            return None
 
 
 class AuditLoggingMiddleware:
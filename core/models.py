@@ -120,8 +120,33 @@ class AuditLog(models.Model):
         db_table = 'audit_logs'
         indexes = [
             models.Index(fields=['entity_type', 'entity_id']),
-            models.Index(fields=['user', '-created_at']),
+            # Keyset pagination scans (created_at, id) within each supported filter.
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['user', 'created_at', 'id']),
+            models.Index(fields=['entity_type', 'created_at', 'id']),
+            models.Index(fields=['action', 'created_at', 'id']),
         ]
 
     def __str__(self):
         return f"{self.user.email} - {self.action} {self.entity_type}"
+
+
+class IdempotencyRecord(models.Model):
+    """Claimed X-Idempotency-Key and, once the request completes, its replayable response."""
+    class State(models.TextChoices):
+        IN_FLIGHT = 'IN_FLIGHT', 'In Flight'
+        COMPLETED = 'COMPLETED', 'Completed'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    key = models.CharField(max_length=64, unique=True)  # sha256 of user + path + client key
+    state = models.CharField(max_length=20, choices=State.choices, default=State.IN_FLIGHT)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_data = models.JSONField(null=True, blank=True)
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'idempotency_records'
+
+    def __str__(self):
+        return f"{self.key} - {self.state}"
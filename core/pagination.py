@@ -0,0 +1,108 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Pages are addressed by the last row's ordering key instead of an OFFSET, so
+fetching any page costs one index range scan regardless of table size and no
+COUNT(*) is issued.
+"""
+import base64
+import json
+import uuid
+from datetime import date, datetime
+
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client-supplied cursor cannot be decoded."""
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {'u': str(value)}
+    return {'v': value}
+
+
+def _decode_value(raw):
+    if not isinstance(raw, dict) or len(raw) != 1:
+        raise InvalidCursor('Malformed cursor value')
+    kind, value = next(iter(raw.items()))
+    try:
+        if kind == 'dt':
+            return datetime.fromisoformat(value)
+        if kind == 'd':
+            return date.fromisoformat(value)
+        if kind == 'u':
+            return uuid.UUID(value)
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursor('Malformed cursor value') from exc
+    if kind == 'v':
+        return value
+    raise InvalidCursor('Malformed cursor value')
+
+
+def encode_cursor(values):
+    """Serialize an ordering key tuple into an opaque URL-safe token."""
+    payload = json.dumps([_encode_value(value) for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, size):
+    """Parse a token produced by encode_cursor, validating the key length."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    except (ValueError, UnicodeError) as exc:
+        raise InvalidCursor('Malformed cursor') from exc
+    if not isinstance(raw, list) or len(raw) != size:
+        raise InvalidCursor('Malformed cursor')
+    return tuple(_decode_value(value) for value in raw)
+
+
+def _after_key_q(fields, values, descending):
+    """
+    Build the row-value comparison ``(f1, f2, ...) > (v1, v2, ...)`` as a Q.
+
+    Expanded as ``f1 > v1 OR (f1 = v1 AND f2 > v2) ...`` which every backend
+    can serve from a composite index on the ordering fields.
+    """
+    lookup = 'lt' if descending else 'gt'
+    condition = Q()
+    for index, field in enumerate(fields):
+        term = Q(**{f'{field}__{lookup}': values[index]})
+        for prior_field, prior_value in zip(fields[:index], values[:index]):
+            term &= Q(**{prior_field: prior_value})
+        condition |= term
+    return condition
+
+
+def keyset_paginate(queryset, fields, page_size, cursor=None, descending=True):
+    """
+    Return one page of ``queryset`` ordered by ``fields`` after ``cursor``.
+
+    ``fields`` must form a unique key (append the primary key as tie-breaker).
+    Fetches ``page_size + 1`` rows to learn whether another page exists.
+
+    Returns:
+        tuple: (rows, next_cursor) where next_cursor is None on the last page
+
+    Raises:
+        InvalidCursor: if the cursor token is malformed
+    """
+    prefix = '-' if descending else ''
+    queryset = queryset.order_by(*[f'{prefix}{field}' for field in fields])
+    if cursor:
+        queryset = queryset.filter(_after_key_q(fields, decode_cursor(cursor, len(fields)), descending))
+
+    rows = list(queryset[:page_size + 1])
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = None
+    if has_next and rows:
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, field) for field in fields])
+    return rows, next_cursor
@@ -0,0 +1,207 @@
+"""
+Idempotency key stores used by IdempotencyMiddleware.
+
+Every store offers an atomic claim step so that only one of several concurrent
+requests carrying the same key runs the mutation; the others replay the stored
+response or wait for it.
+
+Stores:
+- DatabaseIdempotencyStore: dedicated table, unique-row insert claim (multi-worker)
+- CacheIdempotencyStore: cache.add claim, for a shared cache such as Redis
+- InMemoryIdempotencyStore: process-local dict, for single-node deployments
+
+Select with settings.IDEMPOTENCY_STORE (dotted path).
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+IN_FLIGHT = 'IN_FLIGHT'
+COMPLETED = 'COMPLETED'
+
+DEFAULT_STORE = 'core.services.idempotency.DatabaseIdempotencyStore'
+
+
+class IdempotencyStore(ABC):
+    """
+    Interface for idempotency stores.
+
+    Records are dicts: {'state': IN_FLIGHT|COMPLETED, 'status': int|None, 'data': Any}.
+    """
+
+    @abstractmethod
+    def claim(self, key, lock_timeout):
+        """Atomically reserve ``key``; return True only for the first caller."""
+
+    @abstractmethod
+    def get(self, key):
+        """Return the live record for ``key`` or None."""
+
+    @abstractmethod
+    def complete(self, key, data, status_code, ttl):
+        """Store the response for replay and keep it for ``ttl`` seconds."""
+
+    @abstractmethod
+    def release(self, key):
+        """Drop an in-flight claim so the client may retry (failed request)."""
+
+    def purge_expired(self):
+        """Delete expired records; return the number removed."""
+        return 0
+
+
+class DatabaseIdempotencyStore(IdempotencyStore):
+    """Claims are unique-row inserts into idempotency_records."""
+
+    def claim(self, key, lock_timeout):
+        from core.models import IdempotencyRecord
+
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                IdempotencyRecord.objects.create(
+                    key=key,
+                    state=IdempotencyRecord.State.IN_FLIGHT,
+                    expires_at=now + timedelta(seconds=lock_timeout),
+                )
+            return True
+        except IntegrityError:
+            pass
+        # Take over a row that expired before the sweeper removed it. The
+        # conditional UPDATE lets exactly one concurrent caller win.
+        return bool(
+            IdempotencyRecord.objects.filter(key=key, expires_at__lte=now).update(
+                state=IdempotencyRecord.State.IN_FLIGHT,
+                status_code=None,
+                response_data=None,
+                expires_at=now + timedelta(seconds=lock_timeout),
+            )
+        )
+
+    def get(self, key):
+        from core.models import IdempotencyRecord
+
+        row = IdempotencyRecord.objects.filter(
+            key=key, expires_at__gt=timezone.now()
+        ).values('state', 'status_code', 'response_data').first()
+        if row is None:
+            return None
+        return {'state': row['state'], 'status': row['status_code'], 'data': row['response_data']}
+
+    def complete(self, key, data, status_code, ttl):
+        from core.models import IdempotencyRecord
+
+        IdempotencyRecord.objects.filter(key=key).update(
+            state=IdempotencyRecord.State.COMPLETED,
+            status_code=status_code,
+            response_data=data,
+            expires_at=timezone.now() + timedelta(seconds=ttl),
+        )
+
+    def release(self, key):
+        from core.models import IdempotencyRecord
+
+        IdempotencyRecord.objects.filter(key=key, state=IdempotencyRecord.State.IN_FLIGHT).delete()
+
+    def purge_expired(self):
+        from core.models import IdempotencyRecord
+
+        deleted, _ = IdempotencyRecord.objects.filter(expires_at__lte=timezone.now()).delete()
+        return deleted
+
+
+class CacheIdempotencyStore(IdempotencyStore):
+    """Claims use cache.add, which is atomic on shared backends (Redis, Memcached, DB)."""
+
+    key_prefix = 'idempotency'
+
+    def __init__(self, alias=None):
+        self.alias = alias or getattr(settings, 'IDEMPOTENCY_CACHE_ALIAS', 'default')
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _cache_key(self, key):
+        return f"{self.key_prefix}:{key}"
+
+    def claim(self, key, lock_timeout):
+        return self.cache.add(
+            self._cache_key(key),
+            {'state': IN_FLIGHT, 'status': None, 'data': None},
+            lock_timeout,
+        )
+
+    def get(self, key):
+        return self.cache.get(self._cache_key(key))
+
+    def complete(self, key, data, status_code, ttl):
+        self.cache.set(
+            self._cache_key(key),
+            {'state': COMPLETED, 'status': status_code, 'data': data},
+            ttl,
+        )
+
+    def release(self, key):
+        self.cache.delete(self._cache_key(key))
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """Process-local store; only correct when one process serves all requests."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records = {}
+
+    def _live(self, key, now):
+        entry = self._records.get(key)
+        if entry and entry[1] <= now:
+            del self._records[key]
+            return None
+        return entry
+
+    def claim(self, key, lock_timeout):
+        now = time.monotonic()
+        with self._lock:
+            if self._live(key, now):
+                return False
+            self._records[key] = ({'state': IN_FLIGHT, 'status': None, 'data': None}, now + lock_timeout)
+            return True
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key, time.monotonic())
+            return dict(entry[0]) if entry else None
+
+    def complete(self, key, data, status_code, ttl):
+        with self._lock:
+            self._records[key] = (
+                {'state': COMPLETED, 'status': status_code, 'data': data},
+                time.monotonic() + ttl,
+            )
+
+    def release(self, key):
+        with self._lock:
+            entry = self._records.get(key)
+            if entry and entry[0]['state'] == IN_FLIGHT:
+                del self._records[key]
+
+    def purge_expired(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (_, expires_at) in self._records.items() if expires_at <= now]
+            for key in expired:
+                del self._records[key]
+        return len(expired)
+
+
+def get_idempotency_store():
+    """Instantiate the store configured by settings.IDEMPOTENCY_STORE."""
+    return import_string(getattr(settings, 'IDEMPOTENCY_STORE', DEFAULT_STORE))()
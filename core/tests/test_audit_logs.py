@@ -3,10 +3,13 @@ Tests for Audit Log API (Phase 6)
 """
 import pytest
 import uuid
+from datetime import timedelta
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 from core.models import AuditLog
+from core.views import AUDIT_FIELD_LABELS
 from leaves.models import LeaveRequest
 
 User = get_user_model()
@@ -68,8 +71,9 @@ class TestAuditLogs:
         response = client.get('/api/v1/notifications/audit-logs/')
 
         assert response.status_code == 200
-        assert response.data['count'] == 2
         assert len(response.data['results']) == 2
+        assert response.data['has_next'] is False
+        assert response.data['next_cursor'] is None
 
     def test_list_audit_logs_employee_forbidden(self, setup_audit_logs):
         """Test regular employees cannot list audit logs"""
@@ -92,7 +96,7 @@ class TestAuditLogs:
         response = client.get('/api/v1/notifications/audit-logs/?action=APPROVE')
 
         assert response.status_code == 200
-        assert response.data['count'] == 1
+        assert len(response.data['results']) == 1
         assert response.data['results'][0]['action'] == 'APPROVE'
 
     def test_filter_audit_logs_by_entity_type(self, setup_audit_logs):
@@ -105,7 +109,7 @@ class TestAuditLogs:
         response = client.get('/api/v1/notifications/audit-logs/?entity_type=LeaveRequest')
 
         assert response.status_code == 200
-        assert response.data['count'] == 2
+        assert len(response.data['results']) == 2
 
     def test_audit_logs_can_be_ordered_oldest_first(self, setup_audit_logs):
         admin_user = setup_audit_logs['admin_user']
@@ -115,11 +119,83 @@ class TestAuditLogs:
         response = client.get('/api/v1/notifications/audit-logs/?ordering=oldest&page_size=1')
 
         assert response.status_code == 200
-        assert response.data['count'] == 2
-        assert response.data['page'] == 1
-        assert response.data['total_pages'] == 2
+        assert response.data['page_size'] == 1
+        assert response.data['has_next'] is True
         assert response.data['results'][0]['id'] == str(setup_audit_logs['logs'][0].id)
 
+        response = client.get(
+            '/api/v1/notifications/audit-logs/',
+            {'ordering': 'oldest', 'page_size': 1, 'cursor': response.data['next_cursor']},
+        )
+
+        assert response.status_code == 200
+        assert response.data['has_next'] is False
+        assert response.data['results'][0]['id'] == str(setup_audit_logs['logs'][1].id)
+
+    def test_audit_log_cursor_walks_every_row_once(self, setup_audit_logs):
+        admin_user = setup_audit_logs['admin_user']
+        created_at = setup_audit_logs['logs'][0].created_at
+        # Identical timestamps must still page deterministically via the id tie-breaker.
+        for _ in range(3):
+            log = AuditLog.objects.create(
+                user=admin_user,
+                action='UPDATE',
+                entity_type='User',
+                entity_id=uuid.uuid4(),
+            )
+            AuditLog.objects.filter(id=log.id).update(created_at=created_at)
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+
+        seen = []
+        params = {'page_size': 2}
+        while True:
+            response = client.get('/api/v1/notifications/audit-logs/', params)
+            assert response.status_code == 200
+            seen.extend(row['id'] for row in response.data['results'])
+            if not response.data['has_next']:
+                break
+            params['cursor'] = response.data['next_cursor']
+
+        assert len(seen) == 5
+        assert len(set(seen)) == 5
+
+    def test_audit_logs_default_to_recent_window(self, setup_audit_logs):
+        admin_user = setup_audit_logs['admin_user']
+        old_log = AuditLog.objects.create(
+            user=admin_user,
+            action='DELETE',
+            entity_type='User',
+            entity_id=uuid.uuid4(),
+        )
+        AuditLog.objects.filter(id=old_log.id).update(
+            created_at=timezone.now() - timedelta(days=90)
+        )
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+
+        response = client.get('/api/v1/notifications/audit-logs/')
+        assert response.status_code == 200
+        assert str(old_log.id) not in [row['id'] for row in response.data['results']]
+
+        since = (timezone.now() - timedelta(days=120)).date().isoformat()
+        response = client.get(f'/api/v1/notifications/audit-logs/?created_after={since}')
+        assert response.status_code == 200
+        assert str(old_log.id) in [row['id'] for row in response.data['results']]
+
+    def test_audit_logs_reject_invalid_window_and_cursor(self, setup_audit_logs):
+        client = APIClient()
+        client.force_authenticate(user=setup_audit_logs['admin_user'])
+
+        response = client.get('/api/v1/notifications/audit-logs/?created_after=2020-01-01')
+        assert response.status_code == 400
+
+        response = client.get('/api/v1/notifications/audit-logs/?created_after=yesterday')
+        assert response.status_code == 400
+
+        response = client.get('/api/v1/notifications/audit-logs/?cursor=not-a-cursor')
+        assert response.status_code == 400
+
     def test_successful_authenticated_mutation_is_logged_automatically(self, setup_audit_logs):
         admin_user = setup_audit_logs['admin_user']
         client = APIClient()
@@ -207,3 +283,46 @@ class TestAuditLogs:
         approved_at_change = next(change for change in row['changes'] if change['field'] == 'Approved at')
         assert approved_by_change['after'] == 'admin@example.com'
         assert approved_at_change['after'] == '2026-06-08T02:28:11.712168+00:00'
+
+    def test_audit_log_page_resolves_user_references_in_one_query(self, setup_audit_logs):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        admin_user = setup_audit_logs['admin_user']
+        approvers = [
+            User.objects.create_user(email=f'approver{index}@example.com', password='TestPass123!')
+            for index in range(3)
+        ]
+        for approver in approvers:
+            AuditLog.objects.create(
+                user=admin_user,
+                action='APPROVE',
+                entity_type='LeaveRequest',
+                entity_id=uuid.uuid4(),
+                new_values={'approved_by': str(approver.id)},
+            )
+        AuditLog.objects.create(
+            user=admin_user,
+            action='APPROVE',
+            entity_type='LeaveRequest',
+            entity_id=uuid.uuid4(),
+            new_values={'approved_by': str(uuid.uuid4())},
+        )
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/v1/notifications/audit-logs/?action=APPROVE')
+
+        approved_by = {
+            change['after']
+            for row in response.data['results']
+            for change in row['changes']
+            if change['field'] == AUDIT_FIELD_LABELS['approved_by']
+        }
+        assert approved_by == {*(approver.email for approver in approvers), 'Deleted user'}
+        email_lookups = [
+            query for query in queries.captured_queries
+            if 'FROM "users" WHERE "users"."id" IN' in query['sql']
+        ]
+        assert len(email_lookups) == 1
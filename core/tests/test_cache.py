@@ -0,0 +1,94 @@
+"""
+Tests for the two-tier cache backend and versioned namespaces
+"""
+import pytest
+from django.core.cache import cache, caches
+
+from core.cache import TwoTierCache, bump_cache_namespace, cache_namespace_version
+from core.throttling import ProcessUserRateThrottle
+
+
+@pytest.mark.django_db
+class TestTwoTierCache:
+    """Local LRU in front of the shared database cache"""
+
+    def test_default_cache_is_two_tier(self):
+        assert isinstance(caches['default'], TwoTierCache)
+
+    def test_local_hit_skips_shared_tier(self, django_assert_num_queries):
+        cache.set('profile', {'name': 'A'})
+
+        with django_assert_num_queries(0):
+            assert cache.get('profile') == {'name': 'A'}
+        assert cache.get_stats()['hits'] == 1
+
+    def test_shared_value_is_promoted_to_local_tier(self, django_assert_num_queries):
+        caches['shared'].set('from-other-worker', 42)
+
+        assert cache.get('from-other-worker') == 42
+        with django_assert_num_queries(0):
+            assert cache.get('from-other-worker') == 42
+        stats = cache.get_stats()
+        assert stats['misses'] == 1
+        assert stats['hits'] == 1
+
+    def test_local_entries_are_isolated_copies(self):
+        cache.set('payload', {'items': [1]})
+
+        cache.get('payload')['items'].append(2)
+
+        assert cache.get('payload') == {'items': [1]}
+
+    def test_delete_and_add_reach_both_tiers(self):
+        cache.set('key', 'value')
+        cache.delete('key')
+
+        assert cache.get('key') is None
+        assert caches['shared'].get('key') is None
+        assert cache.add('key', 'new') is True
+        assert cache.add('key', 'other') is False
+        assert caches['shared'].get('key') == 'new'
+
+    def test_delete_many_clears_both_tiers_in_one_query(self, django_assert_num_queries):
+        cache.set_many({'a': 1, 'b': 2, 'c': 3})
+
+        with django_assert_num_queries(1):
+            cache.delete_many(['a', 'b'])
+
+        assert cache.get('a') is None and cache.get('b') is None
+        assert caches['shared'].get('a') is None
+        assert cache.get('c') == 3
+
+    def test_lru_evicts_least_recently_used(self):
+        backend = TwoTierCache('shared', {'OPTIONS': {'LOCAL_MAX_ENTRIES': 2}})
+        backend.clear_local()
+        backend.reset_stats()
+        backend.set('a', 1)
+        backend.set('b', 2)
+        backend.get('a')
+        backend.set('c', 3)
+
+        assert backend.get_stats()['evictions'] == 1
+        assert backend.get_stats()['size'] == 2
+        # 'b' was evicted locally but is still served from the shared tier
+        backend.reset_stats()
+        assert backend.get('b') == 2
+        assert backend.get_stats()['misses'] == 1
+
+    def test_namespace_bump_changes_version(self):
+        version = cache_namespace_version('org-tree')
+
+        assert bump_cache_namespace('org-tree') == version + 1
+        assert cache_namespace_version('org-tree') == version + 1
+
+
+@pytest.mark.django_db
+def test_user_throttle_does_not_touch_database(django_assert_num_queries):
+    class Request:
+        user = type('User', (), {'is_authenticated': True, 'pk': 'user-1'})()
+        META = {'REMOTE_ADDR': '127.0.0.1'}
+
+    throttle = ProcessUserRateThrottle()
+
+    with django_assert_num_queries(0):
+        assert throttle.allow_request(Request(), None) is True
@@ -0,0 +1,175 @@
+"""
+Tests for X-Idempotency-Key handling and idempotency stores
+"""
+import threading
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.http import JsonResponse
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.middleware import IdempotencyMiddleware
+from core.models import Announcement, IdempotencyRecord
+from core.services.idempotency import (
+    COMPLETED,
+    DatabaseIdempotencyStore,
+    IdempotencyStore,
+    InMemoryIdempotencyStore,
+)
+
+User = get_user_model()
+
+MEMORY_STORE = 'core.services.idempotency.InMemoryIdempotencyStore'
+
+
+def _middleware(view, **settings_overrides):
+    with override_settings(**settings_overrides):
+        return IdempotencyMiddleware(view)
+
+
+def _keyed_post(key='key-1'):
+    return RequestFactory().post('/api/v1/things/', HTTP_X_IDEMPOTENCY_KEY=key)
+
+
+@pytest.mark.django_db
+class TestIdempotencyMiddleware:
+    """End-to-end behaviour through the API"""
+
+    def test_duplicate_post_is_replayed_without_running_twice(self):
+        admin = User.objects.create_user(
+            email='admin@example.com', password='TestPass123!', role=User.Role.ADMIN
+        )
+        client = APIClient()
+        client.force_authenticate(user=admin)
+        payload = {'title': 'Once', 'body': 'Only one announcement'}
+
+        first = client.post(
+            '/api/v1/notifications/announcements/', payload, format='json',
+            HTTP_X_IDEMPOTENCY_KEY='same-key',
+        )
+        second = client.post(
+            '/api/v1/notifications/announcements/', payload, format='json',
+            HTTP_X_IDEMPOTENCY_KEY='same-key',
+        )
+
+        assert first.status_code == 201
+        assert second.status_code == 201
+        assert second['X-Idempotency-Replayed'] == 'true'
+        assert second.json()['id'] == first.json()['id']
+        assert Announcement.objects.filter(title='Once').count() == 1
+
+    def test_in_flight_duplicate_gets_conflict(self):
+        calls = []
+
+        def view(request):
+            calls.append(request)
+            return JsonResponse({'ok': True}, status=201)
+
+        middleware = _middleware(view, IDEMPOTENCY_STORE=MEMORY_STORE, IDEMPOTENCY_WAIT_SECONDS=0)
+        request = _keyed_post()
+        middleware.store.claim(middleware.store_key(request, 'key-1'), 60)
+
+        response = middleware(request)
+
+        assert response.status_code == 409
+        assert response['Retry-After'] == '1'
+        assert calls == []
+
+    def test_waiter_replays_response_completed_while_waiting(self):
+        def view(request):
+            return JsonResponse({'ok': True}, status=201)
+
+        middleware = _middleware(view, IDEMPOTENCY_STORE=MEMORY_STORE, IDEMPOTENCY_WAIT_SECONDS=5)
+        request = _keyed_post()
+        store_key = middleware.store_key(request, 'key-1')
+        middleware.store.claim(store_key, 60)
+        timer = threading.Timer(
+            0.1, middleware.store.complete, args=(store_key, {'id': 'first'}, 201, 300)
+        )
+        timer.start()
+
+        response = middleware(request)
+        timer.join()
+
+        assert response.status_code == 201
+        assert response['X-Idempotency-Replayed'] == 'true'
+
+    def test_failed_request_releases_key_for_retry(self):
+        statuses = iter([400, 201])
+
+        def view(request):
+            return JsonResponse({'ok': True}, status=next(statuses))
+
+        middleware = _middleware(view, IDEMPOTENCY_STORE=MEMORY_STORE)
+
+        assert middleware(_keyed_post()).status_code == 400
+        retry = middleware(_keyed_post())
+        assert retry.status_code == 201
+        assert not retry.has_header('X-Idempotency-Replayed')
+
+
+@pytest.mark.django_db
+class TestDatabaseIdempotencyStore:
+    """Unique-row claim semantics of the dedicated table"""
+
+    def test_claim_is_exclusive_until_completed(self):
+        store = DatabaseIdempotencyStore()
+
+        assert store.claim('abc', 60) is True
+        assert store.claim('abc', 60) is False
+
+        store.complete('abc', {'id': 1}, 201, 300)
+        record = store.get('abc')
+        assert record == {'state': COMPLETED, 'status': 201, 'data': {'id': 1}}
+
+    def test_expired_claim_can_be_taken_over_and_purged(self):
+        store = DatabaseIdempotencyStore()
+        store.claim('stale', 60)
+        IdempotencyRecord.objects.filter(key='stale').update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        assert store.get('stale') is None
+        assert store.claim('stale', 60) is True
+        assert store.claim('stale', 60) is False
+
+        IdempotencyRecord.objects.filter(key='stale').update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        with override_settings(IDEMPOTENCY_STORE='core.services.idempotency.DatabaseIdempotencyStore'):
+            call_command('purge_idempotency_keys', stdout=StringIO())
+        assert not IdempotencyRecord.objects.filter(key='stale').exists()
+
+    def test_release_only_drops_in_flight_claims(self):
+        store = DatabaseIdempotencyStore()
+        store.claim('done', 60)
+        store.complete('done', {'id': 1}, 200, 300)
+
+        store.release('done')
+
+        assert store.get('done')['state'] == COMPLETED
+
+
+def test_in_memory_store_claim_and_expiry():
+    store = InMemoryIdempotencyStore()
+
+    assert store.claim('k', 60) is True
+    assert store.claim('k', 60) is False
+    store.release('k')
+    assert store.claim('k', 0) is True
+    assert store.purge_expired() == 1
+    assert store.get('k') is None
+
+
+def test_incomplete_store_fails_at_construction():
+    class ClaimOnlyStore(IdempotencyStore):
+        def claim(self, key, lock_timeout):
+            return True
+
+    with pytest.raises(TypeError):
+        ClaimOnlyStore()
@@ -0,0 +1,31 @@
+"""
+DRF throttles bound to an explicit cache tier.
+
+SimpleRateThrottle reads and rewrites its request history on every call, so
+the tier matters:
+- the global anon/user limits count in process memory ('throttle' alias),
+  keeping the shared cache off the hot path; limits apply per worker
+- strict security limits (password reset, OAuth) count in the shared tier so
+  every worker sees the same history
+"""
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+process_cache = ConnectionProxy(caches, 'throttle')
+shared_cache = ConnectionProxy(caches, 'shared')
+
+
+class ProcessAnonRateThrottle(AnonRateThrottle):
+    """Global anonymous limit, counted per worker process."""
+    cache = process_cache
+
+
+class ProcessUserRateThrottle(UserRateThrottle):
+    """Global authenticated limit, counted per worker process."""
+    cache = process_cache
+
+
+class SharedAnonRateThrottle(AnonRateThrottle):
+    """Anonymous limit counted in the shared cache across all workers."""
+    cache = shared_cache
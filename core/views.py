@@ -1,15 +1,20 @@
 """
 Core API Views (Notifications)
 """
+import uuid
+
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from datetime import datetime, time, timedelta
 from django.core.paginator import Paginator
 from django.db.models import Q
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from html.parser import HTMLParser
 from html import escape
 from .models import Announcement, AuditLog, Notification
+from .pagination import InvalidCursor, keyset_paginate
 
 
 class RichTextSanitizer(HTMLParser):
@@ -192,29 +197,52 @@ AUDIT_FIELD_LABELS = {
 }
 
 
-def _friendly_audit_value(field, value):
+AUDIT_USER_FIELDS = {'approved_by', 'user_id', 'published_by'}
+
+
+def _audit_user_emails(logs):
+    """Map every user id referenced in the logs' old/new values to an email, in one query."""
+    from django.contrib.auth import get_user_model
+
+    user_ids = set()
+    for log in logs:
+        for values in (log.old_values or {}, log.new_values or {}):
+            for value in values.values():
+                if not isinstance(value, str):
+                    continue
+                try:
+                    user_ids.add(uuid.UUID(value))
+                except ValueError:
+                    continue
+    if not user_ids:
+        return {}
+    return {
+        str(user_id): email
+        for user_id, email in get_user_model().objects.filter(id__in=user_ids).values_list('id', 'email')
+    }
+
+
+def _friendly_audit_value(field, value, user_emails):
     if value is None or value == '':
         return None
     if isinstance(value, bool):
         return 'Yes' if value else 'No'
-    if field in {'approved_by', 'user_id', 'published_by'}:
-        from django.contrib.auth import get_user_model
-        user = get_user_model().objects.filter(id=value).first()
-        if user:
-            return user.email
-        return 'Deleted user'
+    if field in AUDIT_USER_FIELDS:
+        return user_emails.get(str(value), 'Deleted user')
+    if isinstance(value, str) and value in user_emails:
+        return user_emails[value]
     if isinstance(value, str) and value.isupper():
         return value.replace('_', ' ').title()
     return value
 
 
-def _audit_changes(log):
+def _audit_changes(log, user_emails):
     old_values = log.old_values or {}
     new_values = log.new_values or {}
     changes = []
     for field in dict.fromkeys([*old_values, *new_values]):
-        before = _friendly_audit_value(field, old_values.get(field))
-        after = _friendly_audit_value(field, new_values.get(field))
+        before = _friendly_audit_value(field, old_values.get(field), user_emails)
+        after = _friendly_audit_value(field, new_values.get(field), user_emails)
         if before != after:
             changes.append({
                 'field': AUDIT_FIELD_LABELS.get(field, field.replace('_', ' ').title()),
@@ -278,7 +306,7 @@ def _audit_target_label(log):
     return f'{AUDIT_ENTITY_LABELS.get(log.entity_type, log.entity_type)} {log.entity_id}'
 
 
-def _serialize_audit_log(log):
+def _serialize_audit_log(log, user_emails):
     target_label = _audit_target_label(log)
     action_label = AUDIT_ACTION_LABELS.get(log.action, log.action.title())
     entity_label = AUDIT_ENTITY_LABELS.get(log.entity_type, log.entity_type)
@@ -301,7 +329,7 @@ def _serialize_audit_log(log):
         'entity_id': str(log.entity_id),
         'target_label': target_label,
         'summary': summary,
-        'changes': _audit_changes(log),
+        'changes': _audit_changes(log, user_emails),
         'old_values': log.old_values,
         'new_values': log.new_values,
         'ip_address': log.ip_address,
@@ -309,15 +337,66 @@ def _serialize_audit_log(log):
     }
 
 
+AUDIT_LOG_DEFAULT_WINDOW_DAYS = 30
+AUDIT_LOG_MAX_WINDOW_DAYS = 366
+
+
+def _parse_audit_bound(value, end_of_day=False):
+    """Parse an ISO date or datetime query value into an aware datetime."""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        parsed = datetime.combine(day, time.max if end_of_day else time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, timezone.get_current_timezone())
+    return parsed
+
+
+def _audit_log_window(params):
+    """
+    Resolve the (created_after, created_before) window for an audit log query.
+
+    Defaults to the last AUDIT_LOG_DEFAULT_WINDOW_DAYS days so every query is a
+    bounded range scan on the created_at indexes.
+    """
+    try:
+        created_before = (
+            _parse_audit_bound(params['created_before'], end_of_day=True)
+            if params.get('created_before') else timezone.now()
+        )
+        created_after = (
+            _parse_audit_bound(params['created_after'])
+            if params.get('created_after')
+            else created_before - timedelta(days=AUDIT_LOG_DEFAULT_WINDOW_DAYS)
+        )
+    except ValueError:
+        raise ValueError('created_after and created_before must be ISO dates or datetimes.')
+    if created_after > created_before:
+        raise ValueError('created_after must be before created_before.')
+    if created_before - created_after > timedelta(days=AUDIT_LOG_MAX_WINDOW_DAYS):
+        raise ValueError(f'Audit log window cannot exceed {AUDIT_LOG_MAX_WINDOW_DAYS} days.')
+    return created_after, created_before
+
+
 class AuditLogListView(generics.GenericAPIView):
+    """Admin audit trail with keyset pagination over (created_at, id)."""
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
         if not is_admin(request.user):
             return Response({'error': 'Only Admin can view audit logs.'}, status=status.HTTP_403_FORBIDDEN)
 
-        ordering = 'created_at' if request.query_params.get('ordering') == 'oldest' else '-created_at'
-        queryset = AuditLog.objects.select_related('user').order_by(ordering)
+        try:
+            created_after, created_before = _audit_log_window(request.query_params)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = AuditLog.objects.select_related('user').filter(
+            created_at__gte=created_after,
+            created_at__lte=created_before,
+        )
         for field in ('action', 'entity_type'):
             value = request.query_params.get(field)
             if value:
@@ -330,16 +409,24 @@ class AuditLogListView(generics.GenericAPIView):
             page_size = min(max(int(request.query_params.get('page_size', 25)), 1), 100)
         except (TypeError, ValueError):
             page_size = 25
-        paginator = Paginator(queryset, page_size)
-        page = paginator.get_page(request.query_params.get('page', 1))
+        try:
+            logs, next_cursor = keyset_paginate(
+                queryset,
+                ('created_at', 'id'),
+                page_size,
+                cursor=request.query_params.get('cursor'),
+                descending=request.query_params.get('ordering') != 'oldest',
+            )
+        except InvalidCursor:
+            return Response({'error': 'Invalid cursor.'}, status=status.HTTP_400_BAD_REQUEST)
+        user_emails = _audit_user_emails(logs)
         return Response({
-            'count': paginator.count,
-            'page': page.number,
             'page_size': page_size,
-            'total_pages': paginator.num_pages,
-            'has_next': page.has_next(),
-            'has_previous': page.has_previous(),
-            'results': [_serialize_audit_log(log) for log in page.object_list],
+            'created_after': created_after.isoformat(),
+            'created_before': created_before.isoformat(),
+            'has_next': next_cursor is not None,
+            'next_cursor': next_cursor,
+            'results': [_serialize_audit_log(log, user_emails) for log in logs],
         })
 
 
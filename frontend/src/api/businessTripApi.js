@@ -82,13 +82,13 @@ export async function cancelBusinessTrip(id) {
 
 /**
  * Get business trips for team/subordinates (manager/approver view)
- * @param {Object} params - Query params { page, page_size }
- * @returns {Promise<{count: number, results: []}>}
+ * @param {Object} params - Query params { cursor, page_size }
+ * @returns {Promise<{results: [], has_next: boolean, next_cursor: string|null}>}
  */
 export async function getTeamBusinessTrips(params = {}) {
-  const { page = 1, page_size = 20 } = params;
+  const { cursor, page_size = 20 } = params;
   const res = await http.get(`${API_URL}/team/`, {
-    params: { page, page_size },
+    params: { cursor, page_size },
   });
   return res.data;
 }
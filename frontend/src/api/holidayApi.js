@@ -40,3 +40,14 @@ export const unpublishHolidayCalendar = async (id) => {
   const response = await http.post(`/leaves/holiday-calendars/${id}/unpublish/`);
   return response.data;
 };
+
+/**
+ * Issue a calendar subscription URL for the holiday .ics feed.
+ * Any previously issued URL stops working.
+ */
+export const createHolidayFeedToken = async () => {
+  const response = await http.post("/leaves/holidays/feed-token/");
+  return response.data;
+};
+
+export const revokeHolidayFeedToken = async () => http.delete("/leaves/holidays/feed-token/");
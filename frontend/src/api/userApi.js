@@ -1,19 +1,32 @@
 import http from "./http";
 
 /**
- * Get all users (HR/Admin only)
- * Supports filters: ?role=EMPLOYEE&status=ACTIVE&entity=xxx&location=xxx&department=xxx
+ * Get one page of users (HR/Admin only)
+ * Supports: ?search=&page_size=&cursor= ; returns { results, has_next, next_cursor }
  */
 export const getAllUsers = async (params = {}) => {
   const response = await http.get("/auth/users/", { params });
   return response.data;
 };
 
-export const getApproverOptions = async () => {
-  const response = await http.get("/auth/users/approver-options/");
+/**
+ * Directory totals (HR/Admin): { total, active, without_approver }
+ */
+export const getUserStats = async () => {
+  const response = await http.get("/auth/users/stats/");
   return response.data;
 };
 
+/**
+ * Approver typeahead: active users matching ?search= (one page of results)
+ */
+export const getApproverOptions = async (search = "") => {
+  const response = await http.get("/auth/users/approver-options/", {
+    params: { search, page_size: 50 },
+  });
+  return response.data.results;
+};
+
 /**
  * Get user by ID
  */
@@ -1,11 +1,15 @@
 import { useCallback, useEffect, useState } from "react";
-import { Button, Card, Descriptions, Empty, Modal, Select, Space, Table, Tag, Typography, message } from "antd";
+import { Button, Card, DatePicker, Descriptions, Empty, Modal, Select, Space, Table, Tag, Typography, message } from "antd";
 import { EyeOutlined, ReloadOutlined } from "@ant-design/icons";
 import dayjs from "dayjs";
 import { getAuditLogs } from "@api/auditApi";
-import { getAllUsers } from "@api/userApi";
 
 const { Text } = Typography;
+const { RangePicker } = DatePicker;
+
+// Mirrors AUDIT_LOG_DEFAULT_WINDOW_DAYS / AUDIT_LOG_MAX_WINDOW_DAYS in core/views.py
+const DEFAULT_WINDOW_DAYS = 30;
+const MAX_WINDOW_DAYS = 366;
 
 const actionColors = {
   CREATE: "green",
@@ -35,45 +39,53 @@ const entityTypes = [
 
 export default function AuditLogManagement() {
   const [logs, setLogs] = useState([]);
-  const [count, setCount] = useState(0);
   const [loading, setLoading] = useState(false);
-  const [page, setPage] = useState(1);
+  // Keyset pagination: cursors[i] fetches page i; the API has no page numbers or totals.
+  const [cursors, setCursors] = useState([null]);
+  const [page, setPage] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
   const [pageSize, setPageSize] = useState(10);
   const [action, setAction] = useState();
   const [entityType, setEntityType] = useState();
   const [ordering, setOrdering] = useState("newest");
+  const [dateRange, setDateRange] = useState(() => [
+    dayjs().subtract(DEFAULT_WINDOW_DAYS, "day"),
+    dayjs(),
+  ]);
   const [selected, setSelected] = useState(null);
 
   const load = useCallback(async () => {
     setLoading(true);
     try {
-      const [data, usersData] = await Promise.all([
-        getAuditLogs({
-          page,
-          page_size: pageSize,
-          action,
-          entity_type: entityType,
-          ordering,
-        }),
-        getAllUsers(),
-      ]);
-      const users = Array.isArray(usersData) ? usersData : usersData?.results || [];
-      const userEmails = new Map(users.map((user) => [String(user.id), user.email]));
-      setLogs((data.results || []).map((log) => ({
-        ...log,
-        changes: (log.changes || []).map((change) => ({
-          ...change,
-          before: resolveUserReference(change.before, userEmails),
-          after: resolveUserReference(change.after, userEmails),
-        })),
-      })));
-      setCount(data.count || 0);
+      const data = await getAuditLogs({
+        cursor: cursors[page] || undefined,
+        page_size: pageSize,
+        action,
+        entity_type: entityType,
+        ordering,
+        created_after: dateRange[0].format("YYYY-MM-DD"),
+        created_before: dateRange[1].format("YYYY-MM-DD"),
+      });
+      // User references in changes arrive already resolved to emails by the API
+      setLogs(data.results || []);
+      setNextCursor(data.next_cursor || null);
     } catch (error) {
       message.error(error.response?.data?.error || "Failed to load audit logs");
     } finally {
       setLoading(false);
     }
-  }, [action, entityType, ordering, page, pageSize]);
+  }, [action, entityType, ordering, dateRange, cursors, page, pageSize]);
+
+  const resetPaging = () => {
+    setCursors([null]);
+    setPage(0);
+  };
+
+  const goNext = () => {
+    if (!nextCursor) return;
+    setCursors((previous) => [...previous.slice(0, page + 1), nextCursor]);
+    setPage(page + 1);
+  };
 
   useEffect(() => {
     load();
@@ -123,18 +135,27 @@ export default function AuditLogManagement() {
           <Space wrap>
             <Select
               value={ordering}
-              onChange={(value) => { setOrdering(value); setPage(1); }}
+              onChange={(value) => { setOrdering(value); resetPaging(); }}
               options={[
                 { value: "newest", label: "Newest first" },
                 { value: "oldest", label: "Oldest first" },
               ]}
               style={{ width: 145 }}
             />
+            <RangePicker
+              value={dateRange}
+              allowClear={false}
+              disabledDate={(current, { from }) =>
+                current.isAfter(dayjs(), "day")
+                || Boolean(from && Math.abs(current.diff(from, "day")) >= MAX_WINDOW_DAYS)
+              }
+              onChange={(value) => { if (value) { setDateRange(value); resetPaging(); } }}
+            />
             <Select
               allowClear
               placeholder="Action"
               value={action}
-              onChange={(value) => { setAction(value); setPage(1); }}
+              onChange={(value) => { setAction(value); resetPaging(); }}
               options={actions.map((value) => ({ value, label: value }))}
               style={{ width: 140 }}
             />
@@ -142,7 +163,7 @@ export default function AuditLogManagement() {
               allowClear
               placeholder="Type"
               value={entityType}
-              onChange={(value) => { setEntityType(value); setPage(1); }}
+              onChange={(value) => { setEntityType(value); resetPaging(); }}
               options={entityTypes.map((value) => ({ value, label: value }))}
               style={{ width: 170 }}
             />
@@ -158,22 +179,19 @@ export default function AuditLogManagement() {
           loading={loading}
           scroll={{ x: 1120, y: 460 }}
           tableLayout="fixed"
-          pagination={{
-            current: page,
-            pageSize,
-            total: count,
-            showSizeChanger: true,
-            pageSizeOptions: ["10", "25", "50", "100"],
-            showQuickJumper: true,
-            hideOnSinglePage: false,
-            showTotal: (total, range) => `${range[0]}-${range[1]} of ${total} audit logs`,
-            position: ["bottomRight"],
-            onChange: (nextPage, nextSize) => {
-              setPage(nextSize === pageSize ? nextPage : 1);
-              setPageSize(nextSize);
-            },
-          }}
+          pagination={false}
         />
+        <Space style={{ marginTop: 16, width: "100%", justifyContent: "flex-end" }} wrap>
+          <Text type="secondary">Page {page + 1}</Text>
+          <Select
+            value={pageSize}
+            onChange={(value) => { setPageSize(value); resetPaging(); }}
+            options={[10, 25, 50, 100].map((value) => ({ value, label: `${value} / page` }))}
+            style={{ width: 120 }}
+          />
+          <Button disabled={page === 0 || loading} onClick={() => setPage(page - 1)}>Previous</Button>
+          <Button disabled={!nextCursor || loading} onClick={goNext}>Next</Button>
+        </Space>
       </Card>
 
       <Modal title="Audit Log Detail" open={Boolean(selected)} onCancel={() => setSelected(null)} footer={null} width={820}>
@@ -220,8 +238,3 @@ function renderValue(value) {
   }
   return String(value);
 }
-
-function resolveUserReference(value, userEmails) {
-  if (typeof value !== "string") return value;
-  return userEmails.get(value) || value;
-}
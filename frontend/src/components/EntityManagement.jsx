@@ -87,7 +87,14 @@ const EntityManagement = () => {
             <ul style={{ marginTop: 8, marginBottom: 8 }}>
               <li><strong>{impact.locations_count}</strong> Location{impact.locations_count !== 1 ? 's' : ''}</li>
               <li><strong>{impact.departments_count}</strong> Department{impact.departments_count !== 1 ? 's' : ''}</li>
+              <li><strong>{impact.users_count}</strong> User{impact.users_count !== 1 ? 's' : ''}</li>
             </ul>
+            {(impact.pending_leave_count > 0 || impact.approved_leave_count > 0 || impact.calendars_count > 0) && (
+              <p style={{ marginTop: 8 }}>
+                Still attached: {impact.pending_leave_count} pending and {impact.approved_leave_count} upcoming
+                approved leave request(s), {impact.calendars_count} holiday calendar(s).
+              </p>
+            )}
             <p style={{ marginTop: 8 }}>
               Total impact: <strong>{impact.total_impact}</strong> record{impact.total_impact !== 1 ? 's' : ''}
             </p>
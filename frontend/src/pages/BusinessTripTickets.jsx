@@ -22,23 +22,33 @@ export default function BusinessTripTickets() {
   const [data, setData] = useState([]);
   const [loading, setLoading] = useState(true);
   const [selected, setSelected] = useState(null);
-  const [pagination, setPagination] = useState({ current: 1, pageSize: 10, total: 0 });
+  // Keyset pagination: cursors[i] fetches page i; the API has no page numbers or totals.
+  const [cursors, setCursors] = useState([null]);
+  const [page, setPage] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
+  const pageSize = 10;
 
-  const fetchTrips = useCallback(async (page = 1, pageSize = 10) => {
+  const fetchTrips = useCallback(async () => {
     try {
       setLoading(true);
-      const response = await getTeamBusinessTrips({ page, page_size: pageSize });
+      const response = await getTeamBusinessTrips({ cursor: cursors[page] || undefined, page_size: pageSize });
       setData(response.results || []);
-      setPagination(prev => ({ ...prev, current: page, pageSize, total: response.count || 0 }));
+      setNextCursor(response.next_cursor || null);
     } catch (error) {
       console.error("Failed to fetch team business trips:", error);
       message.error(error.response?.data?.error || "Failed to load team business trips");
     } finally {
       setLoading(false);
     }
-  }, []);
+  }, [cursors, page]);
 
-  // Fetch team business trips on mount
+  const goNext = () => {
+    if (!nextCursor) return;
+    setCursors((previous) => [...previous.slice(0, page + 1), nextCursor]);
+    setPage(page + 1);
+  };
+
+  // Fetch team business trips on mount and page change
   useEffect(() => {
     fetchTrips();
   }, [fetchTrips]);
@@ -107,13 +117,7 @@ export default function BusinessTripTickets() {
             rowKey="id"
             loading={loading}
             scroll={{ x: 700 }}
-            pagination={{
-              current: pagination.current,
-              pageSize: pagination.pageSize,
-              total: pagination.total,
-              showSizeChanger: false,
-              onChange: (page) => fetchTrips(page, pagination.pageSize),
-            }}
+            pagination={false}
             locale={{
               emptyText: !loading ? "No business trips found for your team." : "Loading..."
             }}
@@ -150,6 +154,11 @@ export default function BusinessTripTickets() {
             )}
           </div>
         </div>
+        <Space style={{ marginTop: 16, width: "100%", justifyContent: "flex-end" }}>
+          <Text type="secondary">Page {page + 1}</Text>
+          <Button disabled={page === 0 || loading} onClick={() => setPage(page - 1)}>Previous</Button>
+          <Button disabled={!nextCursor || loading} onClick={goNext}>Next</Button>
+        </Space>
       </Card>
 
       {/* DETAIL MODAL */}
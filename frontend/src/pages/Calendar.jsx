@@ -11,10 +11,13 @@ import {
   Switch,
   Tag,
   Empty,
+  Button,
+  Modal,
   message,
 } from "antd";
 import dayjs from "dayjs";
 import { getTeamCalendar, createLeaveRequest, getLeaveBalance } from "../api/dashboardApi";
+import { createHolidayFeedToken } from "@api/holidayApi";
 import CreateEventModal from "@components/CreateEventModal";
 import NewLeaveRequestModal from "@components/NewLeaveRequestModal";
 import NewBusinessTripModal from "@components/NewBusinessTripModal";
@@ -394,6 +397,25 @@ export default function TeamCalendar() {
       <span>My Work Shift</span>
     </Space>
   );
+  // Calendar apps cannot send our bearer token, so they subscribe with a
+  // tokenized URL; issuing a new one revokes the previous link.
+  const subscribeToHolidays = async () => {
+    try {
+      const { url } = await createHolidayFeedToken();
+      Modal.info({
+        title: "Subscribe to holidays",
+        content: (
+          <Space direction="vertical">
+            <Text>Add this URL to Google Calendar, Outlook or Apple Calendar. Any earlier link stops working.</Text>
+            <Text copyable code>{url}</Text>
+          </Space>
+        ),
+      });
+    } catch (error) {
+      message.error(error.response?.data?.error || "Failed to create subscription link");
+    }
+  };
+  const subscribeButton = <Button onClick={subscribeToHolidays}>Subscribe</Button>;
   const renderMobileSchedule = () => {
     if (!selectedDateSchedule) return null;
     const className = "calendar-mobile-event calendar-mobile-schedule"
@@ -460,6 +482,7 @@ export default function TeamCalendar() {
               />
               {workScheduleToggle}
               {legendBadges}
+              {subscribeButton}
             </div>
           )
         }
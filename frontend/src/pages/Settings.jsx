@@ -29,7 +29,15 @@ import {
   PlusOutlined,
 } from "@ant-design/icons";
 import { useAuth } from "@auth/authContext";
-import { getAllUsers, getApproverOptions, getUserById, updateUser, deleteUser, createUser } from "@api/userApi";
+import {
+  getAllUsers,
+  getApproverOptions,
+  getUserById,
+  getUserStats,
+  updateUser,
+  deleteUser,
+  createUser,
+} from "@api/userApi";
 import { getEntities, getLocations, getDepartments, getWorkShifts } from "@api/authApi";
 import { exportApprovedLeaves } from "@api/dashboardApi";
 import AnnouncementManagement from "@components/AnnouncementManagement";
@@ -68,6 +76,12 @@ const Settings = () => {
   const [form] = Form.useForm();
   const editWorkShiftId = Form.useWatch("work_shift", form);
   const [users, setUsers] = useState([]);
+  // The directory is keyset-paginated: rows accumulate via "Load more" and
+  // search runs on the server, so nothing past the first page is dropped.
+  const [userSearch, setUserSearch] = useState("");
+  const [nextUserCursor, setNextUserCursor] = useState(null);
+  const [loadingMoreUsers, setLoadingMoreUsers] = useState(false);
+  const [userStats, setUserStats] = useState({ total: 0, active: 0, without_approver: 0 });
   const [approverOptions, setApproverOptions] = useState([]);
   const [loading, setLoading] = useState(false);
   const [editModalVisible, setEditModalVisible] = useState(false);
@@ -103,19 +117,38 @@ const Settings = () => {
 
     setLoading(true);
     try {
-      const data = await getAllUsers();
-      setUsers(Array.isArray(data) ? data : data?.results || []);
+      const [data, stats] = await Promise.all([
+        getAllUsers({ search: userSearch || undefined }),
+        getUserStats(),
+      ]);
+      setUsers(data.results || []);
+      setNextUserCursor(data.next_cursor || null);
+      setUserStats(stats);
     } catch (error) {
       message.error("Failed to load users: " + (error.response?.data?.error || error.message));
     } finally {
       setLoading(false);
     }
-  }, [hasSettingsAccess]);
+  }, [hasSettingsAccess, userSearch]);
+
+  const loadMoreUsers = async () => {
+    if (!nextUserCursor) return;
+    setLoadingMoreUsers(true);
+    try {
+      const data = await getAllUsers({ search: userSearch || undefined, cursor: nextUserCursor });
+      setUsers((previous) => [...previous, ...(data.results || [])]);
+      setNextUserCursor(data.next_cursor || null);
+    } catch (error) {
+      message.error("Failed to load users: " + (error.response?.data?.error || error.message));
+    } finally {
+      setLoadingMoreUsers(false);
+    }
+  };
 
-  const fetchApproverOptions = useCallback(async () => {
+  const fetchApproverOptions = useCallback(async (search = "") => {
     if (!hasSettingsAccess) return;
     try {
-      setApproverOptions(await getApproverOptions());
+      setApproverOptions(await getApproverOptions(search));
     } catch (error) {
       message.error("Failed to load approver options: " + (error.response?.data?.error || error.message));
     }
@@ -539,11 +572,9 @@ const Settings = () => {
 
   // Statistics
   const stats = {
-    total: userRows.length,
-    active: userRows.filter((u) => u.status === "ACTIVE").length,
-    withoutApprover: userRows.filter(
-      (u) => !u.approver && (u.role === "EMPLOYEE" || u.role === "MANAGER")
-    ).length,
+    total: userStats.total,
+    active: userStats.active,
+    withoutApprover: userStats.without_approver,
   };
 
   // Tab items configuration
@@ -597,6 +628,12 @@ const Settings = () => {
             }
             extra={
               <Space>
+                <Input.Search
+                  allowClear
+                  placeholder="Search name, email or code"
+                  onSearch={(value) => setUserSearch(value.trim())}
+                  style={{ width: 240 }}
+                />
                 <Button
                   type="primary"
                   icon={<PlusOutlined />}
@@ -626,9 +663,16 @@ const Settings = () => {
               pagination={{
                 pageSizeOptions: ['10', '20', '50', '100'],
                 showSizeChanger: true,
-                showTotal: (total) => `Total ${total} users`,
+                showTotal: (total) => (nextUserCursor ? `${total} users loaded` : `Total ${total} users`),
               }}
             />
+            {nextUserCursor && (
+              <div style={{ marginTop: 12, textAlign: "center" }}>
+                <Button onClick={loadMoreUsers} loading={loadingMoreUsers}>
+                  Load more users
+                </Button>
+              </div>
+            )}
           </Card>
         </div>
       ),
@@ -815,9 +859,8 @@ const Settings = () => {
               showSearch
               disabled={isEditingOwnHrAccount}
               placeholder="Select a first approver"
-              filterOption={(input, option) =>
-                (option?.label ?? "").toLowerCase().includes(input.toLowerCase())
-              }
+              filterOption={false}
+              onSearch={fetchApproverOptions}
               options={editApproverOptions.map((u) => ({
                 value: u.id,
                 label: getApproverOptionLabel(u),
@@ -850,9 +893,8 @@ const Settings = () => {
               showSearch
               disabled={isEditingOwnHrAccount}
               placeholder="Select a second approver"
-              filterOption={(input, option) =>
-                (option?.label ?? "").toLowerCase().includes(input.toLowerCase())
-              }
+              filterOption={false}
+              onSearch={fetchApproverOptions}
               options={editApproverOptions.map((u) => ({
                 value: u.id,
                 label: getApproverOptionLabel(u),
@@ -1055,9 +1097,8 @@ const Settings = () => {
             <Select
               showSearch
               placeholder="Select a first approver"
-              filterOption={(input, option) =>
-                (option?.label ?? "").toLowerCase().includes(input.toLowerCase())
-              }
+              filterOption={false}
+              onSearch={fetchApproverOptions}
               options={approverOptions.map((u) => ({
                   value: u.id,
                   label: getApproverOptionLabel(u),
@@ -1085,9 +1126,8 @@ const Settings = () => {
               allowClear
               showSearch
               placeholder="Select a second approver"
-              filterOption={(input, option) =>
-                (option?.label ?? "").toLowerCase().includes(input.toLowerCase())
-              }
+              filterOption={false}
+              onSearch={fetchApproverOptions}
               options={approverOptions.map((u) => ({
                   value: u.id,
                   label: getApproverOptionLabel(u),
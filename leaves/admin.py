@@ -5,6 +5,7 @@ from .models import (
     HolidayTemplate,
     HolidayTemplateDate,
     LeaveBalance,
+    LeaveBalanceEntry,
     LeaveCategory,
     LeaveRequest,
     PublicHoliday,
@@ -20,10 +21,29 @@ class LeaveCategoryAdmin(admin.ModelAdmin):
 
 @admin.register(LeaveBalance)
 class LeaveBalanceAdmin(admin.ModelAdmin):
-    list_display = ['user', 'year', 'balance_type', 'allocated_hours', 'used_hours', 'adjusted_hours', 'remaining_hours']
+    # Hour columns are the ledger snapshot; remaining_hours includes the tail.
+    # They are read-only so admin edits cannot bypass LeaveBalanceEntry rows.
+    list_display = ['user', 'year', 'balance_type', 'allocated_hours', 'used_hours', 'adjusted_hours', 'snapshot_at', 'remaining_hours']
     list_filter = ['year', 'balance_type']
     search_fields = ['user__email']
-    readonly_fields = ['remaining_hours']
+    readonly_fields = ['allocated_hours', 'used_hours', 'adjusted_hours', 'snapshot_at', 'remaining_hours']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_totals()
+
+
+@admin.register(LeaveBalanceEntry)
+class LeaveBalanceEntryAdmin(admin.ModelAdmin):
+    list_display = ['balance', 'entry_type', 'allocated_hours', 'used_hours', 'adjusted_hours', 'leave_request', 'created_by', 'created_at']
+    list_filter = ['entry_type', 'balance__year', 'balance__balance_type']
+    search_fields = ['balance__user__email', 'note']
+    raw_id_fields = ['balance', 'leave_request', 'created_by']
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(LeaveRequest)
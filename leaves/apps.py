@@ -1,5 +1,35 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps as global_apps
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_migrate
+
+
+def seed_reference_holidays(sender, using=DEFAULT_DB_ALIAS, apps=global_apps, **kwargs):
+    """
+    Keep reference holiday templates in step with the code after each migrate.
+
+    Seeds through the historical models of the migrated state, so a partial
+    migrate (e.g. back to a migration before ``content_hash``) is skipped
+    instead of querying columns that do not exist yet.
+    """
+    if using != DEFAULT_DB_ALIAS:
+        return
+    try:
+        template_model = apps.get_model('leaves', 'HolidayTemplate')
+        date_model = apps.get_model('leaves', 'HolidayTemplateDate')
+    except LookupError:
+        return
+    if 'content_hash' not in {field.name for field in template_model._meta.get_fields()}:
+        return
+    from .holiday_management import seed_holiday_templates
+
+    seed_holiday_templates(template_model=template_model, date_model=date_model)
 
 
 class LeavesConfig(AppConfig):
     name = 'leaves'
+
+    def ready(self):
+        """Import signals and hook template seeding when app is ready"""
+        import leaves.signals
+
+        post_migrate.connect(seed_reference_holidays, sender=self)
@@ -0,0 +1,171 @@
+"""
+Append-only leave balance ledger.
+
+Balance changes (approvals, cancellations, HR adjustments, recalculations) are
+stored as LeaveBalanceEntry rows with signed hour deltas instead of rewriting
+the LeaveBalance row. The LeaveBalance hour columns are a snapshot of every
+entry up to ``snapshot_at``:
+
+    current = snapshot columns + SUM(entries created after snapshot_at)
+    as of T = snapshot columns +/- SUM(entries between snapshot_at and T)
+
+fold_balance_snapshots() periodically moves the tail into the snapshot so
+reads stay a single short aggregate. Writers only INSERT; approvals still lock
+the LeaveBalance row, but only to serialise the overdraw check.
+"""
+from datetime import timedelta
+from decimal import Decimal
+from typing import NamedTuple
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import LEDGER_FIELDS, LeaveBalance, LeaveBalanceEntry, LeaveRequest
+
+ZERO = Decimal('0.00')
+
+# Entries newer than this are never folded, so a transaction that stamped
+# created_at before committing cannot land behind an advanced snapshot_at.
+SNAPSHOT_LAG = timedelta(minutes=5)
+
+DEDUCTING_BUCKETS = [LeaveBalance.BalanceType.VACATION, LeaveBalance.BalanceType.SICK]
+
+
+class BalanceTotals(NamedTuple):
+    allocated_hours: Decimal
+    used_hours: Decimal
+    adjusted_hours: Decimal
+
+    @property
+    def remaining_hours(self):
+        return self.allocated_hours + self.adjusted_hours - self.used_hours
+
+
+def record_entry(balance, entry_type, *, allocated_hours=ZERO, used_hours=ZERO,
+                 adjusted_hours=ZERO, leave_request=None, created_by=None, note=''):
+    """
+    Append one ledger entry for ``balance``.
+
+    Returns:
+        LeaveBalanceEntry or None when every delta is zero
+    """
+    if not (allocated_hours or used_hours or adjusted_hours):
+        return None
+    return LeaveBalanceEntry.objects.create(
+        balance=balance,
+        entry_type=entry_type,
+        allocated_hours=allocated_hours,
+        used_hours=used_hours,
+        adjusted_hours=adjusted_hours,
+        leave_request=leave_request,
+        created_by=created_by,
+        note=note[:255],
+    )
+
+
+def _sum_entries(entries):
+    sums = entries.aggregate(**{field: Sum(field) for field in LEDGER_FIELDS})
+    return [sums[field] or ZERO for field in LEDGER_FIELDS]
+
+
+def balance_totals(balance, as_of=None):
+    """
+    Return BalanceTotals for ``balance`` now or at datetime ``as_of``.
+
+    Uses with_totals() annotations when present; otherwise one aggregate over
+    the entries between the snapshot and the requested point in time.
+    """
+    snapshot = [getattr(balance, field) for field in LEDGER_FIELDS]
+    if as_of is None and hasattr(balance, 'tail_used_hours'):
+        tail = [getattr(balance, f'tail_{field}') for field in LEDGER_FIELDS]
+        return BalanceTotals(*(base + delta for base, delta in zip(snapshot, tail)))
+
+    entries = LeaveBalanceEntry.objects.filter(balance_id=balance.pk)
+    if as_of is not None and balance.snapshot_at is not None and as_of < balance.snapshot_at:
+        # Walk back from the snapshot: undo entries after as_of.
+        tail = _sum_entries(entries.filter(created_at__gt=as_of, created_at__lte=balance.snapshot_at))
+        return BalanceTotals(*(base - delta for base, delta in zip(snapshot, tail)))
+
+    if balance.snapshot_at is not None:
+        entries = entries.filter(created_at__gt=balance.snapshot_at)
+    if as_of is not None:
+        entries = entries.filter(created_at__lte=as_of)
+    tail = _sum_entries(entries)
+    return BalanceTotals(*(base + delta for base, delta in zip(snapshot, tail)))
+
+
+def fold_balance_snapshots(cutoff=None, batch_size=500):
+    """
+    Fold ledger entries up to ``cutoff`` into the LeaveBalance snapshot columns.
+
+    Each batch locks its balances briefly, aggregates their pending entries in
+    one grouped query and writes the new snapshots with bulk_update.
+
+    Returns:
+        int: Number of balances whose snapshot advanced
+    """
+    cutoff = cutoff or timezone.now() - SNAPSHOT_LAG
+    pending_ids = list(
+        LeaveBalance.objects.filter(
+            Q(snapshot_at__isnull=True) | Q(snapshot_at__lt=cutoff),
+            Q(ledger_entries__created_at__lte=cutoff),
+            Q(snapshot_at__isnull=True) | Q(ledger_entries__created_at__gt=F('snapshot_at')),
+        ).values_list('pk', flat=True).distinct()
+    )
+
+    folded = 0
+    for start in range(0, len(pending_ids), batch_size):
+        chunk = pending_ids[start:start + batch_size]
+        with transaction.atomic():
+            balances = list(
+                LeaveBalance.objects.select_for_update().filter(
+                    Q(snapshot_at__isnull=True) | Q(snapshot_at__lt=cutoff),
+                    pk__in=chunk,
+                )
+            )
+            tails = {
+                row['balance']: row
+                for row in LeaveBalanceEntry.objects.filter(
+                    Q(balance__snapshot_at__isnull=True) | Q(created_at__gt=F('balance__snapshot_at')),
+                    balance__in=[balance.pk for balance in balances],
+                    created_at__lte=cutoff,
+                ).order_by().values('balance').annotate(
+                    **{field: Sum(field) for field in LEDGER_FIELDS}
+                )
+            }
+            for balance in balances:
+                tail = tails.get(balance.pk, {})
+                for field in LEDGER_FIELDS:
+                    setattr(balance, field, getattr(balance, field) + (tail.get(field) or ZERO))
+                balance.snapshot_at = cutoff
+            LeaveBalance.objects.bulk_update(balances, [*LEDGER_FIELDS, 'snapshot_at'])
+            folded += len(balances)
+    return folded
+
+
+def find_ledger_discrepancies(year=None):
+    """
+    Leave requests whose net ledger usage disagrees with their status.
+
+    An approved request in a deducting bucket must net to its total_hours;
+    every other request must net to zero. Runs as one grouped aggregate.
+    """
+    requests = LeaveRequest.objects.all()
+    if year is not None:
+        requests = requests.filter(start_date__year=year)
+    decimal_field = DecimalField(max_digits=7, decimal_places=2)
+    return requests.annotate(
+        bucket=Coalesce('balance_type_snapshot', 'leave_category__balance_bucket'),
+        ledger_hours=Coalesce(Sum('balance_entries__used_hours'), Value(ZERO), output_field=decimal_field),
+        expected_hours=Case(
+            When(
+                status=LeaveRequest.Status.APPROVED,
+                bucket__in=DEDUCTING_BUCKETS,
+                then=F('total_hours'),
+            ),
+            default=Value(ZERO),
+            output_field=decimal_field,
+        ),
+    ).exclude(ledger_hours=F('expected_hours')).order_by('start_date', 'id')
@@ -0,0 +1,170 @@
+"""
+Published-holiday feeds (JSON and iCalendar) cached per scope and year.
+
+Everyone sharing an entity/location scope and country gets the same feed, so
+it is built once per (scope, year, version) and kept in the default cache.
+sync_holiday_days bumps the version whenever HolidayDay rows change
+(publish, unpublish, split, single-holiday saves), which orphans every cached
+feed at once. The .ics rendering carries a strong ETag of its bytes; the
+JSON rows get a weak ETag because DRF renders them differently per Accept
+header. Either way clients revalidate with If-None-Match and get a 304.
+
+Calendar apps subscribe to the .ics URL without an Authorization header, so
+that view also accepts a revocable per-user HolidayFeedToken in the URL.
+"""
+import hashlib
+import json
+import secrets
+from datetime import date, timedelta, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import HolidayDay, HolidayFeedToken, PublicHoliday
+from .utils import holiday_days_for_user, normalize_country_code
+
+HOLIDAY_FEED_NAMESPACE = 'holiday-feed'
+HOLIDAY_FEED_TIMEOUT = 24 * 60 * 60
+# Client freshness; afterwards browsers and calendar apps revalidate with the ETag
+HOLIDAY_FEED_MAX_AGE = 60 * 60
+
+ICS_PRODID = '-//Leave Management System//Public Holidays//EN'
+
+
+def invalidate_holiday_feeds():
+    """Drop every cached holiday feed; called when HolidayDay rows change."""
+    from core.cache import bump_cache_namespace
+
+    bump_cache_namespace(HOLIDAY_FEED_NAMESPACE)
+
+
+def _feed_cache_key(user, year):
+    from core.cache import cache_namespace_version
+
+    country_code = normalize_country_code(getattr(getattr(user, 'location', None), 'country', None))
+    scope = '|'.join([*HolidayDay.scope_keys_for_user(user), country_code or ''])
+    digest = hashlib.sha1(scope.encode()).hexdigest()
+    version = cache_namespace_version(HOLIDAY_FEED_NAMESPACE)
+    return f"{HOLIDAY_FEED_NAMESPACE}:{version}:{digest}:{year or 'all'}"
+
+
+def _etag(content, weak=False):
+    tag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+    return f'W/{tag}' if weak else tag
+
+
+def _feed_token_hash(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def issue_feed_token(user):
+    """Create or rotate ``user``'s feed token; returns the raw token (shown once)."""
+    token = secrets.token_urlsafe(32)
+    HolidayFeedToken.objects.update_or_create(
+        user=user,
+        defaults={'token_hash': _feed_token_hash(token), 'created_at': timezone.now()},
+    )
+    return token
+
+
+def revoke_feed_token(user):
+    HolidayFeedToken.objects.filter(user=user).delete()
+
+
+def user_for_feed_token(token):
+    """Active owner of ``token``, or None for unknown/revoked tokens."""
+    feed_token = HolidayFeedToken.objects.select_related('user').filter(
+        token_hash=_feed_token_hash(token), user__is_active=True,
+    ).first()
+    return feed_token.user if feed_token else None
+
+
+def _ics_text(value):
+    return (
+        value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+    )
+
+
+def _ics_fold(line):
+    """Fold content lines longer than 75 octets (RFC 5545 section 3.1)."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while encoded:
+        limit = 75 if not parts else 74
+        # Never split a multi-byte UTF-8 character
+        while limit < len(encoded) and (encoded[limit] & 0xC0) == 0x80:
+            limit -= 1
+        parts.append(encoded[:limit].decode())
+        encoded = encoded[limit:]
+    return '\r\n '.join(parts)
+
+
+def render_ics(holidays):
+    """Render PublicHoliday rows as an all-day-event VCALENDAR."""
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{ICS_PRODID}',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+    ]
+    for holiday in holidays:
+        stamp = holiday.published_at or holiday.updated_at
+        lines.extend([
+            'BEGIN:VEVENT',
+            f'UID:{holiday.id}@holidays',
+            f'DTSTAMP:{stamp.astimezone(dt_timezone.utc):%Y%m%dT%H%M%SZ}',
+            f'DTSTART;VALUE=DATE:{holiday.start_date:%Y%m%d}',
+            f'DTEND;VALUE=DATE:{holiday.end_date + timedelta(days=1):%Y%m%d}',
+            f'SUMMARY:{_ics_text(holiday.holiday_name)}',
+            'TRANSP:TRANSPARENT',
+            'END:VEVENT',
+        ])
+    lines.append('END:VCALENDAR')
+    return ''.join(f'{_ics_fold(line)}\r\n' for line in lines).encode()
+
+
+def _holiday_row(holiday):
+    return {
+        'id': str(holiday.id),
+        'name': holiday.holiday_name,
+        'start_date': holiday.start_date.isoformat(),
+        'end_date': holiday.end_date.isoformat(),
+        'year': holiday.year,
+        'is_recurring': holiday.is_recurring,
+        'entity_id': str(holiday.entity_id) if holiday.entity_id else None,
+        'location_id': str(holiday.location_id) if holiday.location_id else None,
+    }
+
+
+def build_holiday_feed(user, year=None):
+    """Query and render the user's Published holidays (optionally one year)."""
+    if year:
+        days = holiday_days_for_user(user, date(year, 1, 1), date(year, 12, 31))
+    else:
+        days = holiday_days_for_user(user, date.min)
+    holidays = PublicHoliday.objects.filter(id__in=days.values('holiday_id'))
+    if year:
+        holidays = holidays.filter(year=year)
+    holidays = list(holidays.order_by('start_date'))
+
+    data = [_holiday_row(holiday) for holiday in holidays]
+    ics = render_ics(holidays)
+    return {
+        'data': data,
+        'etag': _etag(json.dumps(data, sort_keys=True).encode(), weak=True),
+        'ics': ics,
+        'ics_etag': _etag(ics),
+    }
+
+
+def get_holiday_feed(user, year=None):
+    """Cached build_holiday_feed for the user's scope."""
+    cache_key = _feed_cache_key(user, year)
+    feed = cache.get(cache_key)
+    if feed is None:
+        feed = build_holiday_feed(user, year)
+        cache.set(cache_key, feed, HOLIDAY_FEED_TIMEOUT)
+    return feed
@@ -1,14 +1,21 @@
 """Holiday template generation and publication services."""
+import hashlib
+import json
+from collections import defaultdict
 from datetime import date, timedelta
+from functools import lru_cache
+
 from django.db import transaction
 from django.utils import timezone
 from lunardate import LunarDate
 
 from core.models import AuditLog
-from organizations.models import Entity
+from organizations.models import Entity, Location
 
+from .holiday_feed import invalidate_holiday_feeds
 from .models import (
     HolidayCalendar,
+    HolidayDay,
     HolidayTemplate,
     HolidayTemplateDate,
     PublicHoliday,
@@ -20,10 +27,12 @@ OPM_URL = "https://www.opm.gov/policy-data-oversight/pay-leave/federal-holidays/
 VN_SOURCE = "Vietnam Labor Code 2019, Article 112"
 
 
+@lru_cache(maxsize=None)
 def _vn_template_rows(year):
+    """Vietnam rows for years without a reviewed list; lunar dates are converted once per year."""
     lunar_new_year = LunarDate(year, 1, 1).toSolarDate()
     hung_kings_day = LunarDate(year, 3, 10).toSolarDate()
-    return [
+    return (
         ("New Year's Day", f"{year}-01-01", "STATUTORY"),
         (
             "Lunar New Year",
@@ -34,8 +43,10 @@ def _vn_template_rows(year):
         ("Reunification Day", f"{year}-04-30", "STATUTORY"),
         ("International Labor Day", f"{year}-05-01", "STATUTORY"),
         ("National Day", f"{year}-09-01/{year}-09-02", "STATUTORY"),
-    ]
+    )
+
 
+# Reviewed rows; Vietnam years in VN_GENERATED_YEARS come from _vn_template_rows
 TEMPLATE_DATA = {
     ("US", 2026): [
         ("New Year's Day", "2026-01-01", "STATUTORY"),
@@ -74,8 +85,34 @@ TEMPLATE_DATA = {
     ],
 }
 
-for template_year in range(2027, 2036):
-    TEMPLATE_DATA[("VN", template_year)] = _vn_template_rows(template_year)
+VN_GENERATED_YEARS = range(2027, 2036)
+TEMPLATE_KEYS = (*TEMPLATE_DATA, *(("VN", year) for year in VN_GENERATED_YEARS))
+
+
+def template_rows(country_code, year):
+    """(holiday_name, "start[/end]", holiday_type) rows for a supported template."""
+    if (country_code, year) in TEMPLATE_DATA:
+        return TEMPLATE_DATA[(country_code, year)]
+    if country_code == "VN" and year in VN_GENERATED_YEARS:
+        return _vn_template_rows(year)
+    raise KeyError((country_code, year))
+
+
+def _template_definition(country_code, year):
+    """Template attributes, parsed date rows and a hash of both."""
+    source_name = "U.S. Office of Personnel Management" if country_code == "US" else VN_SOURCE
+    fields = {
+        "name": f"{country_code} {year} official holidays",
+        "source_name": source_name,
+        "source_url": OPM_URL if country_code == "US" else "",
+    }
+    rows = []
+    for holiday_name, date_value, holiday_type in template_rows(country_code, year):
+        parts = date_value.split("/")
+        rows.append((holiday_name, date.fromisoformat(parts[0]), date.fromisoformat(parts[-1]), holiday_type))
+    content = json.dumps([fields, rows], default=str, sort_keys=True)
+    fields["content_hash"] = hashlib.sha256(content.encode()).hexdigest()
+    return fields, rows
 
 
 def validate_holiday_dates(calendar, start_date, end_date, exclude_holiday_id=None):
@@ -94,69 +131,166 @@ def validate_holiday_dates(calendar, start_date, end_date, exclude_holiday_id=No
         raise ValueError("Holiday date range overlaps an existing holiday in this calendar")
 
 
-def validate_publish_conflicts(calendar):
+def sync_holiday_days(holidays):
+    """
+    Rebuild the HolidayDay rows of the PublicHoliday queryset ``holidays``.
+
+    Rows are dropped and re-inserted for Published, active holidays only, so
+    this is safe to call after any status, date or scope change. Cached
+    holiday feeds are invalidated when anything changed.
+    """
+    deleted, _ = HolidayDay.objects.filter(holiday__in=holidays.values("id")).delete()
+    rows = holidays.filter(is_active=True, status=PublicHoliday.Status.PUBLISHED).values_list(
+        "id", "entity_id", "location_id", "calendar__country_code", "start_date", "end_date",
+    )
+    days = []
+    for holiday_id, entity_id, location_id, country_code, start_date, end_date in rows:
+        scope_key = HolidayDay.scope_key_for(entity_id, location_id)
+        for offset in range((end_date - start_date).days + 1):
+            days.append(HolidayDay(
+                holiday_id=holiday_id,
+                scope_key=scope_key,
+                country_code=country_code or "",
+                date=start_date + timedelta(days=offset),
+            ))
+    HolidayDay.objects.bulk_create(days, batch_size=1000)
+    if deleted or days:
+        invalidate_holiday_feeds()
+
+
+def _overlapping_pairs(holidays, others=None):
+    """
+    Sweep date ranges in start order and return every overlapping pair.
+
+    With ``others`` only (holiday, other) pairs across the two lists are
+    returned; without it, pairs within ``holidays``. Runs in
+    O(n log n + overlaps) over rows that are already in memory.
+    """
+    events = sorted(
+        [(holiday.start_date, 0, holiday) for holiday in holidays]
+        + [(other.start_date, 1, other) for other in others or ()],
+        key=lambda event: (event[0], event[1]),
+    )
+    active = ([], [])
+    pairs = []
+    for start_date, side, row in events:
+        for rows in active:
+            rows[:] = [open_row for open_row in rows if open_row.end_date >= start_date]
+        if others is None:
+            pairs.extend((open_row, row) for open_row in active[0])
+        elif side == 0:
+            pairs.extend((row, open_row) for open_row in active[1])
+        else:
+            pairs.extend((open_row, row) for open_row in active[0])
+        active[side].append(row)
+    return pairs
+
+
+def validate_calendar_dates(calendar, holidays):
+    """Check a whole calendar's holidays stay in its year and do not overlap each other."""
+    errors = []
+    for holiday in holidays:
+        if holiday.end_date < holiday.start_date:
+            errors.append(f"{holiday.holiday_name}: end date must be on or after start date")
+        elif holiday.start_date.year != calendar.year or holiday.end_date.year != calendar.year:
+            errors.append(f"{holiday.holiday_name} must remain within calendar year {calendar.year}")
+    errors.extend(
+        f"{first.holiday_name} overlaps {second.holiday_name} in this calendar"
+        for first, second in _overlapping_pairs(holidays)
+    )
+    if errors:
+        raise ValueError("; ".join(errors))
+
+
+def find_publish_conflicts(calendar, holidays=None):
+    """
+    Return (holiday, published_holiday) pairs that would clash if ``calendar`` were published.
+
+    Published holidays from other calendars in the same entity/location scope
+    are fetched in one query bounded by the calendar's date span.
+    """
+    if holidays is None:
+        holidays = list(calendar.holidays.exclude(status=PublicHoliday.Status.ARCHIVED))
+    if not holidays:
+        return []
+    published = PublicHoliday.objects.filter(
+        status=PublicHoliday.Status.PUBLISHED,
+        entity_id=calendar.entity_id,
+        location_id=calendar.location_id,
+        start_date__lte=max(holiday.end_date for holiday in holidays),
+        end_date__gte=min(holiday.start_date for holiday in holidays),
+    ).exclude(calendar_id=calendar.id).only("holiday_name", "start_date", "end_date")
+    return _overlapping_pairs(holidays, list(published))
+
+
+def validate_publish_conflicts(calendar, holidays=None):
     """Prevent Published calendars in the same scope from covering the same date."""
-    for holiday in calendar.holidays.exclude(status=PublicHoliday.Status.ARCHIVED):
-        conflict = PublicHoliday.objects.filter(
-            status=PublicHoliday.Status.PUBLISHED,
-            entity_id=calendar.entity_id,
-            location_id=calendar.location_id,
-            start_date__lte=holiday.end_date,
-            end_date__gte=holiday.start_date,
-        ).exclude(calendar_id=calendar.id).first()
-        if conflict:
-            scope = calendar.location.location_name if calendar.location_id else calendar.entity.entity_name
-            raise ValueError(
-                f"{holiday.holiday_name} overlaps Published holiday "
-                f"{conflict.holiday_name} for {scope}"
-            )
+    conflicts = find_publish_conflicts(calendar, holidays)
+    if conflicts:
+        scope = calendar.location.location_name if calendar.location_id else calendar.entity.entity_name
+        raise ValueError("; ".join(
+            f"{holiday.holiday_name} overlaps Published holiday {conflict.holiday_name} for {scope}"
+            for holiday, conflict in conflicts
+        ))
 
 
-def publish_impact(calendar):
+def publish_impact(calendar, holidays=None):
     """Publishing holidays does not change leave requests or balances."""
     if calendar.status != HolidayCalendar.Status.DRAFT:
         raise ValueError("Only Draft calendars can be published")
-    validate_publish_conflicts(calendar)
+    validate_publish_conflicts(calendar, holidays)
     return {"affected_requests": 0, "changes": []}
 
 
 @transaction.atomic
-def seed_holiday_templates():
-    """Idempotently create reviewed reference templates."""
-    templates = []
-    for (country_code, year), rows in TEMPLATE_DATA.items():
-        source_name = "U.S. Office of Personnel Management" if country_code == "US" else VN_SOURCE
-        template, _ = HolidayTemplate.objects.update_or_create(
-            country_code=country_code,
-            year=year,
-            version=1,
-            defaults={
-                "name": f"{country_code} {year} official holidays",
-                "source_name": source_name,
-                "source_url": OPM_URL if country_code == "US" else "",
-            },
-        )
-        for holiday_name, date_value, holiday_type in rows:
-            parts = date_value.split("/")
-            start_date = date.fromisoformat(parts[0])
-            end_date = date.fromisoformat(parts[-1])
-            HolidayTemplateDate.objects.update_or_create(
+def seed_holiday_templates(force=False, template_model=HolidayTemplate, date_model=HolidayTemplateDate):
+    """
+    Create or refresh the reviewed reference templates.
+
+    Runs after every ``migrate`` (see LeavesConfig.ready, which passes the
+    migrated state's historical models) and from the seed_holiday_templates
+    command. Templates whose content hash matches the code are left alone,
+    so the steady state is a single SELECT. Returns the templates that were
+    created or rewritten.
+    """
+    existing = {
+        (template.country_code, template.year): template
+        for template in template_model.objects.filter(version=1)
+    }
+    seeded = []
+    for country_code, year in TEMPLATE_KEYS:
+        fields, rows = _template_definition(country_code, year)
+        template = existing.get((country_code, year))
+        if template and template.content_hash == fields["content_hash"] and not force:
+            continue
+        if template:
+            for name, value in fields.items():
+                setattr(template, name, value)
+            template.save()
+            template.dates.all().delete()
+        else:
+            template = template_model.objects.create(
+                country_code=country_code, year=year, version=1, **fields
+            )
+        date_model.objects.bulk_create(
+            date_model(
                 template=template,
-                start_date=start_date,
                 holiday_name=holiday_name,
-                defaults={
-                    "end_date": end_date,
-                    "holiday_type": holiday_type,
-                    "source_note": source_name,
-                },
+                start_date=start_date,
+                end_date=end_date,
+                holiday_type=holiday_type,
+                source_note=fields["source_name"],
             )
-        templates.append(template)
-    return templates
+            for holiday_name, start_date, end_date, holiday_type in rows
+        )
+        seeded.append(template)
+    return seeded
 
 
-def _target_scopes(entity, country_overrides=None):
+def _target_scopes(entity, country_overrides=None, locations=None):
     country_overrides = country_overrides or {}
-    locations = list(entity.locations.filter(is_active=True))
+    if locations is None:
+        locations = list(entity.locations.filter(is_active=True))
     mapped = [
         (
             country_overrides.get(str(location.id))
@@ -176,56 +310,134 @@ def _target_scopes(entity, country_overrides=None):
     ]
 
 
+def _active_locations_by_entity(entities):
+    locations = defaultdict(list)
+    for location in Location.objects.filter(entity__in=[entity.id for entity in entities], is_active=True):
+        locations[location.entity_id].append(location)
+    return locations
+
+
+def _latest_templates(country_codes, year):
+    """Newest template per country for ``year`` with its dates, in two queries."""
+    templates = {}
+    queryset = HolidayTemplate.objects.filter(
+        country_code__in=country_codes, year=year
+    ).order_by("country_code", "-version").prefetch_related("dates")
+    for template in queryset:
+        templates.setdefault(template.country_code, template)
+    return templates
+
+
 @transaction.atomic
-def generate_draft_calendars(year, entities=None, country_overrides=None):
-    """Copy supported templates into entity/location-scoped Draft calendars."""
-    seed_holiday_templates()
-    entities = entities if entities is not None else Entity.objects.filter(is_active=True)
+def bulk_generate_draft_calendars(year, entities=None, country_overrides=None):
+    """
+    Copy supported templates into entity/location-scoped Draft calendars.
+
+    Locations, templates (with their dates) and existing calendars are each
+    loaded once; new calendars and their holidays are written with one
+    bulk_create apiece. Returns ``(created, skipped)`` where skipped holds the
+    already-existing calendars for the requested scopes.
+
+    The entity rows are locked first so concurrent generations for the same
+    entities run one after the other. Calendars inserted meanwhile by another
+    path are dropped by ``ignore_conflicts`` and reported as skipped.
+    """
+    entities = list(entities if entities is not None else Entity.objects.filter(is_active=True))
+    entity_ids = [entity.id for entity in entities]
+    list(Entity.objects.select_for_update().filter(id__in=entity_ids).order_by("id").values_list("id"))
+    locations = _active_locations_by_entity(entities)
+    scopes = [
+        (entity, country_code, location)
+        for entity in entities
+        for country_code, location in _target_scopes(entity, country_overrides, locations[entity.id])
+    ]
+    templates = _latest_templates({country_code for _, country_code, _ in scopes}, year)
+    calendars = HolidayCalendar.objects.filter(
+        year=year, entity__in=entity_ids
+    ).select_related("entity", "location").with_holiday_counts()
+    existing = {
+        (calendar.entity_id, calendar.location_id, calendar.country_code): calendar
+        for calendar in calendars
+    }
+
     created = []
-    for entity in entities:
-        for country_code, location in _target_scopes(entity, country_overrides):
-            template = HolidayTemplate.objects.filter(
-                country_code=country_code, year=year
-            ).order_by("-version").first()
-            calendar, was_created = HolidayCalendar.objects.get_or_create(
+    skipped = []
+    for entity, country_code, location in scopes:
+        key = (entity.id, location.id if location else None, country_code)
+        if key in existing:
+            skipped.append(existing[key])
+            continue
+        calendar = HolidayCalendar(
+            year=year,
+            entity=entity,
+            location=location,
+            country_code=country_code,
+            name=f"{entity.entity_name} - {location.location_name + ' - ' if location else ''}{country_code} {year}",
+            source_template=templates.get(country_code),
+            status=HolidayCalendar.Status.DRAFT,
+        )
+        created.append(calendar)
+
+    HolidayCalendar.objects.bulk_create(created, ignore_conflicts=True)
+    inserted = set(
+        HolidayCalendar.objects.filter(id__in=[calendar.id for calendar in created]).values_list("id", flat=True)
+    )
+    if len(inserted) < len(created):
+        lost = {
+            (calendar.entity_id, calendar.location_id, calendar.country_code)
+            for calendar in created
+            if calendar.id not in inserted
+        }
+        skipped.extend(
+            calendar
+            for calendar in calendars.exclude(id__in=[calendar.id for calendar in skipped])
+            if (calendar.entity_id, calendar.location_id, calendar.country_code) in lost
+        )
+        created = [calendar for calendar in created if calendar.id in inserted]
+    PublicHoliday.objects.bulk_create(
+        [
+            PublicHoliday(
+                calendar=calendar,
+                entity=calendar.entity,
+                location=calendar.location,
+                holiday_name=row.holiday_name,
+                start_date=row.start_date,
+                end_date=row.end_date,
                 year=year,
-                entity=entity,
-                location=location,
-                country_code=country_code,
-                defaults={
-                    "name": f"{entity.entity_name} - {location.location_name + ' - ' if location else ''}{country_code} {year}",
-                    "source_template": template,
-                    "status": HolidayCalendar.Status.DRAFT,
-                },
+                holiday_type=row.holiday_type,
+                status=PublicHoliday.Status.DRAFT,
+                source_note=row.source_note,
             )
-            if not was_created:
-                continue
-            if template:
-                PublicHoliday.objects.bulk_create(
-                    [
-                        PublicHoliday(
-                            calendar=calendar,
-                            entity=entity,
-                            location=location,
-                            holiday_name=row.holiday_name,
-                            start_date=row.start_date,
-                            end_date=row.end_date,
-                            year=year,
-                            holiday_type=row.holiday_type,
-                            status=PublicHoliday.Status.DRAFT,
-                            source_note=row.source_note,
-                        )
-                        for row in template.dates.all()
-                    ]
-                )
-            created.append(calendar)
+            for calendar in created
+            if calendar.source_template
+            for row in calendar.source_template.dates.all()
+        ],
+        batch_size=1000,
+    )
+    return created, skipped
+
+
+def generate_draft_calendars(year, entities=None, country_overrides=None):
+    """Copy supported templates into Draft calendars; returns the newly created ones."""
+    created, _ = bulk_generate_draft_calendars(year, entities, country_overrides)
     return created
 
 
 def generation_preview(year, entities, country_overrides=None):
     """Describe normalized location mappings and proposed generation scopes."""
-    seed_holiday_templates()
     country_overrides = country_overrides or {}
+    entities = list(entities)
+    locations_by_entity = _active_locations_by_entity(entities)
+    scopes_by_entity = {
+        entity.id: _target_scopes(entity, country_overrides, locations_by_entity[entity.id])
+        for entity in entities
+    }
+    available = set(
+        HolidayTemplate.objects.filter(
+            country_code__in={country_code for scopes in scopes_by_entity.values() for country_code, _ in scopes},
+            year=year,
+        ).values_list("country_code", flat=True)
+    )
     results = []
     for entity in entities:
         locations = [
@@ -236,7 +448,7 @@ def generation_preview(year, entities, country_overrides=None):
                 "country_code": country_overrides.get(str(location.id))
                 or normalize_country_code(location.country),
             }
-            for location in entity.locations.filter(is_active=True)
+            for location in locations_by_entity[entity.id]
         ]
         scopes = [
             {
@@ -244,11 +456,9 @@ def generation_preview(year, entities, country_overrides=None):
                 "scope": "LOCATION" if location else "ENTITY",
                 "location_id": str(location.id) if location else None,
                 "location_name": location.location_name if location else None,
-                "template_available": HolidayTemplate.objects.filter(
-                    country_code=country_code, year=year
-                ).exists(),
+                "template_available": country_code in available,
             }
-            for country_code, location in _target_scopes(entity, country_overrides)
+            for country_code, location in scopes_by_entity[entity.id]
         ]
         results.append(
             {
@@ -264,7 +474,13 @@ def generation_preview(year, entities, country_overrides=None):
 
 @transaction.atomic
 def split_future_entity_calendars(entity, today=None, actor=None):
-    """Move future entity holidays to matching old-country locations after scope becomes mixed."""
+    """
+    Move future entity holidays to matching old-country locations after scope becomes mixed.
+
+    Source calendars and their future holidays are locked and read in two
+    queries; target calendars and copied holidays are written with one
+    bulk_create each and the sources archived with a single UPDATE.
+    """
     today = today or timezone.localdate()
     locations = list(entity.locations.filter(is_active=True))
     country_codes = {normalize_country_code(location.country) for location in locations}
@@ -272,40 +488,52 @@ def split_future_entity_calendars(entity, today=None, actor=None):
     if len(country_codes) <= 1:
         return []
 
-    created = []
-    entity_calendars = HolidayCalendar.objects.select_for_update().filter(
+    entity_calendars = list(HolidayCalendar.objects.select_for_update().filter(
         entity=entity,
         location__isnull=True,
-    )
-    for calendar in entity_calendars:
-        future_holidays = list(
-            calendar.holidays.select_for_update().filter(
-                start_date__gt=today,
-            ).exclude(status=PublicHoliday.Status.ARCHIVED)
+    ))
+    future_by_calendar = defaultdict(list)
+    for holiday in PublicHoliday.objects.select_for_update().filter(
+        calendar__in=[calendar.id for calendar in entity_calendars],
+        start_date__gt=today,
+    ).exclude(status=PublicHoliday.Status.ARCHIVED):
+        future_by_calendar[holiday.calendar_id].append(holiday)
+    locations_by_country = defaultdict(list)
+    for location in locations:
+        locations_by_country[normalize_country_code(location.country)].append(location)
+    existing_targets = {
+        (target.year, target.location_id, target.country_code): target
+        for target in HolidayCalendar.objects.filter(
+            entity=entity,
+            location__in=[location.id for location in locations],
         )
+    }
+
+    created = []
+    new_targets = []
+    copies = []
+    for calendar in entity_calendars:
+        future_holidays = future_by_calendar.get(calendar.id)
         if not future_holidays:
             continue
-        target_locations = [
-            location
-            for location in locations
-            if normalize_country_code(location.country) == calendar.country_code
-        ]
-        for location in target_locations:
-            target, _ = HolidayCalendar.objects.get_or_create(
-                year=calendar.year,
-                entity=entity,
-                location=location,
-                country_code=calendar.country_code,
-                defaults={
-                    "name": f"{entity.entity_name} - {location.location_name} - {calendar.country_code} {calendar.year}",
-                    "source_template": calendar.source_template,
-                    "status": calendar.status,
-                    "published_by": calendar.published_by,
-                    "published_at": calendar.published_at,
-                },
-            )
-            for holiday in future_holidays:
-                PublicHoliday.objects.create(
+        for location in locations_by_country.get(calendar.country_code, []):
+            key = (calendar.year, location.id, calendar.country_code)
+            target = existing_targets.get(key)
+            if target is None:
+                target = existing_targets[key] = HolidayCalendar(
+                    year=calendar.year,
+                    entity=entity,
+                    location=location,
+                    country_code=calendar.country_code,
+                    name=f"{entity.entity_name} - {location.location_name} - {calendar.country_code} {calendar.year}",
+                    source_template_id=calendar.source_template_id,
+                    status=calendar.status,
+                    published_by_id=calendar.published_by_id,
+                    published_at=calendar.published_at,
+                )
+                new_targets.append(target)
+            copies.extend(
+                PublicHoliday(
                     calendar=target,
                     entity=entity,
                     location=location,
@@ -316,13 +544,21 @@ def split_future_entity_calendars(entity, today=None, actor=None):
                     holiday_type=holiday.holiday_type,
                     status=holiday.status,
                     source_note=holiday.source_note,
-                    published_by=holiday.published_by,
+                    published_by_id=holiday.published_by_id,
                     published_at=holiday.published_at,
                 )
+                for holiday in future_holidays
+            )
             created.append(target)
-        calendar.holidays.filter(id__in=[holiday.id for holiday in future_holidays]).update(
-            status=PublicHoliday.Status.ARCHIVED
-        )
+
+    HolidayCalendar.objects.bulk_create(new_targets)
+    PublicHoliday.objects.bulk_create(copies, batch_size=1000)
+    moved = PublicHoliday.objects.filter(
+        id__in=[holiday.id for holidays in future_by_calendar.values() for holiday in holidays]
+    )
+    moved.update(status=PublicHoliday.Status.ARCHIVED)
+    sync_holiday_days(moved)
+    sync_holiday_days(PublicHoliday.objects.filter(id__in=[holiday.id for holiday in copies]))
     if actor and created:
         AuditLog.objects.create(
             user=actor,
@@ -344,22 +580,15 @@ def publish_calendar(calendar, actor):
     holidays = list(calendar.holidays.exclude(status=PublicHoliday.Status.ARCHIVED))
     if not holidays:
         raise ValueError("Cannot publish an empty holiday calendar")
-    for holiday in holidays:
-        validate_holiday_dates(
-            calendar,
-            holiday.start_date,
-            holiday.end_date,
-            exclude_holiday_id=holiday.id,
-        )
-    validate_publish_conflicts(calendar)
-
-    preview = publish_impact(calendar)
+    validate_calendar_dates(calendar, holidays)
+    preview = publish_impact(calendar, holidays)
     now = timezone.now()
     calendar.holidays.filter(status=PublicHoliday.Status.DRAFT).update(
         status=PublicHoliday.Status.PUBLISHED,
         published_by=actor,
         published_at=now,
     )
+    sync_holiday_days(calendar.holidays.all())
     calendar.status = HolidayCalendar.Status.PUBLISHED
     calendar.published_by = actor
     calendar.published_at = now
@@ -407,6 +636,7 @@ def unpublish_calendar(calendar, actor, preview_token):
         published_by=None,
         published_at=None,
     )
+    sync_holiday_days(calendar.holidays.all())
     calendar.status = HolidayCalendar.Status.DRAFT
     calendar.published_by = None
     calendar.published_at = None
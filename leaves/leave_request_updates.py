@@ -375,12 +375,13 @@ def update_leave_request(actor, request_id, raw_data):
                 balance_type=balance_type,
                 defaults={'allocated_hours': default_hours},
             )
-            if total_hours > balance.remaining_hours:
+            remaining_hours = balance.remaining_hours
+            if total_hours > remaining_hours:
                 raise LeaveUpdateError(
                     {
                         'error': (
                             f'Insufficient balance. Requested: {total_hours}h, '
-                            f'Available: {balance.remaining_hours}h'
+                            f'Available: {remaining_hours}h'
                         )
                     },
                     status.HTTP_400_BAD_REQUEST,
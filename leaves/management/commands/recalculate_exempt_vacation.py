@@ -5,6 +5,11 @@ Handles the two balance types:
 - VACATION: dynamic by years of service
 - SICK: fixed 40h
 
+Set-based: employees are processed in batches with a fixed number of queries
+per batch (read balances, upsert missing balances, append ledger entries), and
+vacation tiers are computed once per distinct join date. --dry-run prints the
+allocation diff without writing.
+
 Intended for yearly cron (Jan 1st):
     0 0 1 1 * cd /app && python manage.py recalculate_exempt_vacation
 """
@@ -15,7 +20,7 @@ from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand
 from django.db import transaction
 
-from leaves.models import LeaveBalance
+from leaves.models import LeaveBalance, LeaveBalanceEntry
 from leaves.services import calculate_vacation_hours
 
 User = get_user_model()
@@ -25,6 +30,8 @@ FIXED_BALANCE_DEFAULTS = {
     'SICK': Decimal('40.00'),
 }
 
+BALANCE_TYPES = [LeaveBalance.BalanceType.VACATION, *FIXED_BALANCE_DEFAULTS]
+
 
 class Command(BaseCommand):
     help = 'Recalculate leave balance allocations for all active onboarded employees'
@@ -46,10 +53,17 @@ class Command(BaseCommand):
             action='store_true',
             help='Accepted for backwards compatibility; recalculates VACATION and SICK.',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Employees per transaction (default: 1000)',
+        )
 
     def handle(self, *args, **options):
         year = options['year']
         dry_run = options['dry_run']
+        batch_size = options['batch_size']
         reference_date = date(year, 1, 1)
 
         self.stdout.write(
@@ -57,58 +71,88 @@ class Command(BaseCommand):
             f"(ref: {reference_date}){' [DRY RUN]' if dry_run else ''}"
         )
 
-        users = User.objects.filter(
-            is_active=True,
-            entity__isnull=False,
-            location__isnull=False,
-            department__isnull=False,
+        users = list(
+            User.objects.filter(
+                is_active=True,
+                entity__isnull=False,
+                location__isnull=False,
+                department__isnull=False,
+            ).order_by('email').values_list('id', 'email', 'join_date')
         )
-
-        created_count = 0
-        updated_count = 0
-
-        with transaction.atomic():
-            for user in users:
-                vacation_hours = calculate_vacation_hours(
-                    user.join_date, reference_date
-                )
-
-                if dry_run:
-                    self.stdout.write(
-                        f"  [DRY RUN] {user.email}: VACATION={vacation_hours}h, SICK=40.00h"
-                    )
-                    continue
-
-                obj, created = LeaveBalance.objects.update_or_create(
-                    user=user,
-                    year=year,
-                    balance_type=LeaveBalance.BalanceType.VACATION,
-                    defaults={'allocated_hours': vacation_hours},
-                )
-                if created:
-                    created_count += 1
-                else:
-                    updated_count += 1
-
-                for balance_type, hours in FIXED_BALANCE_DEFAULTS.items():
-                    obj, created = LeaveBalance.objects.update_or_create(
-                        user=user,
-                        year=year,
-                        balance_type=balance_type,
-                        defaults={'allocated_hours': hours},
-                    )
-                    if created:
-                        created_count += 1
-                    else:
-                        updated_count += 1
-
-        total = users.count()
+        # Tier/prorate lookup once per distinct join date instead of per user
+        vacation_by_join_date = {
+            join_date: calculate_vacation_hours(join_date, reference_date)
+            for join_date in {join_date for _, _, join_date in users}
+        }
+
+        counts = {'created': 0, 'updated': 0, 'unchanged': 0}
+        for start in range(0, len(users), batch_size):
+            batch = users[start:start + batch_size]
+            with transaction.atomic():
+                self._apply_batch(batch, year, vacation_by_join_date, counts, dry_run)
+
+        total = len(users)
         if dry_run:
             self.stdout.write(self.style.SUCCESS(
-                f"[DRY RUN] {total} users would be processed"
+                f"[DRY RUN] {total} users would be processed — "
+                f"{counts['created']} to create, {counts['updated']} to update, "
+                f"{counts['unchanged']} unchanged"
             ))
         else:
             self.stdout.write(self.style.SUCCESS(
                 f"Done: {total} users processed — "
-                f"{created_count} created, {updated_count} updated"
+                f"{counts['created']} created, {counts['updated']} updated, "
+                f"{counts['unchanged']} unchanged"
             ))
+
+    def _apply_batch(self, batch, year, vacation_by_join_date, counts, dry_run):
+        existing = {
+            (balance.user_id, balance.balance_type): balance
+            for balance in LeaveBalance.objects.with_totals().filter(
+                year=year,
+                balance_type__in=BALANCE_TYPES,
+                user_id__in=[user_id for user_id, _, _ in batch],
+            )
+        }
+
+        new_balances = []
+        entries = []
+        for user_id, email, join_date in batch:
+            targets = {LeaveBalance.BalanceType.VACATION: vacation_by_join_date[join_date], **FIXED_BALANCE_DEFAULTS}
+            for balance_type, hours in targets.items():
+                balance = existing.get((user_id, balance_type))
+                if balance is None:
+                    counts['created'] += 1
+                    self.stdout.write(f"  {email} {balance_type}: (new) -> {hours}h")
+                    new_balances.append(LeaveBalance(
+                        user_id=user_id,
+                        year=year,
+                        balance_type=balance_type,
+                        allocated_hours=hours,
+                    ))
+                    continue
+
+                current = balance.totals.allocated_hours
+                if current == hours:
+                    counts['unchanged'] += 1
+                    continue
+                counts['updated'] += 1
+                self.stdout.write(f"  {email} {balance_type}: {current}h -> {hours}h ({hours - current:+}h)")
+                entries.append(LeaveBalanceEntry(
+                    balance=balance,
+                    entry_type=LeaveBalanceEntry.EntryType.RECALCULATION,
+                    allocated_hours=hours - current,
+                    note='Yearly allocation recalculation',
+                ))
+
+        if dry_run:
+            return
+        # A balance created concurrently (e.g. first visit to the balance page)
+        # only carries a default opening allocation; overwrite it.
+        LeaveBalance.objects.bulk_create(
+            new_balances,
+            update_conflicts=True,
+            unique_fields=['user', 'year', 'balance_type'],
+            update_fields=['allocated_hours', 'updated_at'],
+        )
+        LeaveBalanceEntry.objects.bulk_create(entries)
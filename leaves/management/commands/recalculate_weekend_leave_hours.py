@@ -7,11 +7,9 @@ from datetime import date
 from decimal import Decimal
 
 from django.core.management.base import BaseCommand
-from django.db import transaction
 
-from leaves.models import LeaveBalance, LeaveRequest
-from leaves.services import BalanceCalculationService
-from leaves.utils import calculate_leave_hours
+from leaves.models import LeaveRequest
+from leaves.recalculation import DEFAULT_BATCH_SIZE, LeaveHoursRecalculation
 
 
 class Command(BaseCommand):
@@ -34,111 +32,75 @@ class Command(BaseCommand):
             action="store_true",
             help="Write recalculated request hours and approved balance deltas",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Requests per compute batch and write transaction (default: {DEFAULT_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Worker processes for hour computation (default: 1, in-process)",
+        )
 
     def handle(self, *args, **options):
         year = options["year"]
         dry_run = options["dry_run"] or not options["execute"]
-        changes = self._collect_changes(year)
+        engine = LeaveHoursRecalculation(
+            LeaveRequest.objects.filter(
+                shift_type=LeaveRequest.ShiftType.FULL_DAY,
+                status__in=[LeaveRequest.Status.PENDING, LeaveRequest.Status.APPROVED],
+                user__work_shift__includes_weekends=True,
+                start_date__year=year,
+            ),
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+            note="Weekend shift leave hours recalculation",
+        )
+        changes = list(engine.iter_changes())
 
         self.stdout.write(
             f"Weekend leave recalculation for {year}"
             f"{' [DRY RUN]' if dry_run else ''}. Negative balances may result."
         )
-
-        if dry_run:
-            self._write_report(changes)
-            return
-
-        with transaction.atomic():
-            for change in changes:
-                if change["missing_balance"]:
-                    continue
-                leave = LeaveRequest.objects.select_for_update().get(id=change["request_id"])
-                leave.total_hours = change["new_hours"]
-                leave.save(update_fields=["total_hours", "updated_at"])
-
-                balance = change["balance"]
-                if balance:
-                    locked_balance = LeaveBalance.objects.select_for_update().get(id=balance.id)
-                    locked_balance.used_hours += change["delta"]
-                    locked_balance.save(update_fields=["used_hours", "updated_at"])
-                    change["balance_after_remaining"] = locked_balance.remaining_hours
-
-        self._write_report(changes)
-
-    def _collect_changes(self, year):
-        requests = LeaveRequest.objects.filter(
-            shift_type=LeaveRequest.ShiftType.FULL_DAY,
-            status__in=[LeaveRequest.Status.PENDING, LeaveRequest.Status.APPROVED],
-            user__work_shift__includes_weekends=True,
-            start_date__year=year,
-        ).select_related(
-            "user",
-            "user__work_shift",
-            "user__department",
-            "user__entity",
-            "user__location",
-            "leave_category",
-        )
-
-        changes = []
-        for leave in requests:
-            new_hours = calculate_leave_hours(
-                leave.user,
-                leave.start_date,
-                leave.end_date,
-                leave.shift_type,
-            )
-            if new_hours == leave.total_hours:
-                continue
-
-            delta = new_hours - leave.total_hours
-            change = {
-                "request_id": leave.id,
-                "user_email": leave.user.email,
-                "dates": f"{leave.start_date} to {leave.end_date}",
-                "status": leave.status,
-                "old_hours": leave.total_hours,
-                "new_hours": new_hours,
-                "delta": delta,
-                "balance": None,
-                "balance_before_remaining": None,
-                "balance_after_remaining": None,
-                "missing_balance": False,
-            }
-
-            if leave.status == LeaveRequest.Status.APPROVED:
-                balance_type = BalanceCalculationService.calculate_balance_type(leave.leave_category)
-                if balance_type != "NONE":
-                    balance = LeaveBalance.objects.filter(
-                        user=leave.user,
-                        year=leave.start_date.year,
-                        balance_type=balance_type,
-                    ).first()
-                    if balance:
-                        change["balance"] = balance
-                        change["balance_before_remaining"] = balance.remaining_hours
-                        change["balance_after_remaining"] = balance.remaining_hours - delta
-                    else:
-                        change["missing_balance"] = True
-
-            changes.append(change)
-        return changes
-
-    def _write_report(self, changes):
+        for leave, error in engine.errors:
+            self.stdout.write(self.style.WARNING(f"{leave.user.email} request={leave.id} skipped: {error}"))
+
+        engine.attach_balances(changes)
+        remaining_after = self._remaining_after(changes, engine)
+        if not dry_run:
+            _, skipped = engine.apply(changes)
+            stale = [change for change in skipped if change.balance is not None or not change.deducts_balance]
+            if stale:
+                self.stdout.write(self.style.WARNING(
+                    f"{len(stale)} request(s) changed during recalculation and were not updated"
+                ))
+        self._write_report(changes, remaining_after)
+
+    @staticmethod
+    def _remaining_after(changes, engine):
+        """Projected remaining hours per balance after all deltas are applied."""
+        deltas = engine.balance_deltas(changes)
+        return {
+            change.balance_key: change.balance.remaining_hours - deltas[change.balance_key]
+            for change in changes
+            if change.balance is not None
+        }
+
+    def _write_report(self, changes, remaining_after):
         applied = 0
         skipped = 0
         negative = 0
 
         for change in changes:
-            missing_balance = change["missing_balance"]
+            missing_balance = change.deducts_balance and change.balance is None
+            after = remaining_after.get(change.balance_key) if change.balance else None
             if missing_balance:
                 skipped += 1
                 marker = "MISSING BALANCE - REQUEST NOT SAFE TO EXECUTE"
-            elif (
-                change["balance_after_remaining"] is not None
-                and change["balance_after_remaining"] < Decimal("0.00")
-            ):
+            elif after is not None and after < Decimal("0.00"):
                 applied += 1
                 negative += 1
                 marker = "WENT NEGATIVE"
@@ -147,15 +109,15 @@ class Command(BaseCommand):
                 marker = ""
 
             self.stdout.write(
-                f"{change['user_email']} request={change['request_id']} "
-                f"{change['dates']} {change['status']} "
-                f"{change['old_hours']}h -> {change['new_hours']}h "
-                f"delta={change['delta']}h {marker}".rstrip()
+                f"{change.user_email} request={change.request_id} "
+                f"{change.start_date} to {change.end_date} {change.status} "
+                f"{change.old_hours}h -> {change.new_hours}h "
+                f"delta={change.delta}h {marker}".rstrip()
             )
-            if change["balance_before_remaining"] is not None:
+            if change.balance is not None:
                 self.stdout.write(
-                    f"  remaining: {change['balance_before_remaining']}h "
-                    f"-> {change['balance_after_remaining']}h"
+                    f"  remaining: {change.balance.remaining_hours}h "
+                    f"-> {after}h"
                 )
 
         self.stdout.write(
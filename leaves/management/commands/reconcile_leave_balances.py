@@ -0,0 +1,35 @@
+"""
+Report leave requests whose balance ledger entries disagree with their status.
+
+Approved requests in the VACATION/SICK buckets must net to their total_hours
+in the ledger; all other requests must net to zero. Exits non-zero when
+discrepancies exist so it can alert from cron:
+    0 3 * * * cd /app && python manage.py reconcile_leave_balances
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from leaves.balance_ledger import find_ledger_discrepancies
+
+
+class Command(BaseCommand):
+    help = "Reconcile leave requests against the balance ledger"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--year',
+            type=int,
+            help='Only check requests starting in this year',
+        )
+
+    def handle(self, *args, **options):
+        discrepancies = list(
+            find_ledger_discrepancies(options['year']).select_related('user')
+        )
+        for leave in discrepancies:
+            self.stdout.write(
+                f"  {leave.id} {leave.user.email} {leave.start_date} {leave.status}: "
+                f"ledger={leave.ledger_hours}h expected={leave.expected_hours}h"
+            )
+        if discrepancies:
+            raise CommandError(f"{len(discrepancies)} leave requests do not reconcile")
+        self.stdout.write(self.style.SUCCESS("Leave balance ledger reconciles"))
@@ -7,11 +7,20 @@ from leaves.holiday_management import seed_holiday_templates
 class Command(BaseCommand):
     help = "Seed US 2026-2027 and Vietnam 2026-2035 holiday templates"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rewrite every template even when its content hash is unchanged',
+        )
+
     def handle(self, *args, **options):
-        templates = seed_holiday_templates()
+        templates = seed_holiday_templates(force=options['force'])
         for template in templates:
             self.stdout.write(
                 self.style.SUCCESS(
                     f"Seeded {template.name}: {template.dates.count()} holidays"
                 )
             )
+        if not templates:
+            self.stdout.write("Holiday templates are up to date")
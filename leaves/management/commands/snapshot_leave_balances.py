@@ -0,0 +1,26 @@
+"""
+Fold leave balance ledger entries into the LeaveBalance snapshot columns.
+
+Keeps current-balance reads to a short tail aggregate. Entries younger than
+SNAPSHOT_LAG are left in the tail. Intended for a periodic cron:
+    */30 * * * * cd /app && python manage.py snapshot_leave_balances
+"""
+from django.core.management.base import BaseCommand
+
+from leaves.balance_ledger import fold_balance_snapshots
+
+
+class Command(BaseCommand):
+    help = "Fold leave balance ledger entries into balance snapshots"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Balances locked and updated per transaction (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        folded = fold_balance_snapshots(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Snapshotted {folded} leave balances"))
@@ -0,0 +1,104 @@
+# Generated by Django 6.1.2 on 2026-10-19 03:03
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+DEDUCTING_BUCKETS = ('VACATION', 'SICK')
+
+
+def backfill_approval_entries(apps, schema_editor):
+    """
+    Move hours of already-approved requests out of the used_hours column into
+    APPROVAL entries so every request reconciles. Current totals are unchanged.
+    """
+    LeaveBalance = apps.get_model('leaves', 'LeaveBalance')
+    LeaveBalanceEntry = apps.get_model('leaves', 'LeaveBalanceEntry')
+    LeaveRequest = apps.get_model('leaves', 'LeaveRequest')
+
+    balances = {
+        (balance.user_id, balance.year, balance.balance_type): balance
+        for balance in LeaveBalance.objects.all()
+    }
+    entries = []
+    touched = {}
+    approved = LeaveRequest.objects.filter(status='APPROVED').select_related('leave_category')
+    for leave in approved.iterator(chunk_size=2000):
+        bucket = leave.balance_type_snapshot or getattr(leave.leave_category, 'balance_bucket', None)
+        if bucket not in DEDUCTING_BUCKETS:
+            continue
+        balance = balances.get((leave.user_id, leave.start_date.year, bucket))
+        if balance is None:
+            continue
+        entries.append(LeaveBalanceEntry(
+            balance=balance,
+            entry_type='APPROVAL',
+            used_hours=leave.total_hours,
+            leave_request=leave,
+            created_by_id=leave.approved_by_id,
+            note='Backfilled from approved request',
+            created_at=leave.approved_at or leave.updated_at,
+        ))
+        balance.used_hours -= leave.total_hours
+        touched[balance.pk] = balance
+
+    LeaveBalanceEntry.objects.bulk_create(entries, batch_size=1000)
+    LeaveBalance.objects.bulk_update(touched.values(), ['used_hours'], batch_size=1000)
+
+
+def fold_entries_into_columns(apps, schema_editor):
+    LeaveBalance = apps.get_model('leaves', 'LeaveBalance')
+    LeaveBalanceEntry = apps.get_model('leaves', 'LeaveBalanceEntry')
+
+    balances = {balance.pk: balance for balance in LeaveBalance.objects.all()}
+    for entry in LeaveBalanceEntry.objects.all().iterator(chunk_size=2000):
+        balance = balances[entry.balance_id]
+        if balance.snapshot_at is not None and entry.created_at <= balance.snapshot_at:
+            continue
+        balance.allocated_hours += entry.allocated_hours
+        balance.used_hours += entry.used_hours
+        balance.adjusted_hours += entry.adjusted_hours
+    LeaveBalance.objects.bulk_update(
+        balances.values(), ['allocated_hours', 'used_hours', 'adjusted_hours'], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0018_leaverequest_leave_breakdown'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='leavebalance',
+            name='snapshot_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='LeaveBalanceEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('entry_type', models.CharField(choices=[('APPROVAL', 'Approval'), ('CANCELLATION', 'Cancellation'), ('ADJUSTMENT', 'Adjustment'), ('RECALCULATION', 'Recalculation')], max_length=20)),
+                ('allocated_hours', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=7)),
+                ('used_hours', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=7)),
+                ('adjusted_hours', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=7)),
+                ('note', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('balance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_entries', to='leaves.leavebalance')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('leave_request', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='balance_entries', to='leaves.leaverequest')),
+            ],
+            options={
+                'db_table': 'leave_balance_entries',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['balance', 'created_at'], name='leave_balan_balance_c9e37c_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_approval_entries, fold_entries_into_columns),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-19 03:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0019_leave_balance_ledger'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='holidaytemplate',
+            name='content_hash',
+            field=models.CharField(blank=True, help_text='SHA-256 of the seeded rows; reseeding skips templates whose hash matches.', max_length=64),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 6.1.2 on 2026-10-19 04:00
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def scope_key(entity_id, location_id):
+    if location_id:
+        return f"location:{location_id}"
+    if entity_id:
+        return f"entity:{entity_id}"
+    return "global"
+
+
+def backfill_holiday_days(apps, schema_editor):
+    PublicHoliday = apps.get_model('leaves', 'PublicHoliday')
+    HolidayDay = apps.get_model('leaves', 'HolidayDay')
+    rows = PublicHoliday.objects.filter(is_active=True, status='PUBLISHED').values_list(
+        'id', 'entity_id', 'location_id', 'calendar__country_code', 'start_date', 'end_date',
+    )
+    days = []
+    for holiday_id, entity_id, location_id, country_code, start_date, end_date in rows.iterator():
+        for offset in range((end_date - start_date).days + 1):
+            days.append(HolidayDay(
+                holiday_id=holiday_id,
+                scope_key=scope_key(entity_id, location_id),
+                country_code=country_code or '',
+                date=start_date + timedelta(days=offset),
+            ))
+    HolidayDay.objects.bulk_create(days, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0020_holidaytemplate_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HolidayDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope_key', models.CharField(max_length=50)),
+                ('country_code', models.CharField(blank=True, max_length=2)),
+                ('date', models.DateField()),
+                ('holiday', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='days', to='leaves.publicholiday')),
+            ],
+            options={
+                'db_table': 'holiday_days',
+                'indexes': [models.Index(fields=['scope_key', 'date'], name='holiday_days_scope_date_idx')],
+                'unique_together': {('holiday', 'date')},
+            },
+        ),
+        migrations.RunPython(backfill_holiday_days, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,18 @@
 """
-Leave management models: LeaveCategory, LeaveBalance, LeaveRequest, PublicHoliday, BusinessTrip
+Leave management models: LeaveCategory, LeaveBalance, LeaveBalanceEntry, LeaveRequest,
+PublicHoliday, BusinessTrip
 """
 import uuid
+from datetime import datetime, timezone as dt_timezone
 from decimal import Decimal
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.conf import settings
+from django.utils import timezone
+
+# Lower bound for ledger tails of balances that were never snapshotted
+LEDGER_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+LEDGER_FIELDS = ('allocated_hours', 'used_hours', 'adjusted_hours')
 
 
 class LeaveCategory(models.Model):
@@ -36,8 +44,55 @@ class LeaveCategory(models.Model):
         return self.category_name
 
 
+class LeaveBalanceQuerySet(models.QuerySet):
+    def with_totals(self):
+        """
+        Annotate the ledger tail (entries after snapshot_at) so that
+        ``balance.totals`` and ``remaining_hours`` need no extra queries.
+        """
+        tail = LeaveBalanceEntry.objects.filter(
+            balance=models.OuterRef('pk'),
+            created_at__gt=Coalesce(
+                models.OuterRef('snapshot_at'),
+                models.Value(LEDGER_EPOCH, output_field=models.DateTimeField()),
+            ),
+        ).order_by().values('balance')
+        return self.annotate(**{
+            f'tail_{field}': Coalesce(
+                models.Subquery(tail.annotate(total=models.Sum(field)).values('total')[:1]),
+                models.Value(Decimal('0.00')),
+                output_field=models.DecimalField(max_digits=7, decimal_places=2),
+            )
+            for field in LEDGER_FIELDS
+        })
+
+    def with_pending_hours(self):
+        """Annotate ``pending_hours``: PENDING request hours drawing on each balance."""
+        pending = LeaveRequest.objects.annotate(
+            bucket=Coalesce('balance_type_snapshot', 'leave_category__balance_bucket'),
+        ).filter(
+            user=models.OuterRef('user'),
+            status=LeaveRequest.Status.PENDING,
+            start_date__year=models.OuterRef('year'),
+            bucket=models.OuterRef('balance_type'),
+        ).order_by().values('user')
+        return self.annotate(
+            pending_hours=Coalesce(
+                models.Subquery(pending.annotate(total=models.Sum('total_hours')).values('total')[:1]),
+                models.Value(Decimal('0.00')),
+                output_field=models.DecimalField(max_digits=7, decimal_places=2),
+            )
+        )
+
+
 class LeaveBalance(models.Model):
-    """Annual leave balance per user."""
+    """
+    Annual leave balance per user.
+
+    The hour columns are a snapshot of the balance ledger as of ``snapshot_at``
+    (opening values plus every folded LeaveBalanceEntry). Use ``totals`` for
+    the current figures; see leaves.balance_ledger.
+    """
     class BalanceType(models.TextChoices):
         VACATION = 'VACATION', 'Vacation'
         SICK = 'SICK', 'Sick Leave'
@@ -49,9 +104,12 @@ class LeaveBalance(models.Model):
     allocated_hours = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('0.00'))
     used_hours = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('0.00'))
     adjusted_hours = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('0.00'))
+    snapshot_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = LeaveBalanceQuerySet.as_manager()
+
     class Meta:
         db_table = 'leave_balances'
         unique_together = ['user', 'year', 'balance_type']
@@ -60,10 +118,64 @@ class LeaveBalance(models.Model):
     def __str__(self):
         return f"{self.user.email} - {self.year} - {self.get_balance_type_display()}"
 
+    def refresh_from_db(self, *args, **kwargs):
+        # Drop with_totals() annotations; they describe the old snapshot.
+        for field in LEDGER_FIELDS:
+            self.__dict__.pop(f'tail_{field}', None)
+        super().refresh_from_db(*args, **kwargs)
+
+    @property
+    def totals(self):
+        """Current allocated/used/adjusted hours (snapshot plus ledger tail)."""
+        from .balance_ledger import balance_totals
+        return balance_totals(self)
+
     @property
     def remaining_hours(self):
         """Calculate remaining hours (allocated + adjusted - used)"""
-        return self.allocated_hours + self.adjusted_hours - self.used_hours
+        return self.totals.remaining_hours
+
+
+class LeaveBalanceEntry(models.Model):
+    """Append-only balance ledger entry holding signed hour deltas."""
+    class EntryType(models.TextChoices):
+        APPROVAL = 'APPROVAL', 'Approval'
+        CANCELLATION = 'CANCELLATION', 'Cancellation'
+        ADJUSTMENT = 'ADJUSTMENT', 'Adjustment'
+        RECALCULATION = 'RECALCULATION', 'Recalculation'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    balance = models.ForeignKey(LeaveBalance, on_delete=models.CASCADE, related_name='ledger_entries')
+    entry_type = models.CharField(max_length=20, choices=EntryType.choices)
+    allocated_hours = models.DecimalField(max_digits=7, decimal_places=2, default=Decimal('0.00'))
+    used_hours = models.DecimalField(max_digits=7, decimal_places=2, default=Decimal('0.00'))
+    adjusted_hours = models.DecimalField(max_digits=7, decimal_places=2, default=Decimal('0.00'))
+    leave_request = models.ForeignKey(
+        'LeaveRequest',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='balance_entries',
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    note = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'leave_balance_entries'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['balance', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_entry_type_display()} {self.used_hours}h used / {self.allocated_hours}h allocated"
 
 
 class LeaveRequest(models.Model):
@@ -185,6 +297,11 @@ class HolidayTemplate(models.Model):
     source_name = models.CharField(max_length=200)
     source_url = models.URLField(max_length=500, blank=True)
     version = models.PositiveIntegerField(default=1)
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="SHA-256 of the seeded rows; reseeding skips templates whose hash matches.",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -220,6 +337,32 @@ class HolidayTemplateDate(models.Model):
         ordering = ['start_date']
 
 
+class HolidayCalendarQuerySet(models.QuerySet):
+    def with_holiday_counts(self):
+        """
+        Annotate ``holiday_day_count``: days covered by non-archived holidays.
+
+        Each holiday contributes ``end_date - start_date + 1`` days, so list
+        views need not load and expand every multi-day holiday.
+        """
+        holidays = PublicHoliday.objects.filter(
+            calendar=models.OuterRef('pk'),
+        ).exclude(status=PublicHoliday.Status.ARCHIVED).order_by().values('calendar')
+        span = holidays.annotate(
+            total=models.Sum(
+                models.ExpressionWrapper(
+                    models.F('end_date') - models.F('start_date'),
+                    output_field=models.DurationField(),
+                )
+            )
+        ).values('total')[:1]
+        count = holidays.annotate(total=models.Count('pk')).values('total')[:1]
+        return self.annotate(
+            holiday_span=models.Subquery(span, output_field=models.DurationField()),
+            holiday_entries=Coalesce(models.Subquery(count), 0),
+        )
+
+
 class HolidayCalendar(models.Model):
     """Company-owned holiday calendar for an entity or location."""
     class Status(models.TextChoices):
@@ -256,6 +399,8 @@ class HolidayCalendar(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = HolidayCalendarQuerySet.as_manager()
+
     class Meta:
         db_table = 'holiday_calendars'
         unique_together = ['year', 'entity', 'location', 'country_code']
@@ -264,6 +409,12 @@ class HolidayCalendar(models.Model):
     def __str__(self):
         return self.name
 
+    @property
+    def holiday_day_count(self):
+        """Days covered by active holidays; needs ``with_holiday_counts()``."""
+        span = self.holiday_span.days if self.holiday_span else 0
+        return span + self.holiday_entries
+
 
 class PublicHoliday(models.Model):
     """Public holidays scoped by entity/location (supports multi-day holidays)"""
@@ -335,6 +486,69 @@ class PublicHoliday(models.Model):
         return f"{self.holiday_name} - {self.start_date} to {self.end_date}"
 
 
+class HolidayDay(models.Model):
+    """
+    One calendar day of a Published, active holiday, keyed by scope.
+
+    Derived from PublicHoliday and rebuilt by
+    holiday_management.sync_holiday_days, so "which days are holidays for this
+    user" is an equality-plus-range scan on (scope_key, date).
+    """
+    holiday = models.ForeignKey(PublicHoliday, on_delete=models.CASCADE, related_name='days')
+    scope_key = models.CharField(max_length=50)
+    country_code = models.CharField(max_length=2, blank=True)
+    date = models.DateField()
+
+    class Meta:
+        db_table = 'holiday_days'
+        unique_together = ['holiday', 'date']
+        indexes = [
+            models.Index(fields=['scope_key', 'date'], name='holiday_days_scope_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.scope_key} {self.date}"
+
+    @staticmethod
+    def scope_key_for(entity_id, location_id):
+        """Scope of a holiday row: location-specific, entity-wide or global."""
+        if location_id:
+            return f"location:{location_id}"
+        if entity_id:
+            return f"entity:{entity_id}"
+        return "global"
+
+    @classmethod
+    def scope_keys_for_user(cls, user):
+        """Scopes whose holidays apply to ``user`` (global, entity, entity + location)."""
+        keys = [cls.scope_key_for(None, None)]
+        if user.entity_id:
+            keys.append(cls.scope_key_for(user.entity_id, None))
+            if user.location_id:
+                keys.append(cls.scope_key_for(user.entity_id, user.location_id))
+        return keys
+
+
+class HolidayFeedToken(models.Model):
+    """
+    Per-user secret for subscribing calendar apps to the holiday .ics feed.
+
+    Calendar clients cannot send an Authorization header, so the feed URL
+    carries this token instead. Only its SHA-256 is stored; issuing a new
+    token replaces the previous one and deleting the row revokes the URL.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='holiday_feed_token'
+    )
+    token_hash = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'holiday_feed_tokens'
+
+    def __str__(self):
+        return f"{self.user.email} holiday feed"
+
 class BusinessTrip(models.Model):
     """Business trip - separate from leave requests (no approval, no balance impact)"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
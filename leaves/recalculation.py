@@ -0,0 +1,284 @@
+"""
+Set-based leave-hours recalculation engine.
+
+Management commands that need to re-derive LeaveRequest.total_hours after a
+rule change (weekend shifts today; shift or holiday changes later) build a
+LeaveHoursRecalculation over a candidate queryset instead of looping requests
+one query at a time:
+
+    engine = LeaveHoursRecalculation(queryset, workers=4)
+    changes = list(engine.iter_changes())
+    engine.apply(changes)
+
+iter_changes() streams candidates with iterator(), loads the published holidays
+for each batch once (HolidayIndex) and computes hours in memory, optionally in
+a process pool. apply() writes requests with bulk_update and appends one
+RECALCULATION ledger entry per approved request, in chunked transactions.
+"""
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import Any, Optional
+
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from .models import HolidayDay, LeaveBalance, LeaveBalanceEntry, LeaveRequest
+from .services import BalanceCalculationService
+from .utils import calculate_full_day_leave_breakdown, calculate_leave_hours, normalize_country_code
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class HolidayIndex:
+    """Holiday days in a date span, indexed by scope (see models.HolidayDay)."""
+
+    def __init__(self, start_date, end_date):
+        self._by_scope = defaultdict(list)
+        rows = HolidayDay.objects.filter(
+            date__gte=start_date,
+            date__lte=end_date,
+        ).values_list('scope_key', 'country_code', 'date')
+        for scope_key, country_code, day in rows:
+            self._by_scope[scope_key].append((country_code, day))
+
+    def days_for(self, user, start_date, end_date):
+        """Holiday dates in range for ``user``; mirrors utils.holiday_days_for_user scoping."""
+        country_code = normalize_country_code(getattr(getattr(user, 'location', None), 'country', None))
+        return frozenset(
+            day
+            for scope_key in HolidayDay.scope_keys_for_user(user)
+            for holiday_country, day in self._by_scope.get(scope_key, ())
+            if start_date <= day <= end_date and (not country_code or holiday_country == country_code)
+        )
+
+
+@dataclass
+class LeaveHoursChange:
+    request_id: Any
+    user_id: Any
+    user_email: str
+    start_date: date
+    end_date: date
+    status: str
+    shift_type: str
+    balance_type: str
+    old_hours: Decimal
+    new_hours: Decimal
+    leave_breakdown: list = field(default_factory=list)
+    balance: Optional[LeaveBalance] = None
+
+    @property
+    def delta(self):
+        return self.new_hours - self.old_hours
+
+    @property
+    def balance_key(self):
+        return (self.user_id, self.start_date.year, self.balance_type)
+
+    @property
+    def deducts_balance(self):
+        return self.status == LeaveRequest.Status.APPROVED and self.balance_type != 'NONE'
+
+
+def compute_leave_hours(item):
+    """
+    Recompute one request from preloaded data (no queries; safe in worker processes).
+
+    Returns:
+        tuple: (new_hours, leave_breakdown, error message or None)
+    """
+    leave, holiday_days = item
+    try:
+        if leave.shift_type == LeaveRequest.ShiftType.FULL_DAY:
+            hours, breakdown = calculate_full_day_leave_breakdown(
+                leave.user, leave.start_date, leave.end_date, holiday_days=holiday_days,
+            )
+            return hours, breakdown, None
+        hours = calculate_leave_hours(
+            leave.user, leave.start_date, leave.end_date, leave.shift_type,
+            leave.start_time, leave.end_time,
+            start_day_offset=leave.start_day_offset,
+            end_day_offset=leave.end_day_offset,
+            holiday_days=holiday_days,
+        )
+        return hours, [], None
+    except ValueError as exc:
+        return None, None, str(exc)
+
+
+class LeaveHoursRecalculation:
+    """Recalculate total_hours for a candidate LeaveRequest queryset."""
+
+    def __init__(self, queryset, batch_size=DEFAULT_BATCH_SIZE, workers=1,
+                 note='Leave hours recalculation'):
+        self.queryset = queryset
+        self.batch_size = batch_size
+        self.workers = workers
+        self.note = note
+        self.errors = []
+
+    # --- compute --------------------------------------------------------
+
+    def _candidates(self):
+        return self.queryset.select_related(
+            'user',
+            'user__work_shift',
+            'user__department',
+            'user__entity',
+            'user__location',
+            'leave_category',
+        ).order_by('pk').iterator(chunk_size=self.batch_size)
+
+    def _batches(self):
+        batch = []
+        for leave in self._candidates():
+            batch.append(leave)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def iter_changes(self):
+        """Yield a LeaveHoursChange for every candidate whose hours differ."""
+        pool = None
+        if self.workers > 1:
+            # Workers never touch the database; drop inherited connections first.
+            if not connection.in_atomic_block:
+                connections.close_all()
+            pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            for batch in self._batches():
+                yield from self._compute_batch(batch, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def _compute_batch(self, batch, pool):
+        index = HolidayIndex(
+            min(leave.start_date for leave in batch),
+            max(leave.end_date for leave in batch),
+        )
+        items = [
+            (leave, index.days_for(leave.user, leave.start_date, leave.end_date))
+            for leave in batch
+        ]
+        if pool is not None:
+            results = pool.map(compute_leave_hours, items, chunksize=max(1, len(items) // self.workers))
+        else:
+            results = map(compute_leave_hours, items)
+
+        for leave, (new_hours, breakdown, error) in zip(batch, results):
+            if error:
+                self.errors.append((leave, error))
+                continue
+            if new_hours == leave.total_hours:
+                continue
+            yield LeaveHoursChange(
+                request_id=leave.id,
+                user_id=leave.user_id,
+                user_email=leave.user.email,
+                start_date=leave.start_date,
+                end_date=leave.end_date,
+                status=leave.status,
+                shift_type=leave.shift_type,
+                balance_type=(
+                    leave.balance_type_snapshot
+                    or BalanceCalculationService.calculate_balance_type(leave.leave_category)
+                ),
+                old_hours=leave.total_hours,
+                new_hours=new_hours,
+                leave_breakdown=breakdown,
+            )
+
+    # --- balances -------------------------------------------------------
+
+    @staticmethod
+    def balance_deltas(changes):
+        """Aggregate used-hour deltas per (user_id, year, balance_type)."""
+        deltas = defaultdict(Decimal)
+        for change in changes:
+            if change.deducts_balance:
+                deltas[change.balance_key] += change.delta
+        return dict(deltas)
+
+    @staticmethod
+    def attach_balances(changes):
+        """Set change.balance (with ledger totals) for deducting changes; one query."""
+        keys = {change.balance_key for change in changes if change.deducts_balance}
+        if not keys:
+            return
+        balances = {
+            (balance.user_id, balance.year, balance.balance_type): balance
+            for balance in LeaveBalance.objects.with_totals().filter(
+                user_id__in={key[0] for key in keys},
+                year__in={key[1] for key in keys},
+                balance_type__in={key[2] for key in keys},
+            )
+        }
+        for change in changes:
+            if change.deducts_balance:
+                change.balance = balances.get(change.balance_key)
+
+    # --- apply ----------------------------------------------------------
+
+    def apply(self, changes, chunk_size=None):
+        """
+        Write ``changes`` in chunked transactions.
+
+        Requests modified since they were computed, and approved requests
+        without a balance row, are skipped.
+
+        Returns:
+            tuple: (applied changes, skipped changes)
+        """
+        chunk_size = chunk_size or self.batch_size
+        applied, skipped = [], []
+        for start in range(0, len(changes), chunk_size):
+            chunk = changes[start:start + chunk_size]
+            with transaction.atomic():
+                current = {
+                    row['id']: row
+                    for row in LeaveRequest.objects.select_for_update().filter(
+                        id__in=[change.request_id for change in chunk]
+                    ).values('id', 'status', 'total_hours')
+                }
+                self.attach_balances(chunk)
+                ready = []
+                for change in chunk:
+                    row = current.get(change.request_id)
+                    stale = (
+                        row is None
+                        or row['status'] != change.status
+                        or row['total_hours'] != change.old_hours
+                    )
+                    if stale or (change.deducts_balance and change.balance is None):
+                        skipped.append(change)
+                    else:
+                        ready.append(change)
+                self._write(ready)
+            applied.extend(ready)
+        return applied, skipped
+
+    def _write(self, changes):
+        now = timezone.now()
+        requests = []
+        for change in changes:
+            leave = LeaveRequest(id=change.request_id, total_hours=change.new_hours, updated_at=now)
+            leave.leave_breakdown = change.leave_breakdown
+            requests.append(leave)
+        LeaveRequest.objects.bulk_update(requests, ['total_hours', 'leave_breakdown', 'updated_at'])
+        LeaveBalanceEntry.objects.bulk_create([
+            LeaveBalanceEntry(
+                balance=change.balance,
+                entry_type=LeaveBalanceEntry.EntryType.RECALCULATION,
+                used_hours=change.delta,
+                leave_request_id=change.request_id,
+                note=self.note,
+            )
+            for change in changes
+            if change.deducts_balance
+        ])
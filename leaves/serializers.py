@@ -3,7 +3,7 @@ Leave Management Serializers
 """
 from rest_framework import serializers
 from decimal import Decimal
-from .models import LeaveCategory, LeaveBalance, LeaveRequest, PublicHoliday, BusinessTrip
+from .models import LEDGER_FIELDS, LeaveCategory, LeaveBalance, LeaveRequest, PublicHoliday, BusinessTrip
 from .services import LeaveApprovalService
 
 
@@ -20,26 +20,24 @@ class LeaveCategorySerializer(serializers.ModelSerializer):
 
 
 class LeaveBalanceSerializer(serializers.ModelSerializer):
-    """Serializer for LeaveBalance"""
-    remaining_hours = serializers.SerializerMethodField()
-    remaining_days = serializers.SerializerMethodField()
+    """Serializer for LeaveBalance (current ledger totals, not the raw snapshot)"""
 
     class Meta:
         model = LeaveBalance
         fields = [
             'id', 'user', 'year', 'allocated_hours', 'used_hours',
-            'adjusted_hours', 'remaining_hours', 'remaining_days',
-            'created_at', 'updated_at'
+            'adjusted_hours', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
-    def get_remaining_hours(self, obj):
-        """Calculate remaining hours"""
-        return float(obj.remaining_hours)
-
-    def get_remaining_days(self, obj):
-        """Calculate remaining days (8 hours per day)"""
-        return float(obj.remaining_hours) / 8
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        totals = instance.totals
+        for field in LEDGER_FIELDS:
+            data[field] = str(getattr(totals, field))
+        data['remaining_hours'] = float(totals.remaining_hours)
+        data['remaining_days'] = float(totals.remaining_hours) / 8
+        return data
 
 
 class LeaveRequestSerializer(serializers.ModelSerializer):
@@ -10,7 +10,8 @@ from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
 
-from .models import LeaveBalance, LeaveRequest
+from .balance_ledger import record_entry
+from .models import LeaveBalance, LeaveBalanceEntry, LeaveRequest
 
 
 # --- VACATION dynamic allocation constants ---
@@ -389,13 +390,21 @@ class LeaveApprovalService:
                     f"No {balance_type} balance found for year {leave_request.start_date.year}. "
                     "Cannot approve without an existing balance record."
                 )
-            if leave_request.total_hours > balance.remaining_hours:
+            # The row lock only serialises overdraw checks; totals come from
+            # a fresh ledger aggregate taken after the lock is held.
+            remaining_hours = balance.remaining_hours
+            if leave_request.total_hours > remaining_hours:
                 raise ValueError(
                     f"Insufficient balance. Requested: {leave_request.total_hours}h, "
-                    f"Available: {balance.remaining_hours}h"
+                    f"Available: {remaining_hours}h"
                 )
-            balance.used_hours += leave_request.total_hours
-            balance.save()
+            record_entry(
+                balance,
+                LeaveBalanceEntry.EntryType.APPROVAL,
+                used_hours=leave_request.total_hours,
+                leave_request=leave_request,
+                created_by=approver,
+            )
 
         LeaveApprovalService._create_approval_audit(
             leave_request, approver, decision_step, 'APPROVED', comment, now
@@ -481,13 +490,22 @@ class LeaveApprovalService:
 
             balance_type = LeaveApprovalService._get_balance_type(leave_request)
             if balance_type != 'NONE':
+                # Lock like the approval path so concurrent cancellations
+                # compute restored_hours from the same committed totals.
                 balance = LeaveBalance.objects.select_for_update().get(
                     user=leave_request.user,
                     year=leave_request.start_date.year,
                     balance_type=balance_type
                 )
-                balance.used_hours = max(Decimal('0.00'), balance.used_hours - leave_request.total_hours)
-                balance.save()
+                restored_hours = min(leave_request.total_hours, max(Decimal('0.00'), balance.totals.used_hours))
+                record_entry(
+                    balance,
+                    LeaveBalanceEntry.EntryType.CANCELLATION,
+                    used_hours=-restored_hours,
+                    leave_request=leave_request,
+                    created_by=approver,
+                    note=reason,
+                )
 
         # Store old status for audit
         old_status = leave_request.status
@@ -552,16 +570,17 @@ class LeaveApprovalService:
         # Add employee balance for the relevant balance type
         balance_type = LeaveApprovalService._get_balance_type(leave_request)
         if balance_type != 'NONE':
-            balance = LeaveBalance.objects.filter(
+            balance = LeaveBalance.objects.with_totals().filter(
                 user=leave_request.user,
                 year=leave_request.start_date.year,
                 balance_type=balance_type
             ).first()
 
             if balance:
+                remaining_hours = balance.remaining_hours
                 data['employee_balance'] = {
-                    'remaining_hours': float(balance.remaining_hours),
-                    'remaining_days': float(balance.remaining_hours) / 8,
+                    'remaining_hours': float(remaining_hours),
+                    'remaining_days': float(remaining_hours) / 8,
                 }
 
         # Find team conflicts (approved overlapping leaves)
@@ -0,0 +1,34 @@
+"""
+Leave signals: keep the derived HolidayDay table in step with holidays.
+
+Bulk writes in leaves.holiday_management call sync_holiday_days themselves;
+these receivers cover single-row saves (views, admin, seed data). Deletes
+cascade to HolidayDay without a sync, so they drop the cached feeds here.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .holiday_feed import invalidate_holiday_feeds
+from .holiday_management import sync_holiday_days
+from .models import HolidayCalendar, PublicHoliday
+
+
+@receiver(post_save, sender=PublicHoliday)
+def sync_days_on_holiday_save(sender, instance, created, **kwargs):
+    if created and (instance.status != PublicHoliday.Status.PUBLISHED or not instance.is_active):
+        return
+    sync_holiday_days(PublicHoliday.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=HolidayCalendar)
+def sync_days_on_calendar_country_change(sender, instance, created, update_fields=None, **kwargs):
+    """HolidayDay rows carry the calendar's country code."""
+    if created or (update_fields is not None and 'country_code' not in update_fields):
+        return
+    sync_holiday_days(instance.holidays.all())
+
+
+@receiver(post_delete, sender=PublicHoliday)
+@receiver(post_delete, sender=HolidayCalendar)
+def invalidate_feeds_on_holiday_delete(sender, instance, **kwargs):
+    invalidate_holiday_feeds()
@@ -145,8 +145,8 @@ def test_vacation_and_sick_buckets_deduct_their_own_balances():
 
     vacation_balance.refresh_from_db()
     sick_balance.refresh_from_db()
-    assert vacation_balance.used_hours == Decimal('8.00')
-    assert sick_balance.used_hours == Decimal('8.00')
+    assert vacation_balance.totals.used_hours == Decimal('8.00')
+    assert sick_balance.totals.used_hours == Decimal('8.00')
 
 
 @pytest.mark.django_db
@@ -180,7 +180,7 @@ def test_pending_request_uses_balance_bucket_snapshot_when_category_changes():
     LeaveApprovalService.approve_leave_request(leave_request, manager)
 
     vacation_balance.refresh_from_db()
-    assert vacation_balance.used_hours == Decimal('8.00')
+    assert vacation_balance.totals.used_hours == Decimal('8.00')
 
 
 @pytest.mark.django_db
@@ -219,7 +219,7 @@ def test_approved_request_restores_snapshot_bucket_after_category_deleted():
     )
 
     vacation_balance.refresh_from_db()
-    assert vacation_balance.used_hours == Decimal('0.00')
+    assert vacation_balance.totals.used_hours == Decimal('0.00')
 
 
 @pytest.mark.django_db
@@ -0,0 +1,170 @@
+"""Tests for the append-only leave balance ledger and its snapshots."""
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from leaves.balance_ledger import (
+    balance_totals,
+    find_ledger_discrepancies,
+    fold_balance_snapshots,
+    record_entry,
+)
+from leaves.models import LeaveBalance, LeaveBalanceEntry, LeaveCategory, LeaveRequest
+from leaves.services import LeaveApprovalService
+
+User = get_user_model()
+
+
+@pytest.fixture
+def employee():
+    manager = User.objects.create_user(
+        email='ledger-manager@example.com', password='TestPass123!', role=User.Role.MANAGER
+    )
+    user = User.objects.create_user(
+        email='ledger-employee@example.com', password='TestPass123!', approver_1=manager
+    )
+    return user
+
+
+@pytest.fixture
+def balance(employee):
+    return LeaveBalance.objects.create(
+        user=employee,
+        year=2027,
+        balance_type=LeaveBalance.BalanceType.VACATION,
+        allocated_hours=Decimal('80.00'),
+    )
+
+
+def make_request(employee, hours='8.00', status='PENDING'):
+    category, _ = LeaveCategory.objects.get_or_create(
+        code='LEDGER_VAC',
+        defaults={'category_name': 'Ledger Vacation', 'balance_bucket': 'VACATION'},
+    )
+    return LeaveRequest.objects.create(
+        user=employee,
+        leave_category=category,
+        start_date=date(2027, 5, 3),
+        end_date=date(2027, 5, 3),
+        shift_type='FULL_DAY',
+        total_hours=Decimal(hours),
+        status=status,
+        first_approver=employee.approver_1,
+    )
+
+
+@pytest.mark.django_db
+def test_approval_and_rejection_append_entries_without_rewriting_row(employee, balance):
+    leave_request = make_request(employee)
+
+    LeaveApprovalService.approve_leave_request(leave_request, employee.approver_1)
+    balance.refresh_from_db()
+    assert balance.used_hours == Decimal('0.00')
+    assert balance.totals.used_hours == Decimal('8.00')
+    assert balance.remaining_hours == Decimal('72.00')
+
+    leave_request.refresh_from_db()
+    LeaveApprovalService.reject_leave_request(
+        leave_request, employee.approver_1, 'Coverage changed after approval'
+    )
+    balance.refresh_from_db()
+    assert balance.totals.used_hours == Decimal('0.00')
+    assert list(
+        balance.ledger_entries.values_list('entry_type', 'used_hours')
+    ) == [('APPROVAL', Decimal('8.00')), ('CANCELLATION', Decimal('-8.00'))]
+    assert not find_ledger_discrepancies().exists()
+
+
+@pytest.mark.django_db
+def test_fold_moves_tail_into_snapshot_and_keeps_totals(balance, django_assert_num_queries):
+    old = timezone.now() - timedelta(hours=1)
+    for hours in ('8.00', '4.00'):
+        entry = record_entry(balance, LeaveBalanceEntry.EntryType.APPROVAL, used_hours=Decimal(hours))
+        LeaveBalanceEntry.objects.filter(pk=entry.pk).update(created_at=old)
+    recent = record_entry(balance, LeaveBalanceEntry.EntryType.ADJUSTMENT, allocated_hours=Decimal('8.00'))
+
+    assert fold_balance_snapshots() == 1
+
+    balance.refresh_from_db()
+    assert balance.used_hours == Decimal('12.00')
+    assert balance.allocated_hours == Decimal('80.00')
+    assert balance.snapshot_at < recent.created_at
+    assert balance.totals == (Decimal('88.00'), Decimal('12.00'), Decimal('0.00'))
+    assert fold_balance_snapshots() == 0
+
+    with django_assert_num_queries(1):
+        annotated = LeaveBalance.objects.with_totals().get(pk=balance.pk)
+        assert annotated.remaining_hours == Decimal('76.00')
+
+
+@pytest.mark.django_db
+def test_as_of_totals_read_before_and_after_the_snapshot(balance):
+    now = timezone.now()
+    for days_ago, hours in ((30, '8.00'), (20, '16.00'), (1, '4.00')):
+        entry = record_entry(balance, LeaveBalanceEntry.EntryType.APPROVAL, used_hours=Decimal(hours))
+        LeaveBalanceEntry.objects.filter(pk=entry.pk).update(created_at=now - timedelta(days=days_ago))
+    fold_balance_snapshots(cutoff=now - timedelta(days=10))
+    balance.refresh_from_db()
+
+    assert balance_totals(balance, as_of=now - timedelta(days=25)).used_hours == Decimal('8.00')
+    assert balance_totals(balance, as_of=now - timedelta(days=5)).used_hours == Decimal('24.00')
+    assert balance_totals(balance).used_hours == Decimal('28.00')
+
+
+@pytest.mark.django_db
+def test_reconcile_reports_requests_missing_from_ledger(employee, balance):
+    make_request(employee, status='APPROVED')
+
+    assert find_ledger_discrepancies().count() == 1
+    with pytest.raises(CommandError):
+        call_command('reconcile_leave_balances', stdout=StringIO())
+
+
+@pytest.mark.django_db
+def test_balance_adjustment_records_ledger_entry(employee, balance):
+    hr = User.objects.create_user(email='ledger-hr@example.com', password='TestPass123!', role=User.Role.ADMIN)
+    client = APIClient()
+    client.force_authenticate(user=hr)
+
+    response = client.put(
+        f'/api/v1/auth/{employee.id}/balance/adjust/',
+        {'allocated_hours': 96, 'balance_type': 'VACATION', 'year': 2027, 'reason': 'Carry-over'},
+        format='json',
+    )
+
+    assert response.status_code == 200
+    assert response.data['allocated_hours'] == 96.0
+    entry = balance.ledger_entries.get()
+    assert entry.entry_type == LeaveBalanceEntry.EntryType.ADJUSTMENT
+    assert entry.allocated_hours == Decimal('16.00')
+    assert entry.created_by == hr
+
+
+@pytest.mark.django_db
+def test_request_detail_reads_balance_totals_in_one_query(employee, balance):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    record_entry(balance, LeaveBalanceEntry.EntryType.ADJUSTMENT, adjusted_hours=Decimal('4.00'))
+    leave_request = make_request(employee)
+
+    with CaptureQueriesContext(connection) as queries:
+        data = LeaveApprovalService.get_request_detail_with_conflicts(leave_request)
+
+    assert data['employee_balance']['remaining_hours'] == 84.0
+    assert sum('leave_balance_entries' in query['sql'] for query in queries.captured_queries) == 1
+
+
+def test_admin_cannot_edit_snapshot_hours():
+    from django.contrib import admin
+
+    balance_admin = admin.site._registry[LeaveBalance]
+
+    assert {'allocated_hours', 'used_hours', 'adjusted_hours'} <= set(balance_admin.get_readonly_fields(None))
@@ -0,0 +1,116 @@
+"""Tests for the streamed entity balance report."""
+import csv
+import io
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from leaves.balance_ledger import record_entry
+from leaves.models import LeaveBalance, LeaveBalanceEntry, LeaveCategory, LeaveRequest
+from organizations.models import Department, Entity, Location
+
+User = get_user_model()
+
+REPORT_URL = '/api/v1/leaves/reports/balances/'
+
+
+def make_org(code):
+    entity = Entity.objects.create(entity_name=f'{code} Entity', code=code)
+    location = Location.objects.create(
+        entity=entity, location_name=f'{code} Office', city='City', country='USA', timezone='UTC'
+    )
+    department = Department.objects.create(
+        entity=entity, location=location, department_name=f'{code} Ops', code=f'{code}OPS'
+    )
+    return entity, location, department
+
+
+def make_employee(email, org):
+    entity, location, department = org
+    user = User.objects.create_user(
+        email=email, password='TestPass123!', entity=entity, location=location, department=department
+    )
+    LeaveBalance.objects.filter(user=user).delete()
+    return user
+
+
+def streamed(response):
+    return b''.join(response.streaming_content).decode('utf-8')
+
+
+@pytest.fixture
+def report_data():
+    org = make_org('RPT')
+    other_org = make_org('OTH')
+    employee = make_employee('alice@example.com', org)
+    outsider = make_employee('bob@example.com', other_org)
+    hr = User.objects.create_user(
+        email='report-hr@example.com', password='TestPass123!', role=User.Role.HR, entity=org[0]
+    )
+
+    vacation = LeaveBalance.objects.create(
+        user=employee, year=2026, balance_type='VACATION', allocated_hours=Decimal('80.00')
+    )
+    LeaveBalance.objects.create(user=employee, year=2026, balance_type='SICK', allocated_hours=Decimal('40.00'))
+    LeaveBalance.objects.create(user=outsider, year=2026, balance_type='VACATION', allocated_hours=Decimal('80.00'))
+    record_entry(vacation, LeaveBalanceEntry.EntryType.APPROVAL, used_hours=Decimal('16.00'))
+
+    category = LeaveCategory.objects.create(category_name='Report Vacation', code='RPTVAC', balance_bucket='VACATION')
+    LeaveRequest.objects.create(
+        user=employee,
+        leave_category=category,
+        start_date=date(2026, 7, 6),
+        end_date=date(2026, 7, 6),
+        shift_type='FULL_DAY',
+        total_hours=Decimal('8.00'),
+        status='PENDING',
+    )
+    return {'hr': hr, 'employee': employee, 'org': org}
+
+
+@pytest.mark.django_db
+def test_hr_streams_entity_balances_as_jsonl(report_data):
+    client = APIClient()
+    client.force_authenticate(user=report_data['hr'])
+
+    response = client.get(REPORT_URL, {'year': 2026, 'output': 'jsonl'})
+
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in streamed(response).splitlines()]
+    assert [(row['email'], row['balance_type']) for row in rows] == [
+        ('alice@example.com', 'SICK'),
+        ('alice@example.com', 'VACATION'),
+    ]
+    vacation = rows[1]
+    assert vacation['used_hours'] == 16.0
+    assert vacation['remaining_hours'] == 64.0
+    assert vacation['pending_hours'] == 8.0
+    assert vacation['projected_remaining_hours'] == 56.0
+
+
+@pytest.mark.django_db
+def test_csv_output_and_department_filter(report_data):
+    admin = User.objects.create_user(email='report-admin@example.com', password='TestPass123!', role=User.Role.ADMIN)
+    client = APIClient()
+    client.force_authenticate(user=admin)
+
+    everyone = client.get(REPORT_URL, {'year': 2026})
+    department = client.get(REPORT_URL, {'year': 2026, 'department_id': str(report_data['org'][2].id)})
+
+    assert everyone['Content-Type'] == 'text/csv'
+    assert len(list(csv.DictReader(io.StringIO(streamed(everyone))))) == 3
+    rows = list(csv.DictReader(io.StringIO(streamed(department))))
+    assert {row['email'] for row in rows} == {'alice@example.com'}
+    assert client.get(REPORT_URL, {'department_id': 'nope'}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_employee_cannot_access_balance_report(report_data):
+    client = APIClient()
+    client.force_authenticate(user=report_data['employee'])
+
+    assert client.get(REPORT_URL).status_code == 403
@@ -3,6 +3,8 @@ from decimal import Decimal
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
 from core.models import AuditLog
@@ -15,7 +17,9 @@ from leaves.models import (
     PublicHoliday,
 )
 from leaves.holiday_management import (
+    bulk_generate_draft_calendars,
     generate_draft_calendars,
+    generation_preview,
     normalize_country_code,
     publish_impact,
     publish_calendar,
@@ -73,6 +77,43 @@ def test_seed_templates_contains_complete_supported_calendars():
     ).exists()
 
 
+@pytest.mark.django_db
+def test_calendar_list_counts_holiday_days_with_constant_queries():
+    admin = User.objects.create_user(
+        email="list-admin@example.com", password="Password123!", role=User.Role.ADMIN
+    )
+    client = APIClient()
+    client.force_authenticate(user=admin)
+
+    def make_calendars(prefix, count):
+        for index in range(count):
+            entity = Entity.objects.create(entity_name=f"{prefix} {index}", code=f"{prefix}{index}")
+            calendar = HolidayCalendar.objects.create(
+                name=f"{prefix} {index}", country_code="VN", year=2026, entity=entity,
+                location=make_location(entity, f"{prefix} office {index}", "Vietnam"),
+            )
+            for start, end, holiday_status in [
+                (date(2026, 2, 16), date(2026, 2, 20), PublicHoliday.Status.DRAFT),
+                (date(2026, 4, 30), date(2026, 4, 30), PublicHoliday.Status.DRAFT),
+                (date(2026, 9, 1), date(2026, 9, 2), PublicHoliday.Status.ARCHIVED),
+            ]:
+                PublicHoliday.objects.create(
+                    calendar=calendar, entity=entity, holiday_name=str(start),
+                    start_date=start, end_date=end, year=2026, status=holiday_status,
+                )
+
+    make_calendars("ONE", 1)
+    with CaptureQueriesContext(connection) as few:
+        client.get("/api/v1/leaves/holiday-calendars/")
+    make_calendars("MANY", 4)
+    with CaptureQueriesContext(connection) as many:
+        response = client.get("/api/v1/leaves/holiday-calendars/")
+
+    assert response.status_code == 200
+    assert len(many) == len(few)
+    assert [row["holiday_count"] for row in response.data["results"]] == [6] * 5
+
+
 @pytest.mark.django_db
 def test_calendar_data_expands_multi_day_holidays_for_display():
     entity = Entity.objects.create(entity_name="VN Display Co", code="VNDISP")
@@ -141,6 +182,56 @@ def test_admin_can_delete_draft_calendar_but_not_published_calendar():
     assert HolidayCalendar.objects.filter(id=published.id).exists()
 
 
+@pytest.mark.django_db
+def test_seed_skips_unchanged_templates_and_rewrites_changed_ones():
+    seed_holiday_templates()
+    with CaptureQueriesContext(connection) as queries:
+        assert seed_holiday_templates() == []
+    assert len([query for query in queries.captured_queries if "SAVEPOINT" not in query["sql"]]) == 1
+
+    template = HolidayTemplate.objects.get(country_code="VN", year=2030)
+    template.dates.first().delete()
+    HolidayTemplate.objects.filter(pk=template.pk).update(content_hash="stale")
+
+    assert seed_holiday_templates() == [template]
+    assert template.dates.count() == 6
+
+
+@pytest.mark.django_db
+def test_post_migrate_seeding_uses_the_migrated_state():
+    from django.db.migrations.loader import MigrationLoader
+
+    from leaves.apps import seed_reference_holidays
+
+    HolidayTemplate.objects.all().delete()
+    loader = MigrationLoader(connection)
+    before_hash = loader.project_state(("leaves", "0019_leave_balance_ledger")).apps
+    seed_reference_holidays(sender=None, apps=before_hash)
+    assert not HolidayTemplate.objects.exists()
+
+    seed_reference_holidays(sender=None, apps=loader.project_state().apps)
+    assert HolidayTemplate.objects.get(country_code="VN", year=2026).dates.count() == 7
+    assert seed_holiday_templates() == []
+
+
+@pytest.mark.django_db
+def test_generation_only_reads_templates():
+    seed_holiday_templates()
+    entity = Entity.objects.create(entity_name="Read Only Co", code="READONLY")
+    make_location(entity, "Hanoi", "Vietnam")
+    entities = Entity.objects.filter(id=entity.id)
+
+    with CaptureQueriesContext(connection) as queries:
+        generation_preview(2026, entities)
+        generate_draft_calendars(year=2026, entities=entities)
+
+    template_writes = [
+        query["sql"] for query in queries.captured_queries
+        if "holiday_template" in query["sql"] and not query["sql"].startswith("SELECT")
+    ]
+    assert template_writes == []
+
+
 @pytest.mark.django_db
 def test_country_mapping_and_generation_uses_entity_or_location_scope():
     seed_holiday_templates()
@@ -167,6 +258,58 @@ def test_country_mapping_and_generation_uses_entity_or_location_scope():
     assert all(calendar.status == HolidayCalendar.Status.DRAFT for calendar in calendars)
 
 
+@pytest.mark.django_db
+def test_bulk_generation_queries_do_not_grow_with_scopes():
+    seed_holiday_templates()
+
+    def make_entities(prefix, count):
+        ids = []
+        for index in range(count):
+            entity = Entity.objects.create(entity_name=f"{prefix} {index}", code=f"{prefix}{index}")
+            make_location(entity, f"{prefix} US {index}", "USA")
+            make_location(entity, f"{prefix} VN {index}", "Vietnam")
+            ids.append(entity.id)
+        return Entity.objects.filter(id__in=ids)
+
+    small, large = make_entities("SM", 1), make_entities("LG", 5)
+    with CaptureQueriesContext(connection) as small_queries:
+        bulk_generate_draft_calendars(2026, small)
+    with CaptureQueriesContext(connection) as large_queries:
+        created, skipped = bulk_generate_draft_calendars(2026, large)
+
+    assert len(large_queries) == len(small_queries)
+    assert len(created) == 10
+    assert skipped == []
+    assert PublicHoliday.objects.filter(calendar__in=created).count() == 5 * (11 + 7)
+
+    created, skipped = bulk_generate_draft_calendars(2026, large)
+    assert created == []
+    assert len(skipped) == 10
+
+
+@pytest.mark.django_db
+def test_bulk_generation_skips_calendars_created_concurrently(monkeypatch):
+    seed_holiday_templates()
+    entity = Entity.objects.create(entity_name="Race Co", code="RACE")
+    hanoi = make_location(entity, "Hanoi", "Vietnam")
+    make_location(entity, "Austin", "USA")
+    bulk_create = HolidayCalendar.objects.bulk_create
+
+    def create_rival_first(objs, **kwargs):
+        HolidayCalendar.objects.create(
+            year=2026, entity=entity, location=hanoi, country_code="VN", name="Rival",
+        )
+        return bulk_create(objs, **kwargs)
+
+    monkeypatch.setattr(HolidayCalendar.objects, "bulk_create", create_rival_first)
+    created, skipped = bulk_generate_draft_calendars(2026, Entity.objects.filter(id=entity.id))
+
+    assert [calendar.country_code for calendar in created] == ["US"]
+    assert [calendar.name for calendar in skipped] == ["Rival"]
+    assert not PublicHoliday.objects.filter(calendar__name="Rival").exists()
+    assert PublicHoliday.objects.filter(calendar=created[0]).count() == 11
+
+
 @pytest.mark.django_db
 def test_country_override_maps_unknown_location_before_generation():
     seed_holiday_templates()
@@ -500,6 +643,40 @@ def test_new_country_location_splits_only_future_entity_holidays():
     ).exists()
 
 
+@pytest.mark.django_db
+def test_split_query_count_does_not_grow_with_holidays_or_locations():
+    def make_split_entity(code, years, holidays, us_offices):
+        entity = Entity.objects.create(entity_name=f"{code} Co", code=code)
+        for index in range(us_offices):
+            make_location(entity, f"{code} US {index}", "USA")
+        for year in years:
+            calendar = HolidayCalendar.objects.create(
+                name=f"{code} US {year}", country_code="US", year=year, entity=entity,
+            )
+            for day in range(1, holidays + 1):
+                PublicHoliday.objects.create(
+                    calendar=calendar, entity=entity, holiday_name=f"Day {day}",
+                    start_date=date(year, 8, day), end_date=date(year, 8, day), year=year,
+                    status=PublicHoliday.Status.DRAFT,
+                )
+        make_location(entity, f"{code} VN", "Vietnam")
+        return entity
+
+    small = make_split_entity("SPS", [2027], 1, 1)
+    large = make_split_entity("SPL", [2027, 2028], 5, 3)
+    with CaptureQueriesContext(connection) as small_queries:
+        split_future_entity_calendars(small, today=date(2027, 2, 1))
+    with CaptureQueriesContext(connection) as large_queries:
+        targets = split_future_entity_calendars(large, today=date(2027, 2, 1))
+
+    assert len(large_queries) == len(small_queries)
+    assert len(targets) == 6
+    assert PublicHoliday.objects.filter(calendar__in=targets).count() == 2 * 5 * 3
+    assert not PublicHoliday.objects.filter(
+        calendar__entity=large, calendar__location__isnull=True,
+    ).exclude(status=PublicHoliday.Status.ARCHIVED).exists()
+
+
 @pytest.mark.django_db
 def test_holiday_validation_rejects_invalid_year_and_overlap():
     entity = Entity.objects.create(entity_name="Validation Co", code="VALID")
@@ -692,3 +869,62 @@ def test_publish_never_recalculates_leave_on_holidays():
 
     assert preview["affected_requests"] == 0
     assert leave.total_hours == Decimal("8.00")
+
+
+@pytest.mark.django_db
+def test_publish_reports_every_conflict_with_constant_queries():
+    entity = Entity.objects.create(entity_name="Sweep Co", code="SWEEP")
+    admin = User.objects.create_user(
+        email="sweep-admin@example.com", password="Password123!", role=User.Role.ADMIN
+    )
+    published = HolidayCalendar.objects.create(
+        name="Published Sweep", country_code="US", year=2026, entity=entity,
+        status=HolidayCalendar.Status.PUBLISHED,
+    )
+    for day in (3, 10):
+        PublicHoliday.objects.create(
+            calendar=published, entity=entity, holiday_name=f"Published {day}",
+            start_date=date(2026, 8, day), end_date=date(2026, 8, day), year=2026,
+            status=PublicHoliday.Status.PUBLISHED,
+        )
+
+    def make_draft(name, days):
+        draft = HolidayCalendar.objects.create(
+            name=name, country_code="US", year=2026, entity=entity,
+            status=HolidayCalendar.Status.DRAFT,
+        )
+        for day in days:
+            PublicHoliday.objects.create(
+                calendar=draft, entity=entity, holiday_name=f"Draft {day}",
+                start_date=date(2026, 9, day), end_date=date(2026, 9, day + 1), year=2026,
+                status=PublicHoliday.Status.DRAFT,
+            )
+        return draft
+
+    small, large = make_draft("Small", [25]), make_draft("Large", [1, 5, 9, 13, 17, 21])
+    with CaptureQueriesContext(connection) as small_queries:
+        publish_calendar(small, admin)
+    with CaptureQueriesContext(connection) as large_queries:
+        publish_calendar(large, admin)
+    assert len(large_queries) == len(small_queries)
+
+    clashing = make_draft("Clashing", [])
+    for name, start, end in [("Long weekend", 2, 4), ("Mid month", 9, 11), ("Inside", 3, 3)]:
+        PublicHoliday.objects.create(
+            calendar=clashing, entity=entity, holiday_name=name,
+            start_date=date(2026, 8, start), end_date=date(2026, 8, end), year=2026,
+            status=PublicHoliday.Status.DRAFT,
+        )
+    with pytest.raises(ValueError) as excinfo:
+        publish_calendar(clashing, admin)
+    message = str(excinfo.value)
+    assert "Long weekend overlaps Inside in this calendar" in message
+    assert "Mid month" not in message
+
+    PublicHoliday.objects.filter(calendar=clashing, holiday_name="Inside").delete()
+    with pytest.raises(ValueError) as excinfo:
+        publish_calendar(clashing, admin)
+    assert str(excinfo.value) == (
+        "Long weekend overlaps Published holiday Published 3 for Sweep Co; "
+        "Mid month overlaps Published holiday Published 10 for Sweep Co"
+    )
@@ -3,10 +3,13 @@ from datetime import date
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
-from leaves.models import HolidayCalendar, PublicHoliday
-from leaves.utils import get_holidays_for_user
+from leaves.holiday_management import publish_calendar, unpublish_calendar, unpublish_impact
+from leaves.models import HolidayCalendar, HolidayDay, PublicHoliday
+from leaves.utils import get_holidays_for_user, holiday_dates_for_user
 from organizations.models import Department, Entity, Location, WorkShift
 
 
@@ -271,3 +274,143 @@ def test_team_calendar_returns_current_user_work_schedule_for_rotating_shift():
     assert days["2027-07-14"]["shift_name"] == "Off"
     assert days["2027-07-14"]["is_working"] is False
     assert days["2027-07-14"]["start_time"] is None
+
+
+@pytest.mark.django_db
+def test_holiday_days_follow_publish_and_unpublish(holiday_scope):
+    user = holiday_scope
+    admin = User.objects.create_user(
+        email="holiday-days-admin@example.com", password="TestPass123!", role=User.Role.ADMIN
+    )
+    draft = HolidayCalendar.objects.get(name="Draft VN 2027")
+
+    assert holiday_dates_for_user(user, date(2026, 1, 1), date(2027, 12, 31)) == {
+        date(2026, 4, 30), date(2026, 5, 1),
+    }
+
+    publish_calendar(draft, admin)
+    with CaptureQueriesContext(connection) as queries:
+        days = holiday_dates_for_user(user, date(2026, 1, 1), date(2027, 12, 31))
+    assert len(queries) == 1
+    assert date(2027, 1, 1) in days
+
+    draft.refresh_from_db()
+    unpublish_calendar(draft, admin, unpublish_impact(draft)["preview_token"])
+    assert not HolidayDay.objects.filter(holiday__calendar=draft).exists()
+    assert HolidayDay.objects.filter(scope_key=f"entity:{user.entity_id}", country_code="VN").count() == 2
+
+
+@pytest.mark.django_db
+def test_holiday_feed_revalidates_with_etag_and_refreshes_on_publish(holiday_scope):
+    client = APIClient()
+    client.force_authenticate(holiday_scope)
+
+    first = client.get("/api/v1/leaves/holidays/?year=2026")
+    assert first.status_code == 200
+    assert "max-age" in first["Cache-Control"] and "private" in first["Cache-Control"]
+    with CaptureQueriesContext(connection) as queries:
+        cached = client.get("/api/v1/leaves/holidays/?year=2026", HTTP_IF_NONE_MATCH=first["ETag"])
+    assert cached.status_code == 304
+    assert not any("public_holidays" in query["sql"] for query in queries.captured_queries)
+
+    admin = User.objects.create_user(
+        email="feed-admin@example.com", password="TestPass123!", role=User.Role.ADMIN
+    )
+    draft = HolidayCalendar.objects.create(
+        name="Draft VN 2026 extra", country_code="VN", year=2026, entity=holiday_scope.entity,
+        location=holiday_scope.location,
+    )
+    PublicHoliday.objects.create(
+        calendar=draft, entity=holiday_scope.entity, location=holiday_scope.location,
+        holiday_name="Office Day", start_date=date(2026, 9, 2), end_date=date(2026, 9, 2),
+        year=2026, status=PublicHoliday.Status.DRAFT,
+    )
+    publish_calendar(draft, admin)
+
+    refreshed = client.get("/api/v1/leaves/holidays/?year=2026", HTTP_IF_NONE_MATCH=first["ETag"])
+    assert refreshed.status_code == 200
+    assert refreshed["ETag"] != first["ETag"]
+    assert [holiday["name"] for holiday in refreshed.data] == ["Published Holiday", "Office Day"]
+
+
+@pytest.mark.django_db
+def test_holiday_feed_refreshes_when_holidays_are_deleted(holiday_scope):
+    client = APIClient()
+    client.force_authenticate(holiday_scope)
+    first = client.get("/api/v1/leaves/holidays/?year=2026")
+
+    PublicHoliday.objects.get(holiday_name="Published Holiday").delete()
+    emptied = client.get("/api/v1/leaves/holidays/?year=2026", HTTP_IF_NONE_MATCH=first["ETag"])
+    assert emptied.status_code == 200
+    assert emptied.data == []
+
+    published = HolidayCalendar.objects.get(name="Published VN 2026")
+    PublicHoliday.objects.create(
+        calendar=published, entity=holiday_scope.entity, holiday_name="Restored Holiday",
+        start_date=date(2026, 9, 2), end_date=date(2026, 9, 2), year=2026,
+        status=PublicHoliday.Status.PUBLISHED,
+    )
+    restored = client.get("/api/v1/leaves/holidays/?year=2026")
+    assert [holiday["name"] for holiday in restored.data] == ["Restored Holiday"]
+
+    published.delete()
+    assert client.get(
+        "/api/v1/leaves/holidays/?year=2026", HTTP_IF_NONE_MATCH=restored["ETag"]
+    ).data == []
+
+
+@pytest.mark.django_db
+def test_holiday_ics_feed_lists_all_day_events(holiday_scope):
+    client = APIClient()
+    client.force_authenticate(holiday_scope)
+
+    response = client.get("/api/v1/leaves/holidays/calendar.ics?year=2026")
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/calendar")
+    body = response.content.decode()
+    assert body.startswith("BEGIN:VCALENDAR\r\n")
+    assert "DTSTART;VALUE=DATE:20260430\r\nDTEND;VALUE=DATE:20260502\r\n" in body
+    assert "SUMMARY:Published Holiday\r\n" in body
+    assert client.get(
+        "/api/v1/leaves/holidays/calendar.ics?year=2026", HTTP_IF_NONE_MATCH=response["ETag"]
+    ).status_code == 304
+
+
+@pytest.mark.django_db
+def test_holiday_json_feed_uses_weak_etag_varying_on_accept(holiday_scope):
+    client = APIClient()
+    client.force_authenticate(holiday_scope)
+
+    response = client.get("/api/v1/leaves/holidays/?year=2026")
+
+    assert response["ETag"].startswith('W/"')
+    assert {"Accept", "Authorization"} <= {value.strip() for value in response["Vary"].split(",")}
+    assert client.get(
+        "/api/v1/leaves/holidays/?year=2026", HTTP_IF_NONE_MATCH=response["ETag"]
+    ).status_code == 304
+
+
+@pytest.mark.django_db
+def test_ics_feed_subscribes_with_revocable_url_token(holiday_scope):
+    client = APIClient()
+    client.force_authenticate(holiday_scope)
+    issued = client.post("/api/v1/leaves/holidays/feed-token/")
+    assert issued.status_code == 201
+    assert issued.data["url"].endswith(f"/api/v1/leaves/holidays/calendar.ics?token={issued.data['token']}")
+
+    calendar_app = APIClient()
+    response = calendar_app.get("/api/v1/leaves/holidays/calendar.ics", {"token": issued.data["token"]})
+    assert response.status_code == 200
+    assert "SUMMARY:Published Holiday\r\n" in response.content.decode()
+    assert calendar_app.get("/api/v1/leaves/holidays/calendar.ics").status_code == 401
+    assert calendar_app.get("/api/v1/leaves/holidays/", {"token": issued.data["token"]}).status_code == 401
+
+    rotated = client.post("/api/v1/leaves/holidays/feed-token/").data["token"]
+    assert calendar_app.get(
+        "/api/v1/leaves/holidays/calendar.ics", {"token": issued.data["token"]}
+    ).status_code == 401
+    assert calendar_app.get("/api/v1/leaves/holidays/calendar.ics", {"token": rotated}).status_code == 200
+
+    assert client.delete("/api/v1/leaves/holidays/feed-token/").status_code == 204
+    assert calendar_app.get("/api/v1/leaves/holidays/calendar.ics", {"token": rotated}).status_code == 401
@@ -0,0 +1,101 @@
+"""Tests for the set-based yearly allocation rollover command."""
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from leaves.models import LeaveBalance, LeaveBalanceEntry
+from organizations.models import Department, Entity, Location
+
+User = get_user_model()
+
+
+@pytest.fixture
+def organization():
+    entity = Entity.objects.create(entity_name='Rollover Entity', code='ROLL')
+    location = Location.objects.create(
+        entity=entity,
+        location_name='Rollover Location',
+        city='Test City',
+        country='USA',
+        timezone='UTC',
+    )
+    department = Department.objects.create(
+        entity=entity,
+        location=location,
+        department_name='Operations',
+        code='OPS',
+    )
+    return {'entity': entity, 'location': location, 'department': department}
+
+
+def create_employees(organization, count, offset=0):
+    users = [
+        User.objects.create_user(
+            email=f'rollover{offset + index}@example.com',
+            password='TestPass123!',
+            join_date=date(2015 + index % 10, 1 + index % 12, 1),
+            **organization,
+        )
+        for index in range(count)
+    ]
+    LeaveBalance.objects.filter(user__in=users).delete()
+    return users
+
+
+def run_rollover(*args):
+    out = StringIO()
+    with CaptureQueriesContext(connection) as queries:
+        call_command('recalculate_exempt_vacation', '--year=2026', *args, stdout=out)
+    return out.getvalue(), len(queries)
+
+
+@pytest.mark.django_db
+def test_query_count_does_not_grow_with_headcount(organization):
+    create_employees(organization, 3)
+    _, small_run = run_rollover()
+
+    LeaveBalance.objects.all().delete()
+    create_employees(organization, 12, offset=3)
+    _, large_run = run_rollover()
+
+    assert LeaveBalance.objects.filter(year=2026).count() == 30
+    assert large_run == small_run
+
+
+@pytest.mark.django_db
+def test_dry_run_reports_diff_without_writing(organization):
+    user, = create_employees(organization, 1)
+    LeaveBalance.objects.create(
+        user=user, year=2026, balance_type='SICK', allocated_hours=Decimal('32.00')
+    )
+
+    output, _ = run_rollover('--dry-run')
+
+    assert 'rollover0@example.com VACATION: (new) -> 160.00h' in output
+    assert 'rollover0@example.com SICK: 32.00h -> 40.00h (+8.00h)' in output
+    assert '1 to create, 1 to update, 0 unchanged' in output
+    assert LeaveBalance.objects.filter(user=user).count() == 1
+    assert not LeaveBalanceEntry.objects.exists()
+
+
+@pytest.mark.django_db
+def test_existing_balances_get_recalculation_entries(organization):
+    user, = create_employees(organization, 1)
+    sick = LeaveBalance.objects.create(
+        user=user, year=2026, balance_type='SICK', allocated_hours=Decimal('32.00')
+    )
+
+    run_rollover()
+    output, _ = run_rollover()
+
+    entry = sick.ledger_entries.get()
+    assert entry.entry_type == LeaveBalanceEntry.EntryType.RECALCULATION
+    assert entry.allocated_hours == Decimal('8.00')
+    assert sick.totals.allocated_hours == Decimal('40.00')
+    assert '0 created, 0 updated, 2 unchanged' in output
@@ -0,0 +1,121 @@
+"""Tests for the set-based leave-hours recalculation engine."""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from leaves.balance_ledger import find_ledger_discrepancies
+from leaves.models import HolidayCalendar, LeaveBalance, LeaveBalanceEntry, LeaveRequest, PublicHoliday
+from leaves.recalculation import HolidayIndex, LeaveHoursRecalculation
+from leaves.tests.test_weekend_working_days import make_user, make_vacation_category
+from leaves.utils import get_holidays_for_user
+
+
+def add_holiday(user, day, entity=None):
+    calendar = HolidayCalendar.objects.create(
+        name=f"Holiday {day}",
+        country_code="VN",
+        year=day.year,
+        entity=entity or user.entity,
+        status=HolidayCalendar.Status.PUBLISHED,
+    )
+    return PublicHoliday.objects.create(
+        calendar=calendar,
+        entity=entity or user.entity,
+        holiday_name="Holiday",
+        start_date=day,
+        end_date=day,
+        year=day.year,
+        status=PublicHoliday.Status.PUBLISHED,
+    )
+
+
+def make_weekend_requests(user, count, status=LeaveRequest.Status.APPROVED):
+    category = make_vacation_category()
+    saturday = date(2026, 6, 13)
+    return [
+        LeaveRequest.objects.create(
+            user=user,
+            leave_category=category,
+            start_date=saturday + timedelta(weeks=week),
+            end_date=saturday + timedelta(weeks=week, days=1),
+            shift_type=LeaveRequest.ShiftType.FULL_DAY,
+            total_hours=Decimal("0.00"),
+            status=status,
+        )
+        for week in range(count)
+    ]
+
+
+@pytest.mark.django_db
+def test_holiday_index_matches_per_user_holiday_scope():
+    user = make_user("index@example.com", includes_weekends=True)
+    stranger = make_user("stranger@example.com", includes_weekends=True)
+    add_holiday(user, date(2026, 6, 13))
+    add_holiday(stranger, date(2026, 6, 14))
+
+    index = HolidayIndex(date(2026, 6, 1), date(2026, 6, 30))
+
+    expected = set(
+        get_holidays_for_user(user, date(2026, 6, 1), date(2026, 6, 30)).values_list("start_date", flat=True)
+    )
+    assert index.days_for(user, date(2026, 6, 1), date(2026, 6, 30)) == expected == {date(2026, 6, 13)}
+
+
+@pytest.mark.django_db
+def test_compute_query_count_is_constant_per_batch():
+    user = make_user("batch@example.com", includes_weekends=True)
+    add_holiday(user, date(2026, 6, 20))
+    make_weekend_requests(user, 2)
+    queryset = LeaveRequest.objects.filter(user=user)
+
+    with CaptureQueriesContext(connection) as small:
+        assert len(list(LeaveHoursRecalculation(queryset).iter_changes())) == 2
+
+    make_weekend_requests(user, 4)
+    with CaptureQueriesContext(connection) as large:
+        changes = list(LeaveHoursRecalculation(queryset).iter_changes())
+
+    assert len(large) == len(small)
+    # Requests covering the 20 June holiday lose a day
+    assert sorted(change.new_hours for change in changes) == [Decimal("8")] * 2 + [Decimal("16")] * 4
+
+
+@pytest.mark.django_db
+def test_apply_bulk_updates_requests_and_appends_ledger_entries():
+    user = make_user("apply@example.com", includes_weekends=True)
+    balance, _ = LeaveBalance.objects.update_or_create(
+        user=user, year=2026, balance_type="VACATION", defaults={"allocated_hours": Decimal("80.00")}
+    )
+    approved = make_weekend_requests(user, 2)
+    stale = approved[1]
+    engine = LeaveHoursRecalculation(LeaveRequest.objects.filter(user=user), batch_size=1)
+    changes = list(engine.iter_changes())
+    LeaveRequest.objects.filter(pk=stale.pk).update(total_hours=Decimal("8.00"))
+
+    applied, skipped = engine.apply(changes)
+
+    assert [change.request_id for change in applied] == [approved[0].pk]
+    assert [change.request_id for change in skipped] == [stale.pk]
+    approved[0].refresh_from_db()
+    assert approved[0].total_hours == Decimal("16.00")
+    assert len(approved[0].leave_breakdown) == 2
+    entry = balance.ledger_entries.get()
+    assert entry.entry_type == LeaveBalanceEntry.EntryType.RECALCULATION
+    assert entry.used_hours == Decimal("16.00")
+    assert engine.balance_deltas(changes) == {(user.pk, 2026, "VACATION"): Decimal("32.00")}
+    assert not find_ledger_discrepancies().filter(pk=approved[0].pk).exists()
+
+
+@pytest.mark.django_db
+def test_process_pool_produces_same_changes():
+    user = make_user("pool@example.com", includes_weekends=True)
+    make_weekend_requests(user, 3, status=LeaveRequest.Status.PENDING)
+    queryset = LeaveRequest.objects.filter(user=user)
+
+    serial = list(LeaveHoursRecalculation(queryset).iter_changes())
+    pooled = list(LeaveHoursRecalculation(queryset, workers=2).iter_changes())
+
+    assert [(c.request_id, c.new_hours) for c in pooled] == [(c.request_id, c.new_hours) for c in serial]
@@ -940,6 +940,47 @@ class TestLeaveBalance:
         vacation = next(b for b in response.data['balances'] if b['type'] == 'VACATION')
         assert vacation['allocated_hours'] == float(balance.allocated_hours)
 
+    def test_my_balance_multi_year_with_pending_in_one_query(self, setup_user_with_balance):
+        """Existing balances are read with a single query including pending hours"""
+        user = setup_user_with_balance['user']
+        category = setup_user_with_balance['category']
+        LeaveRequest.objects.create(
+            user=user,
+            leave_category=category,
+            start_date=date(2026, 3, 2),
+            end_date=date(2026, 3, 2),
+            shift_type='FULL_DAY',
+            total_hours=Decimal('8.00'),
+            status='PENDING',
+        )
+
+        client = APIClient()
+        client.force_authenticate(user=user)
+        first = client.get('/api/v1/leaves/balances/me/', {'years': '2025,2026'})
+        assert LeaveBalance.objects.filter(user=user, year__in=[2025, 2026]).count() == 4
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/v1/leaves/balances/me/', {'years': '2025,2026'})
+
+        assert response.status_code == 200
+        assert response.data == first.data
+        assert [(b['year'], b['type']) for b in response.data['balances']] == [
+            (2025, 'VACATION'), (2025, 'SICK'), (2026, 'VACATION'), (2026, 'SICK'),
+        ]
+        vacation = response.data['balances'][2]
+        assert vacation['pending_hours'] == 8.0
+        assert vacation['projected_remaining_hours'] == vacation['remaining_hours'] - 8.0
+        assert len([q for q in queries.captured_queries if 'leave_balances' in q['sql']]) == 1
+
+    def test_my_balance_rejects_invalid_years(self, setup_user_with_balance):
+        client = APIClient()
+        client.force_authenticate(user=setup_user_with_balance['user'])
+
+        assert client.get('/api/v1/leaves/balances/me/', {'year': 'abc'}).status_code == 400
+        assert client.get(
+            '/api/v1/leaves/balances/me/', {'years': '2020,2021,2022,2023,2024,2025'}
+        ).status_code == 400
+
     def test_hr_adjust_balance(self, setup_user_with_balance):
         """Test HR adjusting user balance via PUT auth balance/adjust"""
         user = setup_user_with_balance['user']
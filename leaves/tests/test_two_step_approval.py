@@ -119,7 +119,7 @@ class PeerApprovalTests(TestCase):
         self.balance.refresh_from_db()
         self.assertEqual(leave_request.status, 'PENDING')
         self.assertEqual(leave_request.first_approval_status, 'APPROVED')
-        self.assertEqual(self.balance.used_hours, Decimal('0.00'))
+        self.assertEqual(self.balance.totals.used_hours, Decimal('0.00'))
 
         response = self.post_approve(self.approver_2, leave_request, 'ok-B')
         self.assertEqual(response.status_code, 200)
@@ -128,7 +128,7 @@ class PeerApprovalTests(TestCase):
         self.assertEqual(leave_request.status, 'APPROVED')
         self.assertEqual(leave_request.final_approval_status, 'APPROVED')
         self.assertEqual(leave_request.current_approval_step, 'COMPLETED')
-        self.assertEqual(self.balance.used_hours, Decimal('8.00'))
+        self.assertEqual(self.balance.totals.used_hours, Decimal('8.00'))
 
     def test_reverse_order_also_completes(self):
         leave_request = self.make_request()
@@ -142,7 +142,7 @@ class PeerApprovalTests(TestCase):
         leave_request.refresh_from_db()
         self.balance.refresh_from_db()
         self.assertEqual(leave_request.status, 'APPROVED')
-        self.assertEqual(self.balance.used_hours, Decimal('8.00'))
+        self.assertEqual(self.balance.totals.used_hours, Decimal('8.00'))
 
     def test_single_rejection_denies_without_deducting_balance(self):
         leave_request = self.make_request()
@@ -153,7 +153,7 @@ class PeerApprovalTests(TestCase):
         self.balance.refresh_from_db()
         self.assertEqual(leave_request.status, 'REJECTED')
         self.assertEqual(leave_request.final_approval_status, 'REJECTED')
-        self.assertEqual(self.balance.used_hours, Decimal('0.00'))
+        self.assertEqual(self.balance.totals.used_hours, Decimal('0.00'))
 
     def test_first_rejection_denies_immediately(self):
         leave_request = self.make_request()
@@ -181,7 +181,7 @@ class PeerApprovalTests(TestCase):
         leave_request.refresh_from_db()
         self.balance.refresh_from_db()
         self.assertEqual(leave_request.status, 'APPROVED')
-        self.assertEqual(self.balance.used_hours, Decimal('8.00'))
+        self.assertEqual(self.balance.totals.used_hours, Decimal('8.00'))
 
     def test_peer_cannot_act_twice(self):
         leave_request = self.make_request()
@@ -199,7 +199,7 @@ class PeerApprovalTests(TestCase):
         self.assertEqual(self.post_approve(self.approver_1, leave_request).status_code, 200)
         self.assertEqual(self.post_approve(self.approver_2, leave_request).status_code, 200)
         self.balance.refresh_from_db()
-        self.assertEqual(self.balance.used_hours, Decimal('8.00'))
+        self.assertEqual(self.balance.totals.used_hours, Decimal('8.00'))
 
         response = self.post_reject(self.approver_1, leave_request, 'Coverage changed after approval')
 
@@ -207,7 +207,7 @@ class PeerApprovalTests(TestCase):
         leave_request.refresh_from_db()
         self.balance.refresh_from_db()
         self.assertEqual(leave_request.status, 'REJECTED')
-        self.assertEqual(self.balance.used_hours, Decimal('0.00'))
+        self.assertEqual(self.balance.totals.used_hours, Decimal('0.00'))
 
     def test_both_peers_see_pending_request(self):
         leave_request = self.make_request()
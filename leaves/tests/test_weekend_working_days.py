@@ -165,7 +165,7 @@ def test_recalculate_weekend_leave_hours_dry_run_execute_and_idempotent():
     leave.refresh_from_db()
     balance.refresh_from_db()
     assert leave.total_hours == Decimal("0.00")
-    assert balance.used_hours == Decimal("0.00")
+    assert balance.totals.used_hours == Decimal("0.00")
     assert "WENT NEGATIVE" in dry_run_out.getvalue()
 
     execute_out = StringIO()
@@ -173,7 +173,7 @@ def test_recalculate_weekend_leave_hours_dry_run_execute_and_idempotent():
     leave.refresh_from_db()
     balance.refresh_from_db()
     assert leave.total_hours == Decimal("16.00")
-    assert balance.used_hours == Decimal("16.00")
+    assert balance.totals.used_hours == Decimal("16.00")
     assert balance.remaining_hours == Decimal("-8.00")
 
     second_out = StringIO()
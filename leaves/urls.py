@@ -15,6 +15,8 @@ from .views import (
     LeaveRequestCancelView,
     LeaveRequestPendingReviewCountView,
     PublicHolidayListView,
+    PublicHolidayICSView,
+    HolidayFeedTokenView,
     HolidayCalendarListView,
     HolidayCalendarGenerateView,
     HolidayCalendarDetailView,
@@ -28,6 +30,7 @@ from .views import (
     BusinessTripTeamListView,
     FileUploadView,
     ExportApprovedLeavesView,
+    LeaveBalanceReportView,
 )
 
 urlpatterns = [
@@ -37,6 +40,9 @@ urlpatterns = [
     # Export
     path('export/approved/', ExportApprovedLeavesView.as_view(), name='export_approved_leaves'),
 
+    # Reports
+    path('reports/balances/', LeaveBalanceReportView.as_view(), name='leave_balance_report'),
+
     # Team Calendar
     path('calendar/', TeamCalendarView.as_view(), name='team_calendar'),
 
@@ -70,6 +76,8 @@ urlpatterns = [
 
     # Public Holidays
     path('holidays/', PublicHolidayListView.as_view(), name='public_holiday_list'),
+    path('holidays/calendar.ics', PublicHolidayICSView.as_view(), name='public_holiday_ics'),
+    path('holidays/feed-token/', HolidayFeedTokenView.as_view(), name='holiday_feed_token'),
     path('holidays/<uuid:pk>/', HolidayDetailView.as_view(), name='holiday_detail'),
 
     # Business Trips (auto-approved, no balance deduction)
@@ -7,9 +7,7 @@ from decimal import Decimal
 import re
 import unicodedata
 
-from django.db.models import Q
-
-from .models import PublicHoliday, LeaveRequest
+from .models import HolidayDay, PublicHoliday, LeaveRequest
 
 ZERO_DEDUCTIBLE_HOURS_MESSAGE = (
     'No deductible working hours were found for the selected date range. '
@@ -29,14 +27,6 @@ def normalize_country_code(value):
     return None
 
 
-def holiday_country_scope_for_user(user):
-    """Limit calendar-backed holidays to the user's location country when known."""
-    country_code = normalize_country_code(getattr(getattr(user, "location", None), "country", None))
-    if not country_code:
-        return Q()
-    return Q(calendar__country_code=country_code)
-
-
 def is_working_day(user, day):
     """Return whether this date should deduct full-day leave for the user."""
     resolved = resolve_work_shift_day(user, day)
@@ -136,9 +126,16 @@ def resolve_work_shift_day(user, day):
     }
 
 
+def _is_holiday(user, day, exclude_calendar_id=None, holiday_days=None):
+    if holiday_days is not None:
+        return day in holiday_days
+    return holiday_days_for_user(user, day, day, exclude_calendar_id).exists()
+
+
 def calculate_leave_hours(
     user, start_date, end_date, shift_type, start_time=None, end_time=None,
     exclude_calendar_id=None, start_day_offset=0, end_day_offset=0,
+    holiday_days=None,
 ):
     """
     Calculate total leave hours based on shift type, excluding non-working days and holidays
@@ -150,6 +147,8 @@ def calculate_leave_hours(
         shift_type: 'FULL_DAY' or 'CUSTOM_HOURS'
         start_time: time object (required for CUSTOM_HOURS)
         end_time: time object (required for CUSTOM_HOURS)
+        holiday_days: optional precomputed set of the user's holiday dates;
+            skips the per-day holiday queries (see leaves.recalculation)
 
     Returns:
         Decimal: Total hours
@@ -166,12 +165,7 @@ def calculate_leave_hours(
         )
         if (
             not holiday_requires_leave
-            and get_holidays_for_user(
-                user,
-                start_date,
-                start_date,
-                exclude_calendar_id,
-            ).exists()
+            and _is_holiday(user, start_date, exclude_calendar_id, holiday_days)
         ):
             return Decimal('0.00')
 
@@ -211,11 +205,15 @@ def calculate_leave_hours(
                 hours -= overlap
         return max(hours, Decimal('0.00'))
 
-    total_hours, _ = calculate_full_day_leave_breakdown(user, start_date, end_date, exclude_calendar_id)
+    total_hours, _ = calculate_full_day_leave_breakdown(
+        user, start_date, end_date, exclude_calendar_id, holiday_days=holiday_days,
+    )
     return total_hours
 
 
-def calculate_full_day_leave_breakdown(user, start_date, end_date, exclude_calendar_id=None):
+def calculate_full_day_leave_breakdown(user, start_date, end_date, exclude_calendar_id=None, holiday_days=None):
+    if holiday_days is None:
+        holiday_days = holiday_dates_for_user(user, start_date, end_date, exclude_calendar_id)
     total_hours = Decimal('0')
     breakdown = []
     current = start_date
@@ -243,7 +241,7 @@ def calculate_full_day_leave_breakdown(user, start_date, end_date, exclude_calen
             breakdown.append(_breakdown_row(current, resolved, hours, 'WORK'))
             current += timedelta(days=1)
             continue
-        if not get_holidays_for_user(user, current, current, exclude_calendar_id).exists():
+        if not _is_holiday(user, current, exclude_calendar_id, holiday_days):
             total_hours += hours
             breakdown.append(_breakdown_row(current, resolved, hours, 'WORK'))
         else:
@@ -281,9 +279,36 @@ def infer_custom_hour_offsets(user, start_time, end_time):
     return 0, 1 if end_time <= start_time else 0
 
 
+def holiday_days_for_user(user, start_date, end_date=None, exclude_calendar_id=None):
+    """
+    HolidayDay rows that apply to ``user`` between start_date and end_date.
+
+    Scopes are global, the user's entity and the user's entity + location,
+    limited to the location's country when it is known. ``end_date=None``
+    leaves the range open-ended.
+    """
+    days = HolidayDay.objects.filter(
+        scope_key__in=HolidayDay.scope_keys_for_user(user),
+        date__gte=start_date,
+    )
+    if end_date is not None:
+        days = days.filter(date__lte=end_date)
+    country_code = normalize_country_code(getattr(getattr(user, "location", None), "country", None))
+    if country_code:
+        days = days.filter(country_code=country_code)
+    if exclude_calendar_id:
+        days = days.exclude(holiday__calendar_id=exclude_calendar_id)
+    return days
+
+
+def holiday_dates_for_user(user, start_date, end_date, exclude_calendar_id=None):
+    """Set of the user's holiday dates in range, from one indexed query."""
+    return set(holiday_days_for_user(user, start_date, end_date, exclude_calendar_id).values_list("date", flat=True))
+
+
 def get_holidays_for_user(user, start_date, end_date, exclude_calendar_id=None):
     """
-    Get holidays applicable to user's entity/location
+    Get Published holidays applicable to user's entity/location
 
     Scope logic (in priority order):
     1. entity + location specific
@@ -298,38 +323,8 @@ def get_holidays_for_user(user, start_date, end_date, exclude_calendar_id=None):
     Returns:
         QuerySet of PublicHoliday
     """
-    # Build Q objects for holiday scoping
-    queries = []
-
-    # Global holidays
-    queries.append(Q(entity__isnull=True, location__isnull=True))
-
-    # Entity-specific holidays
-    if user.entity:
-        queries.append(Q(entity=user.entity, location__isnull=True))
-
-    # Location-specific holidays
-    if user.entity and user.location:
-        queries.append(Q(entity=user.entity, location=user.location))
-
-    # Combine with OR
-    if queries:
-        query = queries[0]
-        for q in queries[1:]:
-            query |= q
-    else:
-        query = Q(entity__isnull=True, location__isnull=True)
-
-    holidays = PublicHoliday.objects.filter(
-        query & holiday_country_scope_for_user(user),
-        start_date__lte=end_date,
-        end_date__gte=start_date,
-        is_active=True,
-        status=PublicHoliday.Status.PUBLISHED,
-    )
-    if exclude_calendar_id:
-        holidays = holidays.exclude(calendar_id=exclude_calendar_id)
-    return holidays
+    days = holiday_days_for_user(user, start_date, end_date, exclude_calendar_id)
+    return PublicHoliday.objects.filter(id__in=days.values("holiday_id"))
 
 
 def validate_leave_request_dates(start_date, end_date):
@@ -3,7 +3,7 @@
 from .team_calendar import TeamCalendarView
 from .categories import LeaveCategoryListView
 from .balances import LeaveBalanceMeView
-from .holidays import PublicHolidayListView
+from .holidays import HolidayFeedTokenView, PublicHolidayICSView, PublicHolidayListView
 from .holiday_calendars import (
     HolidayCalendarListView,
     HolidayCalendarGenerateView,
@@ -21,6 +21,7 @@ from .business_trips import (
 )
 from .file_upload import FileUploadView
 from .export_leaves import ExportApprovedLeavesView
+from .balance_report import LeaveBalanceReportView
 
 from .requests import (
     LeaveRequestListView,
@@ -46,6 +47,8 @@ __all__ = [
     'LeaveRequestCancelView',
     'LeaveRequestPendingReviewCountView',
     'PublicHolidayListView',
+    'PublicHolidayICSView',
+    'HolidayFeedTokenView',
     'HolidayCalendarListView',
     'HolidayCalendarGenerateView',
     'HolidayCalendarDetailView',
@@ -59,4 +62,5 @@ __all__ = [
     'BusinessTripTeamListView',
     'FileUploadView',
     'ExportApprovedLeavesView',
+    'LeaveBalanceReportView',
 ]
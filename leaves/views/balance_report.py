@@ -0,0 +1,155 @@
+"""Entity-wide leave balance report, streamed as CSV or JSON lines."""
+import csv
+import json
+import uuid
+
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from leaves.models import LeaveBalance
+from users.models import User
+from users.permissions import IsHROrAdmin
+
+REPORT_FIELDS = [
+    ('employee_code', 'user__employee_code'),
+    ('email', 'user__email'),
+    ('first_name', 'user__first_name'),
+    ('last_name', 'user__last_name'),
+    ('department', 'user__department__department_name'),
+    ('location', 'user__location__location_name'),
+    ('year', 'year'),
+    ('balance_type', 'balance_type'),
+    ('allocated_hours', 'current_allocated_hours'),
+    ('used_hours', 'current_used_hours'),
+    ('adjusted_hours', 'current_adjusted_hours'),
+    ('remaining_hours', 'current_remaining_hours'),
+    ('pending_hours', 'pending_hours'),
+    ('projected_remaining_hours', 'projected_remaining_hours'),
+]
+
+DECIMAL_COLUMNS = {
+    'allocated_hours', 'used_hours', 'adjusted_hours',
+    'remaining_hours', 'pending_hours', 'projected_remaining_hours',
+}
+
+STREAM_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """File-like object whose write() returns the line for streaming csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _report_rows(queryset):
+    """Yield dicts keyed by report column, reading the queryset in chunks."""
+    columns = [column for column, _ in REPORT_FIELDS]
+    lookups = [lookup for _, lookup in REPORT_FIELDS]
+    for values in queryset.values_list(*lookups).iterator(chunk_size=STREAM_CHUNK_SIZE):
+        row = dict(zip(columns, values))
+        for column in DECIMAL_COLUMNS:
+            row[column] = float(row[column])
+        yield row
+
+
+def _csv_stream(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([column for column, _ in REPORT_FIELDS])
+    for row in rows:
+        yield writer.writerow([
+            '' if row[column] is None else row[column]
+            for column, _ in REPORT_FIELDS
+        ])
+
+
+def _jsonl_stream(rows):
+    for row in rows:
+        yield json.dumps(row) + '\n'
+
+
+class LeaveBalanceReportView(APIView):
+    """
+    Per-employee VACATION/SICK balances for an entity and year (HR/Admin only).
+
+    GET /api/v1/leaves/reports/balances/?year=2026&output=csv
+        optional: entity_id (Admin only), department_id, location_id
+        output: csv (default) or jsonl
+
+    One SQL statement computes ledger totals and pending request hours per
+    balance; rows are streamed from a chunked cursor so memory stays flat.
+    """
+
+    permission_classes = [IsAuthenticated, IsHROrAdmin]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            year = int(params.get('year', timezone.now().year))
+        except ValueError:
+            return Response({'error': 'Invalid year'}, status=status.HTTP_400_BAD_REQUEST)
+
+        output = params.get('output', 'csv')
+        if output not in ('csv', 'jsonl'):
+            return Response(
+                {'error': 'output must be csv or jsonl'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        filters = {}
+        for param, lookup in (
+            ('entity_id', 'user__entity_id'),
+            ('department_id', 'user__department_id'),
+            ('location_id', 'user__location_id'),
+        ):
+            if params.get(param):
+                try:
+                    filters[lookup] = uuid.UUID(params[param])
+                except ValueError:
+                    return Response({'error': f'Invalid {param}'}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = LeaveBalance.objects.filter(
+            year=year,
+            balance_type__in=[LeaveBalance.BalanceType.VACATION, LeaveBalance.BalanceType.SICK],
+            user__is_active=True,
+        )
+        if request.user.role == User.Role.HR:
+            if not request.user.entity_id:
+                queryset = queryset.none()
+            else:
+                queryset = queryset.filter(user__entity_id=request.user.entity_id)
+            filters.pop('user__entity_id', None)
+        queryset = queryset.filter(**filters)
+
+        queryset = (
+            queryset
+            .with_totals()
+            .with_pending_hours()
+            .annotate(
+                current_allocated_hours=F('allocated_hours') + F('tail_allocated_hours'),
+                current_used_hours=F('used_hours') + F('tail_used_hours'),
+                current_adjusted_hours=F('adjusted_hours') + F('tail_adjusted_hours'),
+            )
+            .annotate(
+                current_remaining_hours=(
+                    F('current_allocated_hours') + F('current_adjusted_hours') - F('current_used_hours')
+                ),
+            )
+            .annotate(projected_remaining_hours=F('current_remaining_hours') - F('pending_hours'))
+            .order_by('user__email', 'balance_type')
+        )
+
+        rows = _report_rows(queryset)
+        if output == 'jsonl':
+            response = StreamingHttpResponse(_jsonl_stream(rows), content_type='application/x-ndjson')
+            extension = 'jsonl'
+        else:
+            response = StreamingHttpResponse(_csv_stream(rows), content_type='text/csv')
+            extension = 'csv'
+        response['Content-Disposition'] = f'attachment; filename="leave_balances_{year}.{extension}"'
+        return response
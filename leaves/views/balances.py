@@ -1,55 +1,99 @@
 """Leave balance views."""
 
-from datetime import date
-from decimal import Decimal
-
 from django.utils import timezone
-from rest_framework import generics
+from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from ..models import LeaveBalance
-from ..services import calculate_vacation_hours
+from ..services import BalanceCalculationService
+
+BALANCE_TYPES = [LeaveBalance.BalanceType.VACATION, LeaveBalance.BalanceType.SICK]
+
+MAX_BALANCE_YEARS = 5
+
 
-# Default allocated hours for non-dynamic balance types
-DEFAULT_BALANCE_ALLOCATION = {
-    LeaveBalance.BalanceType.VACATION: Decimal('80.00'),  # fallback only
-    LeaveBalance.BalanceType.SICK: Decimal('40.00'),
-}
+def _parse_years(params):
+    """Read ``years=2025,2026`` or ``year=2026``; defaults to the current year."""
+    raw = params.get('years') or params.get('year')
+    if not raw:
+        return [timezone.now().year]
+    years = sorted({int(value) for value in raw.split(',') if value.strip()})
+    if not years or len(years) > MAX_BALANCE_YEARS:
+        raise ValueError(f'Between 1 and {MAX_BALANCE_YEARS} years may be requested')
+    return years
 
 
 class LeaveBalanceMeView(generics.RetrieveAPIView):
-    """Get current user's leave balance."""
+    """
+    Get current user's leave balances, with pending hours, for one or more years.
+
+    Reads are one query (snapshot + ledger tail + pending aggregate). Rows that
+    do not exist yet are created in a single bulk insert on first access.
+    """
 
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        """GET /api/v1/leaves/balances/me/?year=2026"""
-        year = int(request.query_params.get('year', timezone.now().year))
+        """GET /api/v1/leaves/balances/me/?year=2026 or ?years=2025,2026"""
+        try:
+            years = _parse_years(request.query_params)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
         user = request.user
-        reference_date = date(year, 1, 1)
-
-        balances = []
-        for balance_type, default_hours in DEFAULT_BALANCE_ALLOCATION.items():
-            if balance_type == LeaveBalance.BalanceType.VACATION:
-                default_hours = calculate_vacation_hours(
-                    user.join_date, reference_date
-                )
-
-            balance, created = LeaveBalance.objects.get_or_create(
-                user=user,
-                year=year,
-                balance_type=balance_type,
-                defaults={'allocated_hours': default_hours},
+
+        balances = self._fetch(user, years)
+        missing = [
+            (year, balance_type)
+            for year in years
+            for balance_type in BALANCE_TYPES
+            if (year, balance_type) not in balances
+        ]
+        if missing:
+            LeaveBalance.objects.bulk_create(
+                [
+                    LeaveBalance(
+                        user=user,
+                        year=year,
+                        balance_type=balance_type,
+                        allocated_hours=BalanceCalculationService.calculate_default_allocation(
+                            balance_type, user, year
+                        ),
+                    )
+                    for year, balance_type in missing
+                ],
+                ignore_conflicts=True,
             )
+            balances = self._fetch(user, years)
+
+        return Response({
+            'balances': [
+                self._serialize(balances[(year, balance_type)])
+                for year in years
+                for balance_type in BALANCE_TYPES
+            ]
+        })
 
-            balances.append({
-                'type': balance_type,
-                'label': balance.get_balance_type_display(),
-                'allocated_hours': float(balance.allocated_hours),
-                'used_hours': float(balance.used_hours),
-                'adjusted_hours': float(balance.adjusted_hours),
-                'remaining_hours': float(balance.remaining_hours),
-            })
+    @staticmethod
+    def _fetch(user, years):
+        rows = LeaveBalance.objects.with_totals().with_pending_hours().filter(
+            user=user,
+            year__in=years,
+            balance_type__in=BALANCE_TYPES,
+        )
+        return {(balance.year, balance.balance_type): balance for balance in rows}
 
-        return Response({'balances': balances})
+    @staticmethod
+    def _serialize(balance):
+        totals = balance.totals
+        return {
+            'type': balance.balance_type,
+            'label': balance.get_balance_type_display(),
+            'year': balance.year,
+            'allocated_hours': float(totals.allocated_hours),
+            'used_hours': float(totals.used_hours),
+            'adjusted_hours': float(totals.adjusted_hours),
+            'remaining_hours': float(totals.remaining_hours),
+            'pending_hours': float(balance.pending_hours),
+            'projected_remaining_hours': float(totals.remaining_hours - balance.pending_hours),
+        }
@@ -2,11 +2,12 @@
 Business trip views - separate from leaves, no approval workflow, no balance impact
 """
 from django.db import transaction
-from django.db.models import Q
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from core.pagination import InvalidCursor, keyset_paginate
+from users.models import ApproverSubordinate
 from ..models import BusinessTrip
 from ..serializers import BusinessTripSerializer, BusinessTripCreateSerializer
 from ..constants import DEFAULT_PAGE_SIZE
@@ -143,27 +144,35 @@ class BusinessTripTeamListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        """GET /api/v1/leaves/business-trips/team/ - List subordinates' business trips"""
+        """GET /api/v1/leaves/business-trips/team/ - List subordinates' business trips
+
+        Keyset-paginated newest first on (start_date, id): pass the returned
+        next_cursor as ?cursor= for the following page.
+        """
         queryset = BusinessTrip.objects.filter(
-            Q(user__approver_1=request.user) | Q(user__approver_2=request.user)
+            user_id__in=ApproverSubordinate.subordinate_ids(request.user)
         ).exclude(
             user=request.user
-        ).select_related('user').order_by('-start_date')
+        ).select_related('user')
 
         # Pagination with DoS protection
         try:
-            page = max(1, int(request.query_params.get('page', 1)))
             page_size = min(100, max(1, int(request.query_params.get('page_size', DEFAULT_PAGE_SIZE))))
         except (ValueError, TypeError):
-            page = 1
             page_size = DEFAULT_PAGE_SIZE
-        start = (page - 1) * page_size
-        end = start + page_size
-
-        total = queryset.count()
-        items = queryset[start:end]
+        try:
+            items, next_cursor = keyset_paginate(
+                queryset, ('start_date', 'id'), page_size, cursor=request.query_params.get('cursor'),
+            )
+        except InvalidCursor:
+            return Response({'error': 'Invalid cursor.'}, status=status.HTTP_400_BAD_REQUEST)
 
         serializer = BusinessTripSerializer(
             items, many=True, context={'request': request, 'actor': request.user}
         )
-        return Response({'count': total, 'results': serializer.data})
+        return Response({
+            'page_size': page_size,
+            'has_next': next_cursor is not None,
+            'next_cursor': next_cursor,
+            'results': serializer.data,
+        })
@@ -11,7 +11,7 @@ from users.models import User
 from users.permissions import IsHRAdmin
 
 from ..holiday_management import (
-    generate_draft_calendars,
+    bulk_generate_draft_calendars,
     publish_calendar,
     unpublish_calendar,
     unpublish_impact,
@@ -36,9 +36,9 @@ def _active_holidays(calendar):
     return calendar.holidays.exclude(status=PublicHoliday.Status.ARCHIVED).order_by("start_date", "holiday_name")
 
 
-def _expanded_holiday_days(calendar):
+def _expanded_holiday_days(holidays):
     rows = []
-    for holiday in _active_holidays(calendar):
+    for holiday in holidays:
         current = holiday.start_date
         while current <= holiday.end_date:
             rows.append({
@@ -59,6 +59,12 @@ def _expanded_holiday_days(calendar):
 
 
 def _calendar_data(calendar, include_holidays=False):
+    """
+    Serialize a calendar.
+
+    Without holidays the count comes from ``with_holiday_counts()`` when the
+    queryset was annotated; with holidays they are loaded and expanded once.
+    """
     data = {
         "id": str(calendar.id),
         "name": calendar.name,
@@ -69,9 +75,15 @@ def _calendar_data(calendar, include_holidays=False):
         "entity_name": calendar.entity.entity_name,
         "location_id": str(calendar.location_id) if calendar.location_id else None,
         "location_name": calendar.location.location_name if calendar.location else None,
-        "holiday_count": len(_expanded_holiday_days(calendar)),
         "published_at": calendar.published_at,
     }
+    if not include_holidays and hasattr(calendar, "holiday_entries"):
+        data["holiday_count"] = calendar.holiday_day_count
+        return data
+
+    holidays = list(_active_holidays(calendar))
+    holiday_days = _expanded_holiday_days(holidays)
+    data["holiday_count"] = len(holiday_days)
     if include_holidays:
         data["holidays"] = [
             {
@@ -84,9 +96,9 @@ def _calendar_data(calendar, include_holidays=False):
                 "status": holiday.status,
                 "source_note": holiday.source_note,
             }
-            for holiday in _active_holidays(calendar)
+            for holiday in holidays
         ]
-        data["holiday_days"] = _expanded_holiday_days(calendar)
+        data["holiday_days"] = holiday_days
     return data
 
 
@@ -125,7 +137,7 @@ class HolidayCalendarListView(APIView):
     permission_classes = [IsAuthenticated, IsHRAdmin]
 
     def get(self, request):
-        queryset = _calendar_queryset(request.user)
+        queryset = _calendar_queryset(request.user).with_holiday_counts()
         for field in ("year", "country_code", "status", "entity_id", "location_id"):
             value = request.query_params.get(field)
             if value:
@@ -145,13 +157,16 @@ class HolidayCalendarGenerateView(APIView):
         entities, error = _generation_entities(request)
         if error:
             return error
-        calendars = generate_draft_calendars(
+        calendars, skipped = bulk_generate_draft_calendars(
             year,
             entities,
             country_overrides=request.data.get("country_overrides") or {},
         )
         return Response(
-            {"results": [_calendar_data(calendar, include_holidays=True) for calendar in calendars]},
+            {
+                "results": [_calendar_data(calendar, include_holidays=True) for calendar in calendars],
+                "skipped": [_calendar_data(calendar) for calendar in skipped],
+            },
             status=status.HTTP_201_CREATED,
         )
 
@@ -1,12 +1,62 @@
 """Public holiday views."""
 
-from rest_framework import generics
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import exceptions, generics, status
+from rest_framework.authentication import BaseAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.db.models import Q
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
 
-from ..models import PublicHoliday
-from ..utils import holiday_country_scope_for_user
+from ..holiday_feed import (
+    HOLIDAY_FEED_MAX_AGE,
+    get_holiday_feed,
+    issue_feed_token,
+    revoke_feed_token,
+    user_for_feed_token,
+)
+
+
+def _parse_year(request):
+    year = request.query_params.get('year')
+    return int(year) if year else None
+
+
+def _not_modified(request, etag):
+    if_none_match = request.headers.get('If-None-Match')
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    # If-None-Match uses the weak comparison (RFC 9110 section 13.1.2)
+    return '*' in etags or etag.removeprefix('W/') in {tag.removeprefix('W/') for tag in etags}
+
+
+def _with_cache_headers(response, etag, vary=('Authorization',)):
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, max_age=HOLIDAY_FEED_MAX_AGE)
+    patch_vary_headers(response, vary)
+    return response
+
+
+class HolidayFeedTokenAuthentication(BaseAuthentication):
+    """
+    Authenticate calendar-app subscriptions by the ``?token=`` query parameter.
+
+    Only the .ics feed accepts it, so a leaked URL exposes nothing beyond
+    the owner's holiday list and is revoked by issuing or deleting the token.
+    """
+
+    def authenticate(self, request):
+        token = request.query_params.get('token')
+        if not token:
+            return None
+        user = user_for_feed_token(token)
+        if user is None:
+            raise exceptions.AuthenticationFailed('Invalid or revoked calendar feed token.')
+        return user, None
 
 
 class PublicHolidayListView(generics.ListAPIView):
@@ -16,36 +66,53 @@ class PublicHolidayListView(generics.ListAPIView):
 
     def get(self, request, *args, **kwargs):
         """GET /api/v1/leaves/holidays/?year=2026"""
-        user = request.user
-        year = request.query_params.get('year')
-
-        # Build query for holidays applicable to user's entity/location
-        query = Q(entity__isnull=True) | Q(entity=user.entity)
-        if user.location:
-            query &= Q(location__isnull=True) | Q(location=user.location)
-
-        holidays = PublicHoliday.objects.filter(
-            query & holiday_country_scope_for_user(user),
-            is_active=True,
-            status=PublicHoliday.Status.PUBLISHED,
-        )
-
-        if year:
-            holidays = holidays.filter(year=int(year))
-
-        holidays = holidays.order_by('start_date')
-
-        data = [
-            {
-                'id': str(h.id),
-                'name': h.holiday_name,
-                'start_date': h.start_date.isoformat(),
-                'end_date': h.end_date.isoformat(),
-                'year': h.year,
-                'is_recurring': h.is_recurring,
-                'entity_id': str(h.entity_id) if h.entity_id else None,
-                'location_id': str(h.location_id) if h.location_id else None,
-            }
-            for h in holidays
-        ]
-        return Response(data)
+        feed = get_holiday_feed(request.user, _parse_year(request))
+        if _not_modified(request, feed['etag']):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(feed['data'])
+        # One weak validator covers every renderer (JSON, browsable API)
+        return _with_cache_headers(response, feed['etag'], vary=('Authorization', 'Accept'))
+
+
+class PublicHolidayICSView(APIView):
+    """
+    Published holidays as an iCalendar feed for calendar clients.
+
+    Subscriptions authenticate with a feed token in the URL (see
+    HolidayFeedTokenView); the app itself may still use its bearer token.
+    """
+
+    authentication_classes = [JWTAuthentication, HolidayFeedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        """GET /api/v1/leaves/holidays/calendar.ics?year=2026[&token=...]"""
+        feed = get_holiday_feed(request.user, _parse_year(request))
+        if _not_modified(request, feed['ics_etag']):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = HttpResponse(feed['ics'], content_type='text/calendar; charset=utf-8')
+            response['Content-Disposition'] = 'inline; filename="holidays.ics"'
+        return _with_cache_headers(response, feed['ics_etag'])
+
+
+class HolidayFeedTokenView(APIView):
+    """Issue or revoke the caller's calendar subscription URL."""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """
+        POST /api/v1/leaves/holidays/feed-token/
+
+        Returns a new subscription URL; any earlier URL stops working.
+        """
+        token = issue_feed_token(request.user)
+        url = request.build_absolute_uri(reverse('public_holiday_ics'))
+        return Response({'token': token, 'url': f'{url}?token={token}'}, status=status.HTTP_201_CREATED)
+
+    def delete(self, request):
+        """DELETE /api/v1/leaves/holidays/feed-token/"""
+        revoke_feed_token(request.user)
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -247,9 +247,10 @@ class LeaveRequestListView(generics.ListCreateAPIView):
                         defaults={'allocated_hours': default_hours}
                     )
 
-                    if total_hours > balance.remaining_hours:
+                    remaining_hours = balance.remaining_hours
+                    if total_hours > remaining_hours:
                         return Response(
-                            {'error': f'Insufficient balance. Requested: {total_hours}h, Available: {balance.remaining_hours}h'},
+                            {'error': f'Insufficient balance. Requested: {total_hours}h, Available: {remaining_hours}h'},
                             status=status.HTTP_400_BAD_REQUEST
                         )
 
@@ -7,9 +7,10 @@ from rest_framework.response import Response
 from django.db.models import Q
 from django.contrib.auth import get_user_model
 
-from ..models import LeaveRequest, PublicHoliday, BusinessTrip
+from users.models import ApproverSubordinate
+from ..models import LeaveRequest, BusinessTrip
 from ..constants import DEFAULT_MONTH, DEFAULT_YEAR
-from ..utils import holiday_country_scope_for_user, resolve_work_shift_day
+from ..utils import get_holidays_for_user, resolve_work_shift_day
 
 User = get_user_model()
 
@@ -31,12 +32,12 @@ class TeamCalendarView(generics.GenericAPIView):
 
         # Get team members (same entity) + peer-approval subordinates + user's approver
         team_filters = Q(entity=user.entity)  # Entity-level only
-        subordinate_filter = Q(approver_1=user) | Q(approver_2=user)
-        approver_filter = Q(id=user.approver_1.pk) if user.approver_1 else Q()  # User's approver
+        subordinate_filter = Q(id__in=ApproverSubordinate.subordinate_ids(user))
+        approver_filter = Q(id=user.approver_1_id) if user.approver_1_id else Q()  # User's approver
 
         team_members = User.objects.filter(
             team_filters | subordinate_filter | approver_filter
-        ).filter(is_active=True).distinct()
+        ).filter(is_active=True)
 
         # Filter by specific member IDs if provided
         if member_ids:
@@ -117,20 +118,7 @@ class TeamCalendarView(generics.GenericAPIView):
             })
 
         # Get holidays for the month (supports multi-day holidays)
-        holidays_query = PublicHoliday.objects.filter(
-            is_active=True,
-            status=PublicHoliday.Status.PUBLISHED,
-        ).filter(
-            Q(start_date__lte=end_day) & Q(end_date__gte=start_day)
-        ).filter(
-            (Q(entity=user.entity) | Q(entity__isnull=True)) & holiday_country_scope_for_user(user)
-        )
-
-        # Filter by location if applicable
-        if user.location:
-            holidays_query = holidays_query.filter(
-                Q(location=user.location) | Q(location__isnull=True)
-            )
+        holidays_query = get_holidays_for_user(user, start_day, end_day)
 
         holidays_data = [
             {
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class OrganizationsConfig(AppConfig):
     name = 'organizations'
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import organizations.signals
@@ -0,0 +1,156 @@
+"""
+Organization tree (entities -> locations -> departments -> active shifts).
+
+The whole tree is built with a fixed number of prefetch queries and kept in
+the default cache per tenant scope: HR users see their own entity, everyone
+else the full tree. The entity, location and department list endpoints read
+from the same cached structure. Any Entity/Location/Department/WorkShift
+save or delete (organizations.signals) and the bulk paths in services and
+resources bump the namespace version, which orphans every cached tree.
+"""
+from django.core.cache import cache
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+from users.models import User
+from .models import Department, Entity, Location, WorkShift
+
+ORG_TREE_NAMESPACE = 'org-tree'
+ORG_TREE_TIMEOUT = 60 * 60
+
+_created_at_field = serializers.DateTimeField()
+
+
+def invalidate_org_tree():
+    """Drop every cached org tree; called on any org or shift mutation."""
+    from core.cache import bump_cache_namespace
+
+    bump_cache_namespace(ORG_TREE_NAMESPACE)
+
+
+def org_tree_scope(user):
+    """Tenant scope for ``user``: HR is limited to their entity, others see all."""
+    if user.role == User.Role.HR:
+        return user.entity_id
+    return None
+
+
+def _org_tree_cache_key(scope):
+    from core.cache import cache_namespace_version
+
+    version = cache_namespace_version(ORG_TREE_NAMESPACE)
+    return f"{ORG_TREE_NAMESPACE}:{version}:{scope or 'all'}"
+
+
+def _format_time(value):
+    return value.strftime('%H:%M') if value else None
+
+
+def _shift_node(shift):
+    return {
+        'id': str(shift.id),
+        'name': shift.name,
+        'start_time': _format_time(shift.start_time),
+        'end_time': _format_time(shift.end_time),
+        'break_start_time': _format_time(shift.break_start_time),
+        'break_end_time': _format_time(shift.break_end_time),
+        'includes_weekends': shift.includes_weekends,
+    }
+
+
+def _department_node(department, entity, location):
+    return {
+        'id': str(department.id),
+        'entity': str(entity.id),
+        'entity_name': entity.entity_name,
+        'location': str(location.id) if location else None,
+        'location_name': location.location_name if location else None,
+        'department_name': department.department_name,
+        'code': department.code,
+        'holiday_requires_leave': department.holiday_requires_leave,
+        'work_shifts': [_shift_node(shift) for shift in department.work_shifts.all()],
+        'is_active': department.is_active,
+    }
+
+
+def _location_node(location, departments):
+    return {
+        'id': str(location.id),
+        'entity': str(location.entity_id),
+        'location_name': location.location_name,
+        'city': location.city,
+        'country': location.country,
+        'is_active': location.is_active,
+        'departments': departments,
+    }
+
+
+def _entity_node(entity):
+    locations = {location.id: location for location in entity.locations.all()}
+    by_location = {location_id: [] for location_id in locations}
+    entity_wide = []
+    for department in entity.departments.all():
+        if department.location_id is None:
+            entity_wide.append(_department_node(department, entity, None))
+        elif department.location_id in by_location:
+            by_location[department.location_id].append(
+                _department_node(department, entity, locations[department.location_id])
+            )
+    return {
+        'id': str(entity.id),
+        'entity_name': entity.entity_name,
+        'code': entity.code,
+        'is_active': entity.is_active,
+        'created_at': _created_at_field.to_representation(entity.created_at),
+        'locations_count': len(locations),
+        'departments_count': len(entity_wide) + sum(map(len, by_location.values())),
+        'departments': entity_wide,
+        'locations': [
+            _location_node(location, by_location[location_id])
+            for location_id, location in locations.items()
+        ],
+    }
+
+
+def build_org_tree(scope=None):
+    """Query the active org tree (optionally one entity) in four queries."""
+    entities = Entity.objects.filter(is_active=True).order_by('entity_name').prefetch_related(
+        Prefetch(
+            'locations',
+            queryset=Location.objects.filter(is_active=True).order_by('location_name'),
+        ),
+        Prefetch(
+            'departments',
+            queryset=Department.objects.filter(is_active=True).order_by('department_name'),
+        ),
+        Prefetch(
+            'departments__work_shifts',
+            queryset=WorkShift.objects.filter(is_active=True).order_by('start_time', 'name'),
+        ),
+    )
+    if scope:
+        entities = entities.filter(id=scope)
+    return [_entity_node(entity) for entity in entities]
+
+
+def get_org_tree(scope=None):
+    """Cached build_org_tree for ``scope`` (an entity id, or None for all)."""
+    cache_key = _org_tree_cache_key(scope)
+    tree = cache.get(cache_key)
+    if tree is None:
+        tree = build_org_tree(scope)
+        cache.set(cache_key, tree, ORG_TREE_TIMEOUT)
+    return tree
+
+
+def iter_locations(tree):
+    for entity in tree:
+        yield from entity['locations']
+
+
+def iter_departments(tree):
+    """Every department in tree order: entity-wide first, then per location."""
+    for entity in tree:
+        yield from entity['departments']
+        for location in entity['locations']:
+            yield from location['departments']
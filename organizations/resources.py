@@ -2,9 +2,13 @@
 Django import-export resources for Organization models.
 Supports CSV/XLSX import with flat unified format (Entity + Location + Department in one row).
 """
+from django.db import transaction
+from django.db.models import Q
 from import_export import resources, fields
 from import_export.widgets import ForeignKeyWidget, BooleanWidget
+from users.utils import invalidate_user_profiles
 from .models import Entity, Location, Department
+from .org_tree import invalidate_org_tree
 
 
 class DefaultTrueBooleanWidget(BooleanWidget):
@@ -105,13 +109,21 @@ class FlatUnifiedOrganizationResource:
     Import resource for flat CSV/XLSX format with Entity + Location + Department in one row.
     Format: Entity_Name, Entity_Code, Location_Name, Location_City, Location_State, Location_Country,
             Location_Timezone, Department_Name, Department_Code
+
+    Imports run in two phases so the query count does not depend on file size:
+    rows are parsed and deduplicated into entity/location/department sets and
+    diffed against one prefetch per model, then new rows and department
+    updates are written with bulk_create in a single transaction.
     """
 
+    BATCH_SIZE = 500
+
     @classmethod
     def import_flat_data(cls, dataset, dry_run=False):
         """
         Process flat CSV/XLSX data with Entity, Location, Department in each row.
-        Returns dict with results for each model type.
+        Returns dict with results for each model type. With dry_run the same
+        counts are reported but nothing is written.
         """
         results = {
             'entities': {'created': 0, 'updated': 0, 'errors': []},
@@ -119,104 +131,175 @@ class FlatUnifiedOrganizationResource:
             'departments': {'created': 0, 'updated': 0, 'errors': []},
         }
 
-        # Track created entities to avoid duplicates
-        entities_cache = {}
-        locations_cache = {}
+        entities, locations, departments = cls._parse_rows(dataset, results)
+        plan = cls._plan(entities, locations, departments, results)
 
-        # Process each row
-        for row in dataset.dict:
-            try:
-                # Skip completely empty rows (trailing newlines in CSV)
-                if not row or all(v is None or str(v).strip() == '' for v in row.values()):
-                    continue
-
-                # Extract Entity data - handle None values from empty rows
-                entity_name = (row.get('Entity_Name') or '').strip()
-                entity_code = (row.get('Entity_Code') or '').strip()
-
-                if not entity_name or not entity_code:
-                    results['entities']['errors'].append('Missing Entity_Name or Entity_Code')
-                    continue
-
-                # Create or get Entity
-                if entity_code not in entities_cache:
-                    entity, created = Entity.objects.get_or_create(
-                        code=entity_code,
-                        defaults={'entity_name': entity_name, 'is_active': True}
-                    )
-                    entities_cache[entity_code] = entity
-                    if not dry_run:
-                        if created:
-                            results['entities']['created'] += 1
-                        else:
-                            results['entities']['updated'] += 1
-                else:
-                    entity = entities_cache[entity_code]
-
-                # Extract Location data - handle None values
-                location_name = (row.get('Location_Name') or '').strip()
-                location_city = (row.get('Location_City') or '').strip()
-                location_state = (row.get('Location_State') or '').strip()
-                location_country = (row.get('Location_Country') or '').strip()
-                location_timezone = (row.get('Location_Timezone') or '').strip()
-
-                if not location_name or not location_city or not location_country:
-                    results['locations']['errors'].append(f'Missing required location fields for row: {row}')
-                    continue
-
-                # Create unique key for location
-                location_key = f"{entity_code}:{location_name}"
-
-                if location_key not in locations_cache:
-                    location, created = Location.objects.get_or_create(
-                        entity=entity,
-                        location_name=location_name,
-                        defaults={
-                            'city': location_city,
-                            'state': location_state,
-                            'country': location_country,
-                            'timezone': location_timezone,
-                            'is_active': True
-                        }
-                    )
-                    locations_cache[location_key] = location
-                    if not dry_run:
-                        if created:
-                            results['locations']['created'] += 1
-                        else:
-                            results['locations']['updated'] += 1
-                else:
-                    location = locations_cache[location_key]
-
-                # Extract Department data - handle None values
-                department_name = (row.get('Department_Name') or '').strip()
-                department_code = (row.get('Department_Code') or '').strip()
-
-                if not department_name or not department_code:
-                    results['departments']['errors'].append(f'Missing Department_Name or Department_Code for row: {row}')
-                    continue
-
-                # Create Department with location
-                department, created = Department.objects.update_or_create(
-                    entity=entity,
-                    location=location,
-                    code=department_code,
-                    defaults={
-                        'department_name': department_name,
-                        'is_active': True
-                    }
-                )
-                if not dry_run:
-                    if created:
-                        results['departments']['created'] += 1
-                    else:
-                        results['departments']['updated'] += 1
+        results['entities']['created'] = len(plan['new_entities'])
+        results['entities']['updated'] = plan['existing_entities']
+        results['locations']['created'] = len(plan['new_locations'])
+        results['locations']['updated'] = plan['existing_locations']
+        results['departments']['created'] = len(plan['departments']) - plan['existing_departments']
+        results['departments']['updated'] = plan['existing_departments']
 
+        if not dry_run:
+            try:
+                cls._apply(plan)
             except Exception as e:
-                results['entities']['errors'].append(f"Row processing error: {str(e)}")
+                results['entities']['errors'].append(f"Import failed, nothing was saved: {str(e)}")
+                for model_type in results:
+                    results[model_type]['created'] = results[model_type]['updated'] = 0
 
         return results
 
+    @staticmethod
+    def _parse_rows(dataset, results):
+        """Phase 1a: validate rows and dedupe them into entity/location/department dicts (first row wins)."""
+        entities = {}
+        locations = {}
+        departments = {}
+
+        for row in dataset.dict:
+            # Skip completely empty rows (trailing newlines in CSV)
+            if not row or all(v is None or str(v).strip() == '' for v in row.values()):
+                continue
+
+            # Extract Entity data - handle None values from empty rows
+            entity_name = str(row.get('Entity_Name') or '').strip()
+            entity_code = str(row.get('Entity_Code') or '').strip()
+
+            if not entity_name or not entity_code:
+                results['entities']['errors'].append('Missing Entity_Name or Entity_Code')
+                continue
+            entities.setdefault(entity_code, entity_name)
+
+            # Extract Location data - handle None values
+            location_name = str(row.get('Location_Name') or '').strip()
+            location_city = str(row.get('Location_City') or '').strip()
+            location_country = str(row.get('Location_Country') or '').strip()
+
+            if not location_name or not location_city or not location_country:
+                results['locations']['errors'].append(f'Missing required location fields for row: {row}')
+                continue
+            locations.setdefault((entity_code, location_name), {
+                'city': location_city,
+                'state': str(row.get('Location_State') or '').strip(),
+                'country': location_country,
+                'timezone': str(row.get('Location_Timezone') or '').strip(),
+            })
+
+            # Extract Department data - handle None values
+            department_name = str(row.get('Department_Name') or '').strip()
+            department_code = str(row.get('Department_Code') or '').strip()
+
+            if not department_name or not department_code:
+                results['departments']['errors'].append(f'Missing Department_Name or Department_Code for row: {row}')
+                continue
+            # Later rows win for departments (update_or_create semantics)
+            departments[(entity_code, location_name, department_code)] = department_name
+
+        return entities, locations, departments
+
+    @staticmethod
+    def _plan(entities, locations, departments, results):
+        """Phase 1b: diff the parsed sets against one prefetch per model."""
+        existing_entities = {}
+        names_taken = {}
+        for entity in Entity.objects.filter(
+            Q(code__in=entities) | Q(entity_name__in=set(entities.values()))
+        ):
+            names_taken[entity.entity_name] = entity.code
+            if entity.code in entities:
+                existing_entities[entity.code] = entity
+
+        entity_objects = dict(existing_entities)
+        new_entities = []
+        for code, name in entities.items():
+            if code in entity_objects:
+                continue
+            if names_taken.get(name, code) != code:
+                results['entities']['errors'].append(
+                    f"Entity {code}: name '{name}' is already used by entity '{names_taken[name]}'"
+                )
+                continue
+            entity = Entity(code=code, entity_name=name, is_active=True)
+            entity_objects[code] = entity
+            new_entities.append(entity)
+
+        existing_locations = {
+            (location.entity.code, location.location_name): location
+            for location in Location.objects.filter(
+                entity__in=existing_entities.values(),
+            ).select_related('entity')
+            if (location.entity.code, location.location_name) in locations
+        }
+        location_objects = dict(existing_locations)
+        new_locations = []
+        for (entity_code, location_name), values in locations.items():
+            if (entity_code, location_name) in location_objects:
+                continue
+            if entity_code not in entity_objects:
+                results['locations']['errors'].append(
+                    f"Location {location_name}: Entity '{entity_code}' was not imported"
+                )
+                continue
+            location = Location(
+                entity=entity_objects[entity_code], location_name=location_name, is_active=True, **values
+            )
+            location_objects[(entity_code, location_name)] = location
+            new_locations.append(location)
+
+        existing_departments = {
+            (department.entity.code, department.location.location_name, department.code): department
+            for department in Department.objects.filter(
+                location__in=existing_locations.values(),
+            ).select_related('entity', 'location')
+        }
+        department_objects = []
+        existing_department_count = 0
+        for (entity_code, location_name, code), name in departments.items():
+            location = location_objects.get((entity_code, location_name))
+            if location is None:
+                results['departments']['errors'].append(
+                    f"Department {code}: Location '{location_name}' was not imported"
+                )
+                continue
+            existing = existing_departments.get((entity_code, location_name, code))
+            department = Department(
+                entity=location.entity, location=location, code=code,
+                department_name=name, is_active=True,
+            )
+            if existing is not None:
+                # Keep the existing primary key so the upsert updates that row in place
+                department.id = existing.id
+                existing_department_count += 1
+            department_objects.append(department)
+
+        return {
+            'new_entities': new_entities,
+            'existing_entities': len(existing_entities),
+            'new_locations': new_locations,
+            'existing_locations': len(existing_locations),
+            'departments': department_objects,
+            'existing_departments': existing_department_count,
+        }
+
+    @classmethod
+    def _apply(cls, plan):
+        """Phase 2: write the plan in one transaction."""
+        with transaction.atomic():
+            Entity.objects.bulk_create(plan['new_entities'], batch_size=cls.BATCH_SIZE)
+            Location.objects.bulk_create(plan['new_locations'], batch_size=cls.BATCH_SIZE)
+            Department.objects.bulk_create(
+                plan['departments'],
+                batch_size=cls.BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['entity', 'location', 'code'],
+                update_fields=['department_name', 'is_active', 'updated_at'],
+            )
+        if plan['departments'] or plan['new_locations'] or plan['new_entities']:
+            invalidate_user_profiles()
+            invalidate_org_tree()
+
 
 # Legacy support for old unified format
 class UnifiedOrganizationResource(resources.ModelResource):
@@ -1,15 +1,68 @@
 """
 Organization business logic and service functions
 """
+import uuid
+from dataclasses import dataclass, field
+
 from django.db import transaction
-from organizations.models import Entity, Location, Department
+from django.db.models import Case, Count, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from leaves.models import HolidayCalendar, LeaveRequest
+from organizations.models import Entity, Location, Department, WorkShift
 from users.models import User
+from users.utils import invalidate_user_profiles, invalidate_user_profiles_for
+from .org_tree import invalidate_org_tree
+
+# WorkShift columns copied to every member of a management group
+SHIFT_GROUP_FIELDS = (
+    'name',
+    'start_time',
+    'end_time',
+    'break_start_time',
+    'break_end_time',
+    'pattern_type',
+    'cycle_days',
+    'includes_weekends',
+)
+
+
+def _entity_count(queryset, entity_path):
+    """Correlated ``COUNT`` of ``queryset`` rows belonging to the outer entity (0 when none)."""
+    counts = queryset.filter(
+        **{entity_path: OuterRef('pk')}
+    ).order_by().values(entity_path).annotate(total=Count('pk')).values('total')[:1]
+    return Coalesce(Subquery(counts), 0)
+
+
+def _delete_impact_counts(today):
+    return {
+        'locations_count': _entity_count(Location.objects.filter(is_active=True), 'entity'),
+        'departments_count': _entity_count(Department.objects.filter(is_active=True), 'entity'),
+        'users_count': _entity_count(User.objects.filter(is_active=True), 'entity'),
+        'shifts_count': _entity_count(WorkShift.objects.filter(is_active=True), 'department__entity'),
+        'pending_leave_count': _entity_count(
+            LeaveRequest.objects.filter(status=LeaveRequest.Status.PENDING, user__is_active=True),
+            'user__entity',
+        ),
+        'approved_leave_count': _entity_count(
+            LeaveRequest.objects.filter(
+                status=LeaveRequest.Status.APPROVED, user__is_active=True, end_date__gte=today,
+            ),
+            'user__entity',
+        ),
+        'calendars_count': _entity_count(
+            HolidayCalendar.objects.exclude(status=HolidayCalendar.Status.ARCHIVED), 'entity'
+        ),
+    }
 
 
 def get_entity_delete_impact(entity_id):
     """
     Calculate impact of soft-deleting an Entity
-    Returns counts of Locations and Departments that will be deactivated
+    Returns counts of Locations, Departments and Users that will be deactivated,
+    plus the shifts, pending/upcoming approved leave and holiday calendars
+    left attached to the entity. All counts come from one aggregated query.
 
     Args:
         entity_id: UUID of the entity
@@ -17,29 +70,25 @@ def get_entity_delete_impact(entity_id):
     Returns:
         dict with impact counts or None if entity not found
     """
-    try:
-        entity = Entity.objects.get(id=entity_id, is_active=True)
-    except Entity.DoesNotExist:
+    counts = _delete_impact_counts(timezone.localdate())
+    impact = Entity.objects.filter(id=entity_id, is_active=True).annotate(
+        **counts
+    ).values('id', 'entity_name', *counts).first()
+    if impact is None:
         return None
 
-    locations_count = entity.locations.filter(is_active=True).count()
-    departments_count = entity.departments.filter(is_active=True).count()
-    users_count = User.objects.filter(entity=entity, is_active=True).count()
-
+    impact['entity_id'] = str(impact.pop('id'))
     return {
-        'entity_id': str(entity.id),
-        'entity_name': entity.entity_name,
-        'locations_count': locations_count,
-        'departments_count': departments_count,
-        'users_count': users_count,
-        'total_impact': locations_count + departments_count + users_count
+        **impact,
+        'total_impact': impact['locations_count'] + impact['departments_count'] + impact['users_count'],
     }
 
 
 def soft_delete_entity_cascade(entity_id):
     """
-    Soft-delete Entity and cascade to all Locations and Departments
-    Sets is_active=False for Entity and all related records in a transaction
+    Soft-delete Entity and cascade to all Locations, Departments and Users
+    Sets is_active=False with one UPDATE per table in a single transaction;
+    the affected counts are the UPDATE row counts.
 
     Args:
         entity_id: UUID of the entity to soft-delete
@@ -50,30 +99,196 @@ def soft_delete_entity_cascade(entity_id):
     Raises:
         Entity.DoesNotExist: if entity not found or already inactive
     """
+    now = timezone.now()
     with transaction.atomic():
-        entity = Entity.objects.get(id=entity_id, is_active=True)
-
-        # Count before update
-        locations_count = entity.locations.filter(is_active=True).count()
-        departments_count = entity.departments.filter(is_active=True).count()
-        users_count = User.objects.filter(entity=entity, is_active=True).count()
+        # Lock the entity so concurrent deletes cannot both cascade
+        entity = Entity.objects.select_for_update().only('id', 'entity_name').get(
+            id=entity_id, is_active=True
+        )
 
         # Cascade soft-delete to children
-        entity.locations.filter(is_active=True).update(is_active=False)
-        entity.departments.filter(is_active=True).update(is_active=False)
+        locations_count = Location.objects.filter(entity_id=entity.id, is_active=True).update(
+            is_active=False, updated_at=now
+        )
+        departments_count = Department.objects.filter(entity_id=entity.id, is_active=True).update(
+            is_active=False, updated_at=now
+        )
 
         # Deactivate all users under this entity
-        User.objects.filter(entity=entity, is_active=True).update(is_active=False)
+        users_count = User.objects.filter(entity_id=entity.id, is_active=True).update(is_active=False)
 
         # Soft-delete Entity last
-        entity.is_active = False
-        entity.save()
-
-        return {
-            'entity_id': str(entity.id),
-            'entity_name': entity.entity_name,
-            'locations_deactivated': locations_count,
-            'departments_deactivated': departments_count,
-            'users_deactivated': users_count,
-            'success': True
-        }
+        Entity.objects.filter(id=entity.id).update(is_active=False, updated_at=now)
+
+        invalidate_user_profiles()
+        invalidate_org_tree()
+
+    return {
+        'entity_id': str(entity.id),
+        'entity_name': entity.entity_name,
+        'locations_deactivated': locations_count,
+        'departments_deactivated': departments_count,
+        'users_deactivated': users_count,
+        'success': True
+    }
+
+
+@dataclass
+class ShiftGroupChanges:
+    """Outcome of creating or syncing a work-shift management group."""
+    created: list = field(default_factory=list)
+    updated: list = field(default_factory=list)
+    deactivated: list = field(default_factory=list)
+    skipped: list = field(default_factory=list)
+    assigned_user_ids: set = field(default_factory=set)
+    unassigned_user_ids: set = field(default_factory=set)
+    rescheduled_user_ids: set = field(default_factory=set)
+
+    @property
+    def members(self):
+        """Active group members: retained ones first, then newly created."""
+        return self.updated + self.created
+
+    @property
+    def changed_user_ids(self):
+        """Users whose working schedule is different; only their cached profiles are dropped."""
+        return self.assigned_user_ids | self.unassigned_user_ids | self.rescheduled_user_ids
+
+
+def _validate_shift_values(shift_values):
+    """Run WorkShift model validation once for values shared by a whole group."""
+    WorkShift(**shift_values).full_clean(
+        exclude=['department'], validate_unique=False, validate_constraints=False,
+    )
+
+
+def _build_members(departments, shift_values, management_group_id):
+    return [
+        WorkShift(
+            department=department,
+            management_group_id=management_group_id,
+            **{**shift_values, 'cycle_days': list(shift_values['cycle_days'])},
+        )
+        for department in departments
+    ]
+
+
+def _assign_unassigned_users(shifts):
+    """
+    Give users without a shift the group member of their department.
+
+    One SELECT for the affected ids and one UPDATE ... WHERE department_id IN
+    (...) for every department. Rotating shifts only take users that have a
+    cycle start date. Returns the ids of assigned users.
+    """
+    if not shifts:
+        return set()
+    users = User.objects.filter(
+        department_id__in=[shift.department_id for shift in shifts],
+        work_shift__isnull=True,
+    )
+    if shifts[0].pattern_type == WorkShift.PatternType.ROTATING_CYCLE:
+        users = users.filter(shift_cycle_start_date__isnull=False)
+    user_ids = set(users.select_for_update().values_list('id', flat=True))
+    if user_ids:
+        users.update(work_shift_id=Case(
+            *[When(department_id=shift.department_id, then=Value(shift.id)) for shift in shifts],
+        ))
+    return user_ids
+
+
+def create_shift_group(departments, shift_values):
+    """
+    Create one work shift per department under a new management group.
+
+    Departments that already have a shift with this name are skipped. New
+    shifts are bulk-inserted and unassigned users in their departments are
+    reassigned with a single UPDATE.
+    """
+    _validate_shift_values(shift_values)
+    changes = ShiftGroupChanges()
+    with transaction.atomic():
+        taken = set(
+            WorkShift.objects.filter(
+                department_id__in=[department.id for department in departments],
+                name=shift_values['name'],
+            ).values_list('department_id', flat=True)
+        )
+        changes.skipped = [department for department in departments if department.id in taken]
+        changes.created = WorkShift.objects.bulk_create(_build_members(
+            [department for department in departments if department.id not in taken],
+            shift_values,
+            uuid.uuid4(),
+        ))
+        changes.assigned_user_ids = _assign_unassigned_users(changes.created)
+    invalidate_user_profiles_for(changes.changed_user_ids)
+    invalidate_org_tree()
+    return changes
+
+
+def sync_shift_group(members, departments, shift_values, management_group_id):
+    """
+    Make a management group cover exactly ``departments`` with ``shift_values``.
+
+    ``members`` are the locked current group rows. Members outside the
+    desired departments are deactivated and their users unassigned, retained
+    members are bulk-updated, missing departments get new members, and
+    unassigned users across the group are picked up in one UPDATE. Must run
+    inside a transaction.
+    """
+    _validate_shift_values(shift_values)
+    department_ids = {department.id for department in departments}
+    changes = ShiftGroupChanges()
+    for member in members:
+        if member.department_id in department_ids:
+            changes.updated.append(member)
+        else:
+            changes.deactivated.append(member)
+
+    if changes.deactivated:
+        removed_ids = [member.id for member in changes.deactivated]
+        assigned = User.objects.filter(work_shift_id__in=removed_ids)
+        changes.unassigned_user_ids = set(assigned.values_list('id', flat=True))
+        if changes.unassigned_user_ids:
+            assigned.update(work_shift=None)
+        WorkShift.objects.filter(id__in=removed_ids).update(is_active=False)
+
+    rescheduled = [
+        member.id for member in changes.updated
+        if any(getattr(member, name) != shift_values[name] for name in SHIFT_GROUP_FIELDS)
+    ]
+    if rescheduled:
+        changes.rescheduled_user_ids = set(
+            User.objects.filter(work_shift_id__in=rescheduled).values_list('id', flat=True)
+        )
+    for member in changes.updated:
+        member.management_group_id = management_group_id
+        for name, value in shift_values.items():
+            setattr(member, name, value)
+    if changes.updated:
+        WorkShift.objects.bulk_update(changes.updated, ['management_group_id', *SHIFT_GROUP_FIELDS])
+
+    existing_department_ids = {member.department_id for member in members}
+    changes.created = WorkShift.objects.bulk_create(_build_members(
+        [department for department in departments if department.id not in existing_department_ids],
+        shift_values,
+        management_group_id,
+    ))
+    changes.assigned_user_ids = _assign_unassigned_users(changes.members)
+    invalidate_user_profiles_for(changes.changed_user_ids)
+    invalidate_org_tree()
+    return changes
+
+
+def deactivate_shift_group(group):
+    """
+    Soft-delete every member of a management group in one locked UPDATE.
+
+    The queryset update sends no signals, so the org tree and cached user
+    profiles are invalidated here. Returns the number of deactivated shifts.
+    """
+    with transaction.atomic():
+        deactivated = group.select_for_update().update(is_active=False)
+        invalidate_user_profiles()
+        invalidate_org_tree()
+    return deactivated
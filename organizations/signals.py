@@ -0,0 +1,21 @@
+"""
+Organization signals: org tree cache invalidation.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Department, Entity, Location, WorkShift
+from .org_tree import invalidate_org_tree
+
+
+@receiver(post_save, sender=Entity)
+@receiver(post_save, sender=Location)
+@receiver(post_save, sender=Department)
+@receiver(post_save, sender=WorkShift)
+@receiver(post_delete, sender=Entity)
+@receiver(post_delete, sender=Location)
+@receiver(post_delete, sender=Department)
+@receiver(post_delete, sender=WorkShift)
+def invalidate_org_tree_on_change(sender, **kwargs):
+    """Every org and shift row is part of the cached tree."""
+    invalidate_org_tree()
@@ -224,6 +224,49 @@ class TestEntityDeleteImpact:
         result = get_entity_delete_impact(sample_entity.id)
         assert result is None
 
+    def test_impact_counts_come_from_one_query(self, entity_with_relations):
+        """Shifts, leave and calendars are counted alongside in a single query"""
+        from datetime import time, timedelta
+        from decimal import Decimal
+
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from django.utils import timezone
+
+        from leaves.models import HolidayCalendar, LeaveRequest
+        from organizations.models import WorkShift
+
+        department = entity_with_relations.departments.get()
+        WorkShift.objects.create(department=department, name='Day', start_time=time(9), end_time=time(18))
+        employee = User.objects.create_user(
+            email='impact@test.com', password='test123', entity=entity_with_relations
+        )
+        today = timezone.localdate()
+        for status, start in [
+            ('PENDING', today + timedelta(days=3)),
+            ('APPROVED', today + timedelta(days=7)),
+            ('APPROVED', today - timedelta(days=30)),
+        ]:
+            LeaveRequest.objects.create(
+                user=employee, start_date=start, end_date=start, shift_type='FULL_DAY',
+                total_hours=Decimal('8.00'), status=status,
+            )
+        HolidayCalendar.objects.create(
+            name='Test Corp 2030', country_code='US', year=2030, entity=entity_with_relations
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            result = get_entity_delete_impact(entity_with_relations.id)
+
+        assert len(queries) == 1
+        assert result['entity_id'] == str(entity_with_relations.id)
+        assert result['users_count'] == 1
+        assert result['shifts_count'] == 1
+        assert result['pending_leave_count'] == 1
+        assert result['approved_leave_count'] == 1
+        assert result['calendars_count'] == 1
+        assert result['total_impact'] == 3
+
 
 @pytest.mark.django_db
 class TestSoftDeleteEntityCascade:
@@ -284,6 +327,32 @@ class TestSoftDeleteEntityCascade:
         assert result['locations_deactivated'] == 0  # Already inactive
         assert result['departments_deactivated'] == 1  # Still active
 
+    def test_cascade_uses_set_based_updates(self, db):
+        """Query count should not grow with the number of children"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        def build(code, size):
+            entity = Entity.objects.create(entity_name=f'{code} Corp', code=code)
+            for i in range(size):
+                location = Location.objects.create(
+                    entity=entity, location_name=f'Site {i}', city='City', country='USA', timezone='UTC'
+                )
+                Department.objects.create(entity=entity, location=location, department_name=f'Dept {i}', code=f'D{i}')
+                User.objects.create_user(email=f'{code.lower()}{i}@test.com', password='test123', entity=entity)
+            return entity
+
+        small, large = build('SMALL', 1), build('LARGE', 6)
+        with CaptureQueriesContext(connection) as small_queries:
+            soft_delete_entity_cascade(small.id)
+        with CaptureQueriesContext(connection) as large_queries:
+            result = soft_delete_entity_cascade(large.id)
+
+        assert len(large_queries) == len(small_queries)
+        assert result['users_deactivated'] == 6
+        assert not User.objects.filter(entity=large, is_active=True).exists()
+        assert not Entity.objects.get(id=large.id).is_active
+
     def test_cascade_transaction_rollback(self, entity_with_relations):
         """Should rollback if error occurs"""
         # This tests that transaction.atomic() is working
@@ -0,0 +1,85 @@
+"""Tests for the two-phase flat organization importer."""
+import pytest
+import tablib
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from organizations.models import Department, Entity, Location
+from organizations.resources import FlatUnifiedOrganizationResource
+
+HEADERS = [
+    'Entity_Name', 'Entity_Code', 'Location_Name', 'Location_City', 'Location_State',
+    'Location_Country', 'Location_Timezone', 'Department_Name', 'Department_Code',
+]
+
+
+def org_rows(countries, departments_per_location=3):
+    rows = []
+    for index, country in enumerate(countries):
+        for department in range(departments_per_location):
+            rows.append((
+                f'{country} Company', f'E{index}', f'{country} HQ', f'{country} City', '',
+                country, 'UTC', f'Team {department}', f'T{department}',
+            ))
+    return tablib.Dataset(*rows, headers=HEADERS)
+
+
+def run_import(dataset, dry_run=False):
+    with CaptureQueriesContext(connection) as queries:
+        results = FlatUnifiedOrganizationResource.import_flat_data(dataset, dry_run=dry_run)
+    return results, len(queries)
+
+
+@pytest.mark.django_db
+def test_query_count_is_constant_for_large_files():
+    run_import(org_rows(['Vietnam']))
+    small, small_queries = run_import(org_rows(['Vietnam', 'Laos']))
+    large, large_queries = run_import(
+        org_rows(['Vietnam', 'Laos'] + [f'Country {n}' for n in range(12)], departments_per_location=8)
+    )
+
+    assert large_queries == small_queries
+    assert large['entities'] == {'created': 12, 'updated': 2, 'errors': []}
+    assert large['departments']['created'] == 12 * 8 + 2 * 5
+    assert Department.objects.count() == 14 * 8
+
+
+@pytest.mark.django_db
+def test_dry_run_reports_counts_without_writing():
+    results, _ = run_import(org_rows(['Vietnam', 'Thailand']), dry_run=True)
+
+    assert results['entities']['created'] == 2
+    assert results['locations']['created'] == 2
+    assert results['departments']['created'] == 6
+    assert not Entity.objects.exists()
+
+
+@pytest.mark.django_db
+def test_reimport_updates_departments_in_place():
+    run_import(org_rows(['Vietnam']))
+    department = Department.objects.get(code='T0')
+    Department.objects.filter(pk=department.pk).update(is_active=False)
+    dataset = org_rows(['Vietnam'])
+    dataset.append(('Vietnam Company', 'E0', 'Vietnam HQ', 'Vietnam City', '', 'Vietnam', 'UTC', 'Renamed', 'T0'))
+
+    results, _ = run_import(dataset)
+
+    assert results['entities'] == {'created': 0, 'updated': 1, 'errors': []}
+    assert results['locations'] == {'created': 0, 'updated': 1, 'errors': []}
+    assert results['departments'] == {'created': 0, 'updated': 3, 'errors': []}
+    department.refresh_from_db()
+    assert (department.department_name, department.is_active) == ('Renamed', True)
+    assert Location.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_entity_name_clash_is_reported_and_skipped():
+    Entity.objects.create(entity_name='Vietnam Company', code='OTHER')
+
+    results, _ = run_import(org_rows(['Vietnam']))
+
+    assert results['entities']['errors'] == [
+        "Entity E0: name 'Vietnam Company' is already used by entity 'OTHER'"
+    ]
+    assert results['locations']['errors'] == ["Location Vietnam HQ: Entity 'E0' was not imported"]
+    assert not Department.objects.exists()
@@ -0,0 +1,155 @@
+"""Tests for the cached org tree behind the entity/location/department lists."""
+from datetime import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from organizations.models import Department, Entity, Location, WorkShift
+from organizations.org_tree import build_org_tree
+from organizations.services import create_shift_group
+from users.models import User
+
+
+def make_entity(code, locations=2, departments=2):
+    entity = Entity.objects.create(entity_name=f'{code} Company', code=code)
+    Department.objects.create(entity=entity, department_name='Board', code=f'{code}-BRD')
+    for loc_index in range(locations):
+        location = Location.objects.create(
+            entity=entity,
+            location_name=f'Office {loc_index}',
+            city='Hanoi',
+            country='Vietnam',
+            timezone='Asia/Ho_Chi_Minh',
+        )
+        for dept_index in range(departments):
+            department = Department.objects.create(
+                entity=entity,
+                location=location,
+                department_name=f'Team {dept_index}',
+                code=f'{code}-{loc_index}-{dept_index}',
+            )
+            WorkShift.objects.create(
+                department=department, name='Day', start_time=time(9), end_time=time(18)
+            )
+    return entity
+
+
+@pytest.fixture
+def org(db):
+    entity = make_entity('TREE')
+    admin = User.objects.create_user(
+        email='tree-admin@example.com', password='AdminPass123!', role=User.Role.ADMIN
+    )
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    return client, entity
+
+
+@pytest.mark.django_db
+def test_tree_query_count_does_not_grow_with_org_size():
+    make_entity('SMALL', locations=1, departments=1)
+    with CaptureQueriesContext(connection) as small:
+        build_org_tree()
+
+    for code in ('BIG1', 'BIG2', 'BIG3'):
+        make_entity(code, locations=3, departments=3)
+    with CaptureQueriesContext(connection) as large:
+        tree = build_org_tree()
+
+    assert len(large) == len(small) == 4
+    assert len(tree) == 4
+    big = next(entity for entity in tree if entity['code'] == 'BIG1')
+    assert big['locations_count'] == 3
+    assert big['departments_count'] == 10
+    assert big['locations'][0]['departments'][0]['work_shifts'][0]['start_time'] == '09:00'
+
+
+@pytest.mark.django_db
+def test_list_endpoints_read_from_cached_tree(org):
+    client, entity = org
+    location = entity.locations.order_by('location_name').first()
+
+    tree = client.get('/api/v1/organizations/org-tree/')
+    assert tree.status_code == 200
+    assert [node['code'] for node in tree.data] == ['TREE']
+
+    with CaptureQueriesContext(connection) as queries:
+        entities = client.get('/api/v1/organizations/entities/')
+        locations = client.get('/api/v1/organizations/locations/', {'entity_id': str(entity.id)})
+        departments = client.get('/api/v1/organizations/departments/', {'location_id': str(location.id)})
+    assert not any('"departments"' in query['sql'] for query in queries.captured_queries)
+
+    assert entities.data['count'] == 1
+    assert entities.data['results'][0]['departments_count'] == 5
+    assert 'locations' not in entities.data['results'][0]
+    assert [loc['location_name'] for loc in locations.data] == ['Office 0', 'Office 1']
+    assert [dept['department_name'] for dept in departments.data] == ['Team 0', 'Team 1']
+    assert departments.data[0]['location_name'] == 'Office 0'
+    assert departments.data[0]['work_shifts'][0]['name'] == 'Day'
+
+
+@pytest.mark.django_db
+def test_mutations_invalidate_cached_tree(org):
+    client, entity = org
+    client.get('/api/v1/organizations/org-tree/')
+
+    department = Department.objects.get(location__isnull=True)
+    department.department_name = 'Directors'
+    department.save()
+    response = client.get('/api/v1/organizations/departments/', {'entity_id': str(entity.id)})
+    assert response.data[0]['department_name'] == 'Directors'
+    assert response.data[0]['work_shifts'] == []
+
+    # Bulk shift-group creation bypasses signals and bumps the version itself
+    create_shift_group([department], {
+        'name': 'Early',
+        'pattern_type': WorkShift.PatternType.FIXED_WEEKLY,
+        'start_time': time(7),
+        'end_time': time(15),
+        'break_start_time': None,
+        'break_end_time': None,
+        'includes_weekends': False,
+        'cycle_days': [],
+    })
+    response = client.get('/api/v1/organizations/departments/', {'entity_id': str(entity.id)})
+    assert [shift['name'] for shift in response.data[0]['work_shifts']] == ['Early']
+
+
+@pytest.mark.django_db
+def test_work_shift_delete_invalidates_cached_tree_and_profiles(org):
+    from core.cache import cache_namespace_version
+    from users.utils import PROFILE_CACHE_NAMESPACE
+
+    client, entity = org
+    location = entity.locations.order_by('location_name').first()
+    params = {'location_id': str(location.id)}
+    department = client.get('/api/v1/organizations/departments/', params).data[0]
+    profile_version = cache_namespace_version(PROFILE_CACHE_NAMESPACE)
+
+    response = client.delete(f"/api/v1/organizations/work-shifts/{department['work_shifts'][0]['id']}/")
+
+    assert response.status_code == 204
+    refreshed = client.get('/api/v1/organizations/departments/', params).data[0]
+    assert refreshed['work_shifts'] == []
+    assert cache_namespace_version(PROFILE_CACHE_NAMESPACE) != profile_version
+
+
+@pytest.mark.django_db
+def test_hr_tree_is_scoped_to_their_entity(org):
+    _, entity = org
+    make_entity('OTHER', locations=1, departments=1)
+    hr = User.objects.create_user(
+        email='tree-hr@example.com', password='HrPass123!', role=User.Role.HR, entity=entity
+    )
+    client = APIClient()
+    client.force_authenticate(user=hr)
+
+    tree = client.get('/api/v1/organizations/org-tree/')
+    departments = client.get('/api/v1/organizations/departments/')
+    entities = client.get('/api/v1/organizations/entities/')
+
+    assert [node['code'] for node in tree.data] == ['TREE']
+    assert {dept['entity'] for dept in departments.data} == {str(entity.id)}
+    assert entities.data['count'] == 2
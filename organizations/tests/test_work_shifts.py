@@ -1,7 +1,12 @@
+from datetime import time
+
 import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
 from organizations.models import Department, Entity, Location, WorkShift
+from organizations.services import create_shift_group, sync_shift_group
 from users.models import User
 
 
@@ -60,6 +65,23 @@ def test_create_and_list_work_shift(work_shift_context):
     assert response.data[0]['includes_weekends'] is True
 
 
+@pytest.mark.django_db
+def test_duplicate_work_shift_name_in_department_is_rejected(work_shift_context):
+    client, department = work_shift_context
+    WorkShift.objects.create(department=department, name='Early', start_time=time(6), end_time=time(14))
+
+    response = client.post('/api/v1/organizations/work-shifts/', {
+        'department_id': str(department.id),
+        'name': 'Early',
+        'start_time': '06:00',
+        'end_time': '14:00',
+    }, format='json', secure=True)
+
+    assert response.status_code == 400
+    assert response.data == {'name': ['A work shift with this name already exists in the department.']}
+    assert WorkShift.objects.filter(department=department, name='Early').count() == 1
+
+
 @pytest.mark.django_db
 def test_create_and_list_work_shift_with_break(work_shift_context):
     client, department = work_shift_context
@@ -836,3 +858,101 @@ def test_admin_can_manage_work_shifts_across_entities(work_shift_context):
         department=other_department,
         name='Admin Cross Entity Shift',
     ).exists()
+
+
+def _make_departments(entity, count, prefix):
+    location = entity.locations.first()
+    departments = []
+    for index in range(count):
+        department = Department.objects.create(
+            entity=entity,
+            location=location,
+            department_name=f'{prefix} {index}',
+            code=f'{prefix[:3].upper()}{index}',
+        )
+        User.objects.create_user(
+            email=f'{prefix.lower()}-{index}@example.com',
+            password='UserPass123!',
+            entity=entity,
+            location=location,
+            department=department,
+        )
+        departments.append(department)
+    return departments
+
+
+def _shift_values(name, start):
+    return {
+        'name': name,
+        'start_time': start,
+        'end_time': time(17, 0),
+        'break_start_time': None,
+        'break_end_time': None,
+        'pattern_type': WorkShift.PatternType.FIXED_WEEKLY,
+        'cycle_days': [],
+        'includes_weekends': False,
+    }
+
+
+@pytest.mark.django_db
+def test_shift_group_queries_do_not_grow_with_departments(work_shift_context):
+    _, department = work_shift_context
+    small = _make_departments(department.entity, 2, 'Small')
+    large = _make_departments(department.entity, 6, 'Large')
+
+    with CaptureQueriesContext(connection) as small_queries:
+        create_shift_group(small, _shift_values('Rollout', time(8, 0)))
+    with CaptureQueriesContext(connection) as large_queries:
+        changes = create_shift_group(large, _shift_values('Rollout', time(8, 0)))
+
+    assert len(large_queries) <= len(small_queries)
+    assert len(changes.created) == 6
+    assert changes.changed_user_ids == set(
+        User.objects.filter(department__in=large).values_list('id', flat=True)
+    )
+
+
+@pytest.mark.django_db
+def test_sync_shift_group_reports_users_whose_schedule_changed(work_shift_context):
+    _, department = work_shift_context
+    kept, dropped, other = _make_departments(department.entity, 3, 'Sync')
+    group = create_shift_group([kept, dropped], _shift_values('Sync', time(8, 0)))
+    kept_user = User.objects.get(department=kept)
+    dropped_user = User.objects.get(department=dropped)
+    other_user = User.objects.get(department=other)
+
+    with transaction.atomic():
+        members = list(WorkShift.objects.filter(id__in=[shift.id for shift in group.created]))
+        changes = sync_shift_group(
+            members, [kept, other], _shift_values('Sync', time(9, 0)), members[0].management_group_id,
+        )
+
+    assert changes.rescheduled_user_ids == {kept_user.id}
+    assert changes.unassigned_user_ids == {dropped_user.id}
+    assert changes.assigned_user_ids == {other_user.id}
+    assert WorkShift.objects.get(department=kept, name='Sync').start_time == time(9, 0)
+    assert not WorkShift.objects.get(department=dropped, name='Sync').is_active
+    other_user.refresh_from_db()
+    assert other_user.work_shift.department == other
+
+
+@pytest.mark.django_db
+def test_shift_group_changes_drop_only_affected_profiles(work_shift_context):
+    from django.core.cache import cache
+
+    from users.utils import _profile_cache_key, build_user_response
+
+    _, department = work_shift_context
+    kept, dropped, other = _make_departments(department.entity, 3, 'Cached')
+    group = create_shift_group([kept, dropped], _shift_values('Cached', time(8, 0)))
+    users = {dept: User.objects.get(department=dept) for dept in (kept, dropped, other)}
+    bystander = User.objects.get(role=User.Role.ADMIN)
+    for user in [*users.values(), bystander]:
+        build_user_response(user)
+
+    with transaction.atomic():
+        members = list(WorkShift.objects.filter(id__in=[shift.id for shift in group.created]))
+        sync_shift_group(members, [kept, other], _shift_values('Cached', time(9, 0)), members[0].management_group_id)
+
+    assert all(cache.get(_profile_cache_key(user)) is None for user in users.values())
+    assert cache.get(_profile_cache_key(bystander)) is not None
@@ -3,6 +3,7 @@ Organizations API URLs
 """
 from django.urls import path
 from .views import (
+    OrgTreeView,
     EntityListView,
     LocationListView,
     DepartmentListView,
@@ -15,6 +16,9 @@ from .views import (
 )
 
 urlpatterns = [
+    # Full tree: entities -> locations -> departments -> active shifts
+    path('org-tree/', OrgTreeView.as_view(), name='org_tree'),
+
     # Entities - List
     path('entities/', EntityListView.as_view(), name='entity_list'),
 
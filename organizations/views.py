@@ -13,14 +13,19 @@ from rest_framework.views import APIView
 from users.permissions import IsHRAdmin
 from users.models import User
 from .models import Entity, Location, Department, WorkShift
+from .org_tree import get_org_tree, iter_departments, iter_locations, org_tree_scope
 from .serializers import (
     EntitySerializer,
     EntityCreateSerializer,
     EntityUpdateSerializer
 )
 from .services import (
+    SHIFT_GROUP_FIELDS,
+    create_shift_group,
+    deactivate_shift_group,
     get_entity_delete_impact,
-    soft_delete_entity_cascade
+    soft_delete_entity_cascade,
+    sync_shift_group,
 )
 
 
@@ -82,37 +87,16 @@ def _department_queryset(user):
     return departments
 
 
-def _assign_shift_to_unassigned_users(shift):
-    users = User.objects.filter(
-        department=shift.department,
-        work_shift__isnull=True,
-    )
-    if shift.pattern_type == WorkShift.PatternType.ROTATING_CYCLE:
-        users = users.filter(shift_cycle_start_date__isnull=False)
-    return users.update(work_shift=shift)
-
-
-def _create_shifts_for_departments(departments, shift_values):
-    created = 0
-    assigned_users = 0
-    skipped = []
-    management_group_id = uuid.uuid4()
-    with transaction.atomic():
-        for department in departments:
-            if WorkShift.objects.filter(
-                department=department,
-                name=shift_values['name'],
-            ).exists():
-                skipped.append(department.department_name)
-                continue
-            shift = WorkShift.objects.create(
-                department=department,
-                management_group_id=management_group_id,
-                **shift_values,
-            )
-            assigned_users += _assign_shift_to_unassigned_users(shift)
-            created += 1
-    return created, assigned_users, skipped
+def _without_children(node, *children):
+    return {key: value for key, value in node.items() if key not in children}
+
+
+class OrgTreeView(APIView):
+    """Entities with their locations, departments and active shifts"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        return Response(get_org_tree(org_tree_scope(request.user)))
 
 
 class EntityListView(generics.ListAPIView):
@@ -120,8 +104,14 @@ class EntityListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = EntitySerializer
 
-    def get_queryset(self):
-        return Entity.objects.filter(is_active=True)
+    def list(self, request, *args, **kwargs):
+        entities = [
+            _without_children(entity, 'locations', 'departments') for entity in get_org_tree()
+        ]
+        page = self.paginate_queryset(entities)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(entities)
 
 
 class LocationListView(APIView):
@@ -129,22 +119,14 @@ class LocationListView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        locations = Location.objects.filter(is_active=True)
+        locations = iter_locations(get_org_tree())
 
         # Filter by entity if provided
         entity_id = request.query_params.get('entity_id')
         if entity_id:
-            locations = locations.filter(entity_id=entity_id)
+            locations = (loc for loc in locations if loc['entity'] == entity_id)
 
-        data = [{
-            'id': str(loc.id),
-            'entity': str(loc.entity_id),
-            'location_name': loc.location_name,
-            'city': loc.city,
-            'country': loc.country,
-            'is_active': loc.is_active,
-        } for loc in locations]
-        return Response(data)
+        return Response([_without_children(loc, 'departments') for loc in locations])
 
 
 class DepartmentListView(APIView):
@@ -152,45 +134,19 @@ class DepartmentListView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        departments = _department_queryset(request.user)
+        departments = iter_departments(get_org_tree(org_tree_scope(request.user)))
 
         # Filter by entity if provided
         entity_id = request.query_params.get('entity_id')
         if entity_id:
-            departments = departments.filter(entity_id=entity_id)
+            departments = (dept for dept in departments if dept['entity'] == entity_id)
 
         # Filter by location if provided - ONLY location-specific departments
         location_id = request.query_params.get('location_id')
         if location_id:
-            departments = departments.filter(location_id=location_id)
-
-        data = [{
-            'id': str(dept.id),
-            'entity': str(dept.entity_id),
-            'entity_name': dept.entity.entity_name,
-            'location': str(dept.location_id) if dept.location_id else None,
-            'location_name': dept.location.location_name if dept.location_id else None,
-            'department_name': dept.department_name,
-            'code': dept.code,
-            'holiday_requires_leave': dept.holiday_requires_leave,
-            'work_shifts': [{
-                'id': str(shift.id),
-                'name': shift.name,
-                'start_time': shift.start_time.strftime('%H:%M'),
-                'end_time': shift.end_time.strftime('%H:%M'),
-                'break_start_time': (
-                    shift.break_start_time.strftime('%H:%M')
-                    if shift.break_start_time else None
-                ),
-                'break_end_time': (
-                    shift.break_end_time.strftime('%H:%M')
-                    if shift.break_end_time else None
-                ),
-                'includes_weekends': shift.includes_weekends,
-            } for shift in dept.work_shifts.filter(is_active=True)],
-            'is_active': dept.is_active,
-        } for dept in departments]
-        return Response(data)
+            departments = (dept for dept in departments if dept['location'] == location_id)
+
+        return Response(list(departments))
 
 
 class WorkShiftListCreateView(APIView):
@@ -260,20 +216,17 @@ class WorkShiftListCreateView(APIView):
                     {'error': 'Selected entities have no active departments'},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            created, assigned_users, skipped = _create_shifts_for_departments(
-                departments,
-                shift_values,
-            )
-            if not created:
+            changes = create_shift_group(departments, shift_values)
+            if not changes.created:
                 return Response(
                     {'name': ['A work shift with this name already exists in every department of the selected entities.']},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
             return Response(
                 {
-                    'created': created,
-                    'assigned_users': assigned_users,
-                    'skipped': skipped,
+                    'created': len(changes.created),
+                    'assigned_users': len(changes.assigned_user_ids),
+                    'skipped': [department.department_name for department in changes.skipped],
                 },
                 status=status.HTTP_201_CREATED,
             )
@@ -287,20 +240,17 @@ class WorkShiftListCreateView(APIView):
             departments = list(entity.departments.filter(is_active=True))
             if not departments:
                 return Response({'error': 'Entity has no active departments'}, status=status.HTTP_400_BAD_REQUEST)
-            created, assigned_users, skipped = _create_shifts_for_departments(
-                departments,
-                shift_values,
-            )
-            if not created:
+            changes = create_shift_group(departments, shift_values)
+            if not changes.created:
                 return Response(
                     {'name': ['A work shift with this name already exists in every department of this entity.']},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
             return Response(
                 {
-                    'created': created,
-                    'assigned_users': assigned_users,
-                    'skipped': skipped,
+                    'created': len(changes.created),
+                    'assigned_users': len(changes.assigned_user_ids),
+                    'skipped': [department.department_name for department in changes.skipped],
                 },
                 status=status.HTTP_201_CREATED,
             )
@@ -308,16 +258,16 @@ class WorkShiftListCreateView(APIView):
         department = _department_queryset(request.user).filter(id=request.data.get('department_id')).first()
         if not department:
             return Response({'error': 'Department not found'}, status=status.HTTP_404_NOT_FOUND)
-        if WorkShift.objects.filter(department=department, name=name).exists():
+        # create_shift_group skips departments that already have the name,
+        # which also covers a concurrent insert after this view's checks.
+        changes = create_shift_group([department], shift_values)
+        if not changes.created:
             return Response(
                 {'name': ['A work shift with this name already exists in the department.']},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        with transaction.atomic():
-            shift = WorkShift.objects.create(department=department, **shift_values)
-            assigned_users = _assign_shift_to_unassigned_users(shift)
-        response_data = _serialize_shift(shift)
-        response_data['assigned_users'] = assigned_users
+        response_data = _serialize_shift(changes.created[0])
+        response_data['assigned_users'] = len(changes.assigned_user_ids)
         return Response(response_data, status=status.HTTP_201_CREATED)
 
 
@@ -426,64 +376,18 @@ class WorkShiftDetailView(APIView):
         ).exclude(id__in=group_ids).exists():
             next_group_id = uuid.uuid4()
 
-        shift_values = {
-            'name': shift.name,
-            'start_time': shift.start_time,
-            'end_time': shift.end_time,
-            'break_start_time': shift.break_start_time,
-            'break_end_time': shift.break_end_time,
-            'pattern_type': shift.pattern_type,
-            'cycle_days': shift.cycle_days,
-            'includes_weekends': shift.includes_weekends,
-        }
+        shift_values = {name: getattr(shift, name) for name in SHIFT_GROUP_FIELDS}
         with transaction.atomic():
             members = list(group.select_for_update())
-            retained_members = [
-                member for member in members
-                if member.department_id in desired_department_ids
-            ]
-            removed_members = [
-                member for member in members
-                if member.department_id not in desired_department_ids
-            ]
-            removed_ids = [member.id for member in removed_members]
-            unassigned_users = User.objects.filter(
-                work_shift_id__in=removed_ids,
-            ).update(work_shift=None) if removed_ids else 0
-            if removed_ids:
-                WorkShift.objects.filter(id__in=removed_ids).update(is_active=False)
-
-            assigned_users = 0
-            for member in retained_members:
-                member.management_group_id = next_group_id
-                for field, value in shift_values.items():
-                    setattr(member, field, value)
-                member.save()
-                assigned_users += _assign_shift_to_unassigned_users(member)
-
-            existing_department_ids = {member.department_id for member in members}
-            missing_departments = [
-                department for department in desired_departments
-                if department.id not in existing_department_ids
-            ]
-            created_members = []
-            for department in missing_departments:
-                member = WorkShift.objects.create(
-                    department=department,
-                    management_group_id=next_group_id,
-                    **shift_values,
-                )
-                assigned_users += _assign_shift_to_unassigned_users(member)
-                created_members.append(member)
+            changes = sync_shift_group(members, desired_departments, shift_values, next_group_id)
 
-        active_members = retained_members + created_members
-        response_data = _serialize_shift(active_members[0])
+        response_data = _serialize_shift(changes.members[0])
         response_data.update({
-            'updated': len(active_members),
-            'added_departments': len(created_members),
-            'removed_departments': len(removed_members),
-            'assigned_users': assigned_users,
-            'unassigned_users': unassigned_users,
+            'updated': len(changes.members),
+            'added_departments': len(changes.created),
+            'removed_departments': len(changes.deactivated),
+            'assigned_users': len(changes.assigned_user_ids),
+            'unassigned_users': len(changes.unassigned_user_ids),
         })
         return Response(response_data)
 
@@ -491,8 +395,7 @@ class WorkShiftDetailView(APIView):
         shift = self.get_shift(request, pk)
         if not shift:
             return Response({'error': 'Work shift not found'}, status=status.HTTP_404_NOT_FOUND)
-        with transaction.atomic():
-            self.get_group(request, shift).select_for_update().update(is_active=False)
+        deactivate_shift_group(self.get_group(request, shift))
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -0,0 +1,84 @@
+"""
+Bulk-import users from a CSV/XLSX onboarding file.
+
+Uses the same columns and validation as the admin import (UserResource).
+With --dry-run the whole file is validated and a report is printed, but
+nothing is saved:
+    python manage.py import_users onboarding.xlsx --dry-run
+"""
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from import_export.formats import base_formats
+
+from users.resources import UserResource
+
+FORMATS = {
+    '.csv': base_formats.CSV,
+    '.xlsx': base_formats.XLSX,
+    '.json': base_formats.JSON,
+}
+
+
+class Command(BaseCommand):
+    help = "Bulk-import users from a CSV/XLSX/JSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import (.csv, .xlsx or .json)')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate every row and report what would change without saving',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        dry_run = options['dry_run']
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in FORMATS:
+            raise CommandError(f"Unsupported file type '{extension}'; use one of {', '.join(FORMATS)}")
+
+        file_format = FORMATS[extension]()
+        try:
+            if file_format.is_binary():
+                with open(path, 'rb') as handle:
+                    dataset = file_format.create_dataset(handle.read())
+            else:
+                with open(path, encoding='utf-8-sig') as handle:
+                    dataset = file_format.create_dataset(handle.read())
+        except OSError as exc:
+            raise CommandError(f"Cannot read {path}: {exc}")
+
+        resource = UserResource()
+        result = resource.import_data(
+            dataset,
+            dry_run=dry_run,
+            use_transactions=True,
+            rollback_on_validation_errors=True,
+        )
+
+        if options['verbosity'] > 1:
+            for row_number, row in enumerate(result.rows, 1):
+                self.stdout.write(f"  row {row_number}: {row.import_type} {row.object_repr or ''}")
+        for row_number, errors in result.row_errors():
+            for error in errors:
+                self.stdout.write(f"  row {row_number}: {getattr(error, 'error', error)}")
+        for invalid in result.invalid_rows:
+            for field, messages in invalid.error_dict.items():
+                self.stdout.write(f"  row {invalid.number} {field}: {'; '.join(messages)}")
+        for error in result.base_errors:
+            self.stdout.write(f"  {error.error}")
+
+        totals = result.totals
+        summary = (
+            f"{totals['new']} new, {totals['update']} updated, {totals['skip']} unchanged, "
+            f"{totals['invalid']} invalid, {totals['error']} errors"
+        )
+        if dry_run:
+            self.stdout.write(f"Dry run: {summary}. Nothing was saved.")
+            return
+        if result.has_errors() or result.has_validation_errors():
+            raise CommandError(f"Import rolled back: {summary}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported users: {summary}; {resource.balances_created} leave balances created"
+        ))
@@ -0,0 +1,62 @@
+import unicodedata
+
+from django.db import migrations, models
+
+
+def normalize_search_text(*parts):
+    """Frozen copy of users.models.normalize_search_text as of this migration."""
+    text = ' '.join(part for part in parts if part)
+    text = unicodedata.normalize('NFKD', text.casefold().replace('đ', 'd'))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(text.split())
+
+
+def backfill_search_text(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    users = []
+    for user in User.objects.only('id', 'first_name', 'last_name', 'email', 'employee_code').iterator(chunk_size=1000):
+        user.search_text = normalize_search_text(user.first_name, user.last_name, user.email, user.employee_code)
+        users.append(user)
+    User.objects.bulk_update(users, ['search_text'], batch_size=1000)
+
+
+def create_search_index(apps, schema_editor):
+    # Substring search is served by a trigram index on PostgreSQL; other
+    # backends get a plain index, which still covers prefix matches.
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS users_search_text_trgm ON users USING gin (search_text gin_trgm_ops)'
+        )
+    else:
+        schema_editor.execute('CREATE INDEX IF NOT EXISTS users_search_text_idx ON users (search_text)')
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS users_search_text_trgm')
+    else:
+        schema_editor.execute('DROP INDEX IF EXISTS users_search_text_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_user_shift_cycle_start_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='search_text',
+            field=models.CharField(
+                blank=True,
+                default='',
+                editable=False,
+                help_text='Normalized name/email/employee code for directory search (maintained on save).',
+                max_length=600,
+            ),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
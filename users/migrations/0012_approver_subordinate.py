@@ -0,0 +1,39 @@
+# Generated by Django 6.1.2 on 2026-10-19 04:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_approver_links(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    ApproverSubordinate = apps.get_model('users', 'ApproverSubordinate')
+    links = []
+    users = User.objects.exclude(approver_1__isnull=True, approver_2__isnull=True)
+    for user_id, approver_1_id, approver_2_id in users.values_list('id', 'approver_1_id', 'approver_2_id').iterator(chunk_size=1000):
+        for approver_id in {approver_1_id, approver_2_id} - {None}:
+            links.append(ApproverSubordinate(approver_id=approver_id, subordinate_id=user_id))
+    ApproverSubordinate.objects.bulk_create(links, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0011_user_search_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApproverSubordinate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('approver', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subordinate_links', to=settings.AUTH_USER_MODEL)),
+                ('subordinate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='approver_links', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'approver_subordinates',
+                'constraints': [models.UniqueConstraint(fields=('approver', 'subordinate'), name='approver_subordinate_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_approver_links, migrations.RunPython.noop),
+    ]
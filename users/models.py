@@ -1,6 +1,7 @@
 """
 Custom User model with email authentication and role-based access
 """
+import unicodedata
 import uuid
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
@@ -8,6 +9,24 @@ from django.core.exceptions import ValidationError
 from django.core.validators import URLValidator
 
 
+# Columns whose change can complete onboarding (see users.signals.user_onboarded)
+ONBOARDING_FIELDS = frozenset({'entity', 'location', 'department', 'join_date'})
+
+# Columns mirrored into ApproverSubordinate (see users.signals)
+APPROVER_FIELDS = frozenset({'approver_1', 'approver_2'})
+
+# Columns folded into User.search_text for the user directory search
+SEARCH_SOURCE_FIELDS = frozenset({'first_name', 'last_name', 'email', 'employee_code'})
+
+
+def normalize_search_text(*parts):
+    """Casefold, strip accents and collapse whitespace for directory search."""
+    text = ' '.join(part for part in parts if part)
+    text = unicodedata.normalize('NFKD', text.casefold().replace('đ', 'd'))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(text.split())
+
+
 class UserManager(BaseUserManager):
     """Custom manager for email-based User model"""
 
@@ -90,6 +109,13 @@ class User(AbstractUser):
         default=True,
         help_text="Flag to force password change on first login"
     )
+    search_text = models.CharField(
+        max_length=600,
+        blank=True,
+        default='',
+        editable=False,
+        help_text="Normalized name/email/employee code for directory search (maintained on save).",
+    )
 
     # Use custom manager for email-based authentication
     objects = UserManager()
@@ -178,9 +204,77 @@ class User(AbstractUser):
         # This maintains backwards compatibility while using Django's proper validation
         self.full_clean()
 
+        self.search_text = self.build_search_text()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and SEARCH_SOURCE_FIELDS.intersection(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'search_text'}
+
         super().save(*args, **kwargs)
 
+    def build_search_text(self):
+        return normalize_search_text(self.first_name, self.last_name, self.email, self.employee_code)
+
     @property
     def has_completed_onboarding(self):
         """Check if user has completed onboarding (has entity, location, department)"""
-        return bool(self.entity and self.location and self.department)
+        return bool(self.entity_id and self.location_id and self.department_id)
+
+    @classmethod
+    def from_db(cls, db, field_names, values, **kwargs):
+        instance = super().from_db(db, field_names, values, **kwargs)
+        instance.take_onboarding_snapshot()
+        instance.take_approver_snapshot()
+        return instance
+
+    @property
+    def onboarding_snapshot(self):
+        """(entity_id, location_id, department_id, join_date) as last loaded or saved; None for new users."""
+        return getattr(self, '_onboarding_snapshot', None)
+
+    def take_onboarding_snapshot(self):
+        values = self.__dict__
+        fields = ('entity_id', 'location_id', 'department_id', 'join_date')
+        # Deferred columns are unknown; treat the snapshot as missing
+        snapshot = tuple(values[name] for name in fields) if all(name in values for name in fields) else None
+        self._onboarding_snapshot = snapshot
+        return snapshot
+
+    @property
+    def approver_snapshot(self):
+        """{approver_1_id, approver_2_id} as last loaded or saved; None for new users."""
+        return getattr(self, '_approver_snapshot', None)
+
+    def take_approver_snapshot(self):
+        values = self.__dict__
+        if 'approver_1_id' in values and 'approver_2_id' in values:
+            snapshot = frozenset({values['approver_1_id'], values['approver_2_id']} - {None})
+        else:
+            snapshot = None
+        self._approver_snapshot = snapshot
+        return snapshot
+
+
+class ApproverSubordinate(models.Model):
+    """
+    Maintained approver -> subordinate mapping.
+
+    One row per user for each of approver_1 and approver_2, kept in step by
+    users.signals (and the bulk user import), so "my subordinates" is an
+    indexed lookup instead of an OR across both approver columns.
+    """
+    approver = models.ForeignKey(User, on_delete=models.CASCADE, related_name='subordinate_links')
+    subordinate = models.ForeignKey(User, on_delete=models.CASCADE, related_name='approver_links')
+
+    class Meta:
+        db_table = 'approver_subordinates'
+        constraints = [
+            models.UniqueConstraint(fields=['approver', 'subordinate'], name='approver_subordinate_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.approver_id} -> {self.subordinate_id}"
+
+    @classmethod
+    def subordinate_ids(cls, approver):
+        """Subquery of user ids that have ``approver`` as approver 1 or 2."""
+        return cls.objects.filter(approver=approver).values('subordinate_id')
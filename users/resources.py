@@ -1,14 +1,26 @@
 """
 Django import-export resources for User model with validation.
 Supports CSV/XLSX import with organization references.
+
+Imports run in bulk: org and approver references are preloaded once per file
+(ImportLookups), rows are validated in memory, users are written with
+bulk_create/bulk_update in batches and initial leave balances and approver
+links are created in one pass after the import instead of per-row post_save
+signals.
 """
 import os
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from import_export import resources, fields
+from import_export.instance_loaders import CachedInstanceLoader
 from import_export.widgets import ForeignKeyWidget, BooleanWidget, Widget
+from django.contrib.auth.hashers import make_password
 from django.core.exceptions import ValidationError
+from django.db.models.functions import Lower
 from django.utils.dateparse import parse_date
 from datetime import datetime, date
 from .models import User
+from .utils import create_initial_leave_balances, invalidate_user_profiles, sync_subordinate_links
 from organizations.models import Entity, Location, Department
 
 
@@ -53,6 +65,115 @@ class DefaultTrueBooleanWidget(BooleanWidget):
         return super().clean(value, row, **kwargs)
 
 
+# FK fields resolved from ImportLookups (already validated as active rows)
+LOOKUP_FIELDS = ('entity', 'location', 'department', 'approver_1', 'approver_2', 'work_shift')
+
+
+def _cell(row, column):
+    value = row.get(column) if row else None
+    return str(value).strip() if value is not None else ''
+
+
+class ImportLookups:
+    """
+    Org and approver lookups for one import run.
+
+    ``preload(dataset)`` fetches every entity, location, department and
+    approver the file can reference in a handful of queries; the widgets then
+    resolve rows from memory. Keys that were not preloaded fall back to one
+    query each and are memoized.
+    """
+
+    def __init__(self):
+        self._entities = {}
+        self._locations = {}
+        self._departments = {}
+        self._approvers = {}
+        self._employee_codes = {}
+        self._loaded_entity_ids = set()
+
+    @classmethod
+    def from_dataset(cls, dataset):
+        lookups = cls()
+        lookups.preload(dataset)
+        return lookups
+
+    def preload(self, dataset):
+        rows = dataset.dict if dataset.headers else []
+        entity_codes = {_cell(row, 'Entity_Code') for row in rows} - {''}
+        for code in entity_codes:
+            self._entities[code] = None
+        entities = Entity.objects.filter(code__in=entity_codes, is_active=True)
+        for entity in entities:
+            self._entities[entity.code] = entity
+        entity_ids = [entity.id for entity in self._entities.values() if entity]
+        for location in Location.objects.filter(entity_id__in=entity_ids, is_active=True).select_related('entity'):
+            self._locations[(location.entity_id, location.location_name)] = location
+        for department in Department.objects.filter(entity_id__in=entity_ids, is_active=True).select_related('entity'):
+            self._departments[(department.entity_id, department.location_id, department.code)] = department
+        self._loaded_entity_ids.update(entity_ids)
+
+        approver_emails = {_cell(row, 'Approver_Email').lower() for row in rows} - {''}
+        for email in approver_emails:
+            self._approvers[email] = None
+        for user in User.objects.annotate(email_lower=Lower('email')).filter(
+            email_lower__in=approver_emails, is_active=True,
+        ):
+            self._approvers[user.email.lower()] = user
+
+        codes = {_cell(row, 'Employee_Code') for row in rows} - {''}
+        self._employee_codes.update(dict.fromkeys(codes))
+        self._employee_codes.update(
+            User.objects.filter(employee_code__in=codes).values_list('employee_code', 'email')
+        )
+
+    def entity(self, code):
+        if code not in self._entities:
+            self._entities[code] = Entity.objects.filter(code=code, is_active=True).first()
+        return self._entities[code]
+
+    def location(self, entity, location_name):
+        key = (entity.id, location_name)
+        if key not in self._locations and entity.id not in self._loaded_entity_ids:
+            self._locations[key] = Location.objects.filter(
+                entity=entity, location_name=location_name, is_active=True
+            ).select_related('entity').first()
+        return self._locations.get(key)
+
+    def department(self, entity, location, code):
+        key = (entity.id, location.id if location else None, code)
+        if key not in self._departments and entity.id not in self._loaded_entity_ids:
+            self._departments[key] = Department.objects.filter(
+                entity=entity, location=location, code=code, is_active=True
+            ).select_related('entity').first()
+        return self._departments.get(key)
+
+    def approver(self, email):
+        key = email.lower()
+        if key not in self._approvers:
+            self._approvers[key] = User.objects.filter(email__iexact=email, is_active=True).first()
+        return self._approvers[key]
+
+    def employee_code_owner(self, code):
+        """Email of the user already holding ``code`` (in the database or earlier in this file)."""
+        if code not in self._employee_codes:
+            self._employee_codes[code] = (
+                User.objects.filter(employee_code=code).values_list('email', flat=True).first()
+            )
+        return self._employee_codes[code]
+
+    def register(self, user):
+        """Make a row's user visible to later rows (as approver, code holder)."""
+        if user.is_active:
+            self._approvers[user.email.lower()] = user
+        if user.employee_code:
+            self._employee_codes[user.employee_code] = user.email
+
+
+def _lookups(kwargs):
+    return kwargs.get('lookups') or ImportLookups()
+
+
 class EntityForeignKeyWidget(ForeignKeyWidget):
     """Widget for looking up Entity by code."""
 
@@ -62,10 +183,10 @@ class EntityForeignKeyWidget(ForeignKeyWidget):
     def clean(self, value, row=None, **kwargs):
         if not value or str(value).strip() == '':
             return None
-        try:
-            return Entity.objects.get(code=str(value).strip(), is_active=True)
-        except Entity.DoesNotExist:
+        entity = _lookups(kwargs).entity(str(value).strip())
+        if entity is None:
             raise ValidationError(f"Entity with code '{value}' not found or inactive")
+        return entity
 
 
 class LocationByNameWidget(ForeignKeyWidget):
@@ -78,27 +199,23 @@ class LocationByNameWidget(ForeignKeyWidget):
         if not value or str(value).strip() == '':
             return None
         location_name = str(value).strip()
+        lookups = _lookups(kwargs)
 
         # Get entity from row
         entity_code = row.get('Entity_Code') if row else None
         if not entity_code:
             raise ValidationError(f"Entity_Code required when specifying Location_Name")
 
-        try:
-            entity = Entity.objects.get(code=str(entity_code).strip(), is_active=True)
-        except Entity.DoesNotExist:
+        entity = lookups.entity(str(entity_code).strip())
+        if entity is None:
             raise ValidationError(f"Entity with code '{entity_code}' not found or inactive")
 
-        try:
-            return Location.objects.get(
-                entity=entity,
-                location_name=location_name,
-                is_active=True
-            )
-        except Location.DoesNotExist:
+        location = lookups.location(entity, location_name)
+        if location is None:
             raise ValidationError(
                 f"Location '{location_name}' not found for Entity '{entity_code}'"
             )
+        return location
 
 
 class DepartmentByCodeWidget(ForeignKeyWidget):
@@ -111,55 +228,36 @@ class DepartmentByCodeWidget(ForeignKeyWidget):
         if not value or str(value).strip() == '':
             return None
         department_code = str(value).strip()
+        lookups = _lookups(kwargs)
 
         # Get entity from row
         entity_code = row.get('Entity_Code') if row else None
         if not entity_code:
             raise ValidationError(f"Entity_Code required when specifying Department_Code")
 
-        try:
-            entity = Entity.objects.get(code=str(entity_code).strip(), is_active=True)
-        except Entity.DoesNotExist:
+        entity = lookups.entity(str(entity_code).strip())
+        if entity is None:
             raise ValidationError(f"Entity with code '{entity_code}' not found or inactive")
 
         # Get location from row to match department at specific location
         location_name = row.get('Location_Name') if row else None
         location = None
         if location_name and str(location_name).strip():
-            try:
-                location = Location.objects.get(
-                    entity=entity,
-                    location_name=str(location_name).strip(),
-                    is_active=True
-                )
-            except Location.DoesNotExist:
+            location = lookups.location(entity, str(location_name).strip())
+            if location is None:
                 raise ValidationError(
                     f"Location '{location_name}' not found for Entity '{entity_code}'"
                 )
 
         # Try to find department with location first, fall back to entity-wide (location=null)
-        try:
-            return Department.objects.get(
-                entity=entity,
-                location=location,
-                code=department_code,
-                is_active=True
-            )
-        except Department.DoesNotExist:
-            # If no location-specific department found, try entity-wide (location=null)
-            if location:
-                try:
-                    return Department.objects.get(
-                        entity=entity,
-                        location__isnull=True,
-                        code=department_code,
-                        is_active=True
-                    )
-                except Department.DoesNotExist:
-                    pass
+        department = lookups.department(entity, location, department_code)
+        if department is None and location:
+            department = lookups.department(entity, None, department_code)
+        if department is None:
             raise ValidationError(
                 f"Department '{department_code}' not found for Entity '{entity_code}' at Location '{location_name}'"
             )
+        return department
 
 
 class ApproverByEmailWidget(ForeignKeyWidget):
@@ -171,12 +269,10 @@ class ApproverByEmailWidget(ForeignKeyWidget):
     def clean(self, value, row=None, **kwargs):
         if not value or str(value).strip() == '':
             return None
-        email = str(value).strip()
-
-        try:
-            return User.objects.get(email__iexact=email, is_active=True)
-        except User.DoesNotExist:
+        approver = _lookups(kwargs).approver(str(value).strip())
+        if approver is None:
             raise ValidationError(f"Approver with email '{value}' not found or inactive")
+        return approver
 
 
 def get_default_import_password():
@@ -187,6 +283,30 @@ def get_default_import_password():
     return password
 
 
+PASSWORD_HASH_WORKERS = 4
+
+
+def hash_import_passwords(dataset):
+    """
+    Hash every row's password up front, each with its own salt.
+
+    PBKDF2 releases the GIL, so a small thread pool spreads the per-row cost
+    over cores. Returns {raw_password: deque of hashes}, one hash per row.
+    Rows without a usable password are left to fail in import_instance().
+    """
+    raw_passwords = []
+    for row in (dataset.dict if dataset.headers else []):
+        try:
+            raw_passwords.append(_cell(row, 'Password') or get_default_import_password())
+        except ValueError:
+            continue
+    hashes = defaultdict(deque)
+    with ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS) as pool:
+        for raw_password, hashed in zip(raw_passwords, pool.map(make_password, raw_passwords)):
+            hashes[raw_password].append(hashed)
+    return hashes
+
+
 class PasswordWidget(Widget):
     """Widget that returns password value or default. Not saved directly — handled in after_save_instance."""
 
@@ -256,13 +376,98 @@ class UserResource(resources.ModelResource):
         )
         skip_unchanged = True
         report_skipped = True
-
-    def before_save_instance(self, instance, row, **kwargs):
-        """Set password before save so full_clean() passes."""
+        use_bulk = True
+        batch_size = 500
+        instance_loader_class = CachedInstanceLoader
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lookups = ImportLookups()
+        self.imported_users = []
+        self.balances_created = 0
+        self._seen_emails = set()
+        self._password_hashes = {}
+
+    def before_import(self, dataset, **kwargs):
+        """Preload every org/approver reference in the file."""
+        self.lookups = ImportLookups.from_dataset(dataset)
+        self.imported_users = []
+        self.balances_created = 0
+        self._seen_emails = set()
+        self._password_hashes = hash_import_passwords(dataset)
+
+    def import_instance(self, instance, row, **kwargs):
+        """Resolve fields from the preloaded lookups and check uniqueness in memory."""
+        errors = {}
+        try:
+            super().import_instance(instance, row, lookups=self.lookups, **kwargs)
+        except ValidationError as e:
+            errors = e.update_error_dict(errors)
+
+        email_key = (instance.email or '').lower()
+        if email_key in self._seen_emails:
+            errors['email'] = [f"Email '{instance.email}' appears more than once in this file"]
+        self._seen_emails.add(email_key)
+        if instance.employee_code:
+            owner = self.lookups.employee_code_owner(instance.employee_code)
+            if owner and owner.lower() != email_key:
+                errors['employee_code'] = [
+                    f"Employee code '{instance.employee_code}' is already used by {owner}"
+                ]
+
+        # Fields User.save() would normally fill, needed before full_clean()
+        instance.username = instance.email
         raw_password = row.get('Password', '').strip() or get_default_import_password()
-        instance.set_password(raw_password)
+        pending = self._password_hashes.get(raw_password)
+        instance.password = pending.popleft() if pending else make_password(raw_password)
         instance.first_login = True
 
+        if errors:
+            raise ValidationError(errors)
+
+    def get_queryset(self):
+        # User.clean() reads work_shift; load it with the existing rows
+        return super().get_queryset().select_related('work_shift')
+
+    def validate_instance(self, instance, import_validation_errors=None, validate_unique=True):
+        """
+        Run User.full_clean() (bulk_create skips User.save()) without per-row queries.
+
+        Foreign keys come from the preloaded active objects and uniqueness was
+        checked in import_instance(), so both are excluded here.
+        """
+        errors = dict(import_validation_errors or {})
+        try:
+            instance.full_clean(exclude=[*errors, *LOOKUP_FIELDS], validate_unique=False)
+        except ValidationError as e:
+            errors = e.update_error_dict(errors)
+        if errors:
+            raise ValidationError(errors)
+
+    def before_save_instance(self, instance, row, **kwargs):
+        instance.search_text = instance.build_search_text()
+        self.lookups.register(instance)
+        self.imported_users.append(instance)
+
+    def get_bulk_update_fields(self):
+        return [
+            field.attribute for name, field in self.fields.items()
+            if field.attribute and name not in self._meta.import_id_fields
+        ] + ['username', 'password', 'first_login', 'search_text']
+
+    def after_import(self, dataset, result, **kwargs):
+        """Create initial balances and approver links for imported users, drop cached profiles."""
+        super().after_import(dataset, result, **kwargs)
+        if kwargs.get('dry_run') or result.has_errors() or not self.imported_users:
+            return
+        onboarded = [
+            user for user in self.imported_users
+            if user.entity_id and user.location_id and user.department_id
+        ]
+        self.balances_created = create_initial_leave_balances(onboarded)
+        sync_subordinate_links(self.imported_users)
+        invalidate_user_profiles()
+
     def before_import_row(self, row, **kwargs):
         """Clean up None values and set defaults before import."""
         # Handle None values
@@ -4,7 +4,7 @@ Serializers for User Authentication and Management
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
-from django.core.cache import cache
+from django.core.cache import caches
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.core.validators import URLValidator
 from organizations.models import Entity, Location, Department, WorkShift
@@ -50,7 +50,8 @@ class LoginSerializer(serializers.Serializer):
         if not (email and password):
             raise serializers.ValidationError(GENERIC_LOGIN_ERROR)
 
-        # Check if account is locked out
+        # Check if account is locked out (shared tier: every worker sees the count)
+        cache = caches['shared']
         cache_key = f"login_fail_{email.lower()}"
         fail_count = cache.get(cache_key, 0)
 
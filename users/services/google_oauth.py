@@ -1,26 +1,116 @@
-"""Google OAuth 2.0 token validation service."""
-import requests
+"""
+Google OAuth 2.0 token validation service.
+
+ID tokens are verified locally against Google's published signing keys
+(JWKS). Keys are cached in this process and in the shared cache for the
+max-age Google advertises, and refetched when a token names an unknown
+``kid`` (key rotation), so steady-state logins make no network call.
+"""
 import logging
+import re
+import threading
 import time
+
+import jwt
+import requests
 from django.conf import settings
-from django.core.cache import cache
+from django.core.cache import caches
 
 logger = logging.getLogger(__name__)
 
 
-# Token info endpoint for validating Google ID tokens
-GOOGLE_TOKENINFO_URL = "https://oauth2.googleapis.com/tokeninfo"
+# Google's JWKS endpoint for ID token signing keys
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ('accounts.google.com', 'https://accounts.google.com')
+GOOGLE_ID_TOKEN_ALGORITHMS = ['RS256']
+
+JWKS_CACHE_KEY = 'google-oauth:jwks'
+# Used when the certs response carries no Cache-Control max-age
+JWKS_DEFAULT_MAX_AGE = 3600
+# Unknown kids trigger at most one refetch per interval (forged kids cannot hammer Google)
+JWKS_MIN_REFRESH_INTERVAL = 60
+JWKS_FETCH_TIMEOUT = 5
+
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+_jwks_lock = threading.Lock()
+_jwks_state = {'keys': {}, 'expires_at': 0.0, 'fetched_at': 0.0}
+
+
+def _max_age(response) -> int:
+    match = _MAX_AGE_RE.search(response.headers.get('Cache-Control', ''))
+    return int(match.group(1)) if match else JWKS_DEFAULT_MAX_AGE
+
+
+def _load_keys(jwks: dict, expires_at: float) -> None:
+    """Parse a JWKS document into the process cache."""
+    keys = {}
+    for jwk in jwks.get('keys', []):
+        try:
+            keys[jwk['kid']] = jwt.PyJWK(jwk).key
+        except (KeyError, jwt.PyJWKError) as e:
+            logger.warning(f"Skipping unusable Google signing key: {e}")
+    _jwks_state['keys'] = keys
+    _jwks_state['expires_at'] = expires_at
+
+
+def _fetch_jwks() -> None:
+    """Download Google's signing keys into the process and shared caches."""
+    _jwks_state['fetched_at'] = time.time()
+    try:
+        response = requests.get(GOOGLE_CERTS_URL, timeout=JWKS_FETCH_TIMEOUT)
+        response.raise_for_status()
+        jwks = response.json()
+    except (requests.RequestException, ValueError) as e:
+        logger.error(f"Failed to fetch Google signing keys: {e}")
+        raise ValueError(f"Failed to validate token: {str(e)}")
+
+    max_age = _max_age(response)
+    expires_at = time.time() + max_age
+    caches['shared'].set(JWKS_CACHE_KEY, {'jwks': jwks, 'expires_at': expires_at}, max_age)
+    _load_keys(jwks, expires_at)
+
+
+def get_google_signing_key(kid: str):
+    """
+    Return the public key for ``kid``, or None if Google does not publish it.
+
+    Lookup order: process cache, shared cache, then Google (on expiry, or on
+    a kid miss at most once per JWKS_MIN_REFRESH_INTERVAL).
+    """
+    with _jwks_lock:
+        now = time.time()
+        if _jwks_state['expires_at'] > now and kid in _jwks_state['keys']:
+            return _jwks_state['keys'][kid]
+
+        shared = caches['shared'].get(JWKS_CACHE_KEY)
+        if shared and shared['expires_at'] > now and shared['expires_at'] != _jwks_state['expires_at']:
+            _load_keys(shared['jwks'], shared['expires_at'])
+            if kid in _jwks_state['keys']:
+                return _jwks_state['keys'][kid]
+
+        expired = _jwks_state['expires_at'] <= now
+        if expired or now - _jwks_state['fetched_at'] >= JWKS_MIN_REFRESH_INTERVAL:
+            _fetch_jwks()
+        return _jwks_state['keys'].get(kid)
+
+
+def clear_google_signing_keys() -> None:
+    """Forget cached signing keys in this process and the shared cache."""
+    with _jwks_lock:
+        _jwks_state.update({'keys': {}, 'expires_at': 0.0, 'fetched_at': 0.0})
+        caches['shared'].delete(JWKS_CACHE_KEY)
 
 
 def validate_google_id_token(id_token: str) -> dict | None:
     """
-    Validate a Google ID token by calling Google's tokeninfo endpoint.
+    Validate a Google ID token's signature and claims locally.
 
     Args:
         id_token: The JWT ID token from Google Sign-In
 
     Returns:
-        dict: Token payload if valid, None if invalid
+        dict: Token payload if valid
 
     Raises:
         ValueError: If token is invalid or client ID doesn't match
@@ -29,50 +119,45 @@ def validate_google_id_token(id_token: str) -> dict | None:
         raise ValueError("ID token is required")
 
     try:
-        # Call Google's tokeninfo endpoint to validate token
-        response = requests.get(
-            f"{GOOGLE_TOKENINFO_URL}?id_token={id_token}",
-            timeout=10
-        )
-        response.raise_for_status()
-
-        token_data = response.json()
-
-        # Verify the token is intended for our app
-        client_id = getattr(settings, 'GOOGLE_CLIENT_ID', None)
-        if client_id and token_data.get('aud') != client_id:
-            logger.warning(
-                f"Token audience mismatch: expected {client_id}, "
-                f"got {token_data.get('aud')}"
-            )
-            raise ValueError("Invalid token: audience mismatch")
-
-        # Check issuer is Google
-        if token_data.get('iss') not in (
-            'accounts.google.com',
-            'https://accounts.google.com'
-        ):
-            logger.warning(f"Invalid token issuer: {token_data.get('iss')}")
-            raise ValueError("Invalid token: issuer not Google")
-
-        # Check token is not expired (exp is Unix timestamp in seconds)
-        # Google API returns exp as string, convert to float for comparison
-        exp = token_data.get('exp', 0)
-        try:
-            exp = float(exp)
-        except (ValueError, TypeError):
-            logger.warning(f"Invalid exp format: {exp}")
-            raise ValueError("Invalid token: malformed expiration")
+        header = jwt.get_unverified_header(id_token)
+    except jwt.PyJWTError:
+        raise ValueError("Invalid token: malformed")
 
-        if exp < time.time():
-            logger.warning("Token has expired")
-            raise ValueError("Invalid token: expired")
+    if header.get('alg') not in GOOGLE_ID_TOKEN_ALGORITHMS:
+        logger.warning(f"Unexpected token algorithm: {header.get('alg')}")
+        raise ValueError("Invalid token: unsupported algorithm")
 
-        return token_data
+    key = get_google_signing_key(header.get('kid'))
+    if key is None:
+        logger.warning(f"Unknown token signing key: {header.get('kid')}")
+        raise ValueError("Invalid token: unknown signing key")
 
-    except requests.RequestException as e:
-        logger.error(f"Failed to validate token with Google: {e}")
-        raise ValueError(f"Failed to validate token: {str(e)}")
+    # Verify the token is intended for our app
+    client_id = getattr(settings, 'GOOGLE_CLIENT_ID', None)
+    try:
+        token_data = jwt.decode(
+            id_token,
+            key,
+            algorithms=GOOGLE_ID_TOKEN_ALGORITHMS,
+            audience=client_id or None,
+            options={'verify_aud': bool(client_id), 'require': ['exp', 'iss', 'sub']},
+        )
+    except jwt.ExpiredSignatureError:
+        logger.warning("Token has expired")
+        raise ValueError("Invalid token: expired")
+    except jwt.InvalidAudienceError:
+        logger.warning(f"Token audience mismatch: expected {client_id}")
+        raise ValueError("Invalid token: audience mismatch")
+    except jwt.PyJWTError as e:
+        logger.warning(f"Invalid Google token: {e}")
+        raise ValueError("Invalid token: signature verification failed")
+
+    # Check issuer is Google
+    if token_data.get('iss') not in GOOGLE_ISSUERS:
+        logger.warning(f"Invalid token issuer: {token_data.get('iss')}")
+        raise ValueError("Invalid token: issuer not Google")
+
+    return token_data
 
 
 def extract_user_info(token_data: dict) -> dict:
@@ -1,53 +1,93 @@
 """
-User signals for auto-creating LeaveBalance on user onboarding.
-"""
-from datetime import date
-from decimal import Decimal
+User signals: LeaveBalance creation on onboarding, approver mapping upkeep
+and profile cache invalidation.
 
-from django.db.models.signals import post_save
-from django.dispatch import receiver
-from django.utils import timezone
+``user_onboarded`` is sent only when a save moves a user into the onboarded
+state (entity, location and department all set) or changes an onboarded
+user's join date. Ordinary saves (sign-in, avatar, profile edits) compare the
+in-memory snapshot taken when the user was loaded and issue no balance
+queries.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
 
-from .models import User
-from leaves.models import LeaveBalance
-from leaves.services import calculate_vacation_hours
+from .models import APPROVER_FIELDS, ONBOARDING_FIELDS, User
+from .utils import (
+    PROFILE_USER_FIELDS,
+    create_initial_leave_balances,
+    invalidate_user_profiles,
+    sync_subordinate_links,
+)
+from organizations.models import Department, Entity, Location, WorkShift
 
-# Fixed defaults for non-dynamic balance types
-FIXED_BALANCE_DEFAULTS = {
-    'SICK': Decimal('40.00'),
-}
+# Sent with ``user`` and ``created`` (True for a brand-new user)
+user_onboarded = Signal()
 
 
 @receiver(post_save, sender=User)
-def create_leave_balance_on_onboarding(sender, instance, created, **kwargs):
+def detect_onboarding(sender, instance, created, update_fields=None, **kwargs):
+    """Fire user_onboarded on the transition into onboarding or a join-date change."""
+    if update_fields is not None and not ONBOARDING_FIELDS.intersection(update_fields):
+        return
+
+    previous = instance.onboarding_snapshot
+    current = instance.take_onboarding_snapshot()
+    if not instance.has_completed_onboarding or previous == current:
+        return
+
+    was_onboarded = previous is not None and all(previous[:3])
+    if created or not was_onboarded or previous[3] != current[3]:
+        user_onboarded.send(sender=User, user=instance, created=created)
+
+
+@receiver(user_onboarded)
+def create_leave_balances_on_onboarding(sender, user, **kwargs):
     """
-    Auto-create LeaveBalance when user completes onboarding.
+    Create the current year's missing LeaveBalance rows in one bulk insert.
 
     Vacation uses dynamic allocation based on years of service.
     Sick uses a fixed default.
     """
-    if instance.has_completed_onboarding:
-        current_year = timezone.now().year
-
-        # Skip if balances already exist (created by utility in ViewSet)
-        if LeaveBalance.objects.filter(user=instance, year=current_year).exists():
-            return
-
-        reference_date = date(current_year, 1, 1)
-
-        for balance_type in LeaveBalance.BalanceType.values:
-            if balance_type == 'VACATION':
-                hours = calculate_vacation_hours(
-                    instance.join_date, reference_date
-                )
-            else:
-                hours = FIXED_BALANCE_DEFAULTS.get(
-                    balance_type, Decimal('0.00')
-                )
-
-            LeaveBalance.objects.update_or_create(
-                user=instance,
-                year=current_year,
-                balance_type=balance_type,
-                defaults={'allocated_hours': hours},
-            )
+    create_initial_leave_balances([user])
+
+
+@receiver(post_save, sender=User)
+def sync_approver_links(sender, instance, created, update_fields=None, **kwargs):
+    """Refresh the user's ApproverSubordinate rows when an approver field changes."""
+    if update_fields is not None and not APPROVER_FIELDS.intersection(update_fields):
+        return
+    current = frozenset({instance.approver_1_id, instance.approver_2_id} - {None})
+    if instance.approver_snapshot == current and not created:
+        return
+    if created and not current:
+        instance.take_approver_snapshot()
+        return
+    sync_subordinate_links([instance])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_profiles_on_user_change(sender, instance, update_fields=None, **kwargs):
+    """
+    Drop cached profile payloads when a user changes.
+
+    A user appears in other payloads as approver or subordinate, so the whole
+    namespace is bumped. Saves limited to non-profile columns (last_login on
+    every sign-in) keep the cache.
+    """
+    if update_fields is not None and not PROFILE_USER_FIELDS.intersection(update_fields):
+        return
+    invalidate_user_profiles()
+
+
+@receiver(post_save, sender=Entity)
+@receiver(post_save, sender=Location)
+@receiver(post_save, sender=Department)
+@receiver(post_save, sender=WorkShift)
+@receiver(post_delete, sender=Entity)
+@receiver(post_delete, sender=Location)
+@receiver(post_delete, sender=Department)
+@receiver(post_delete, sender=WorkShift)
+def invalidate_profiles_on_org_change(sender, **kwargs):
+    """Org names and shift definitions are rendered into cached profiles."""
+    invalidate_user_profiles()
@@ -0,0 +1,87 @@
+"""Tests for the maintained approver -> subordinate mapping and team listings on it."""
+from datetime import date, timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from leaves.models import BusinessTrip
+from users.models import ApproverSubordinate, User
+from users.utils import build_user_response
+
+
+def make_user(email, **extra):
+    return User.objects.create_user(email=email, password='TestPass123!', **extra)
+
+
+def links():
+    return set(ApproverSubordinate.objects.values_list('approver__email', 'subordinate__email'))
+
+
+@pytest.mark.django_db
+def test_mapping_follows_approver_changes():
+    lead = make_user('lead@example.com')
+    final = make_user('final@example.com')
+    report = make_user('report@example.com', approver_1=lead)
+    assert links() == {('lead@example.com', 'report@example.com')}
+
+    report = User.objects.get(pk=report.pk)
+    report.approver_2 = final
+    report.save()
+    assert links() == {
+        ('lead@example.com', 'report@example.com'),
+        ('final@example.com', 'report@example.com'),
+    }
+
+    report.approver_1 = None
+    report.save(update_fields=['approver_1'])
+    assert links() == {('final@example.com', 'report@example.com')}
+
+    final.delete()
+    assert links() == set()
+
+
+@pytest.mark.django_db
+def test_saves_without_approver_changes_skip_the_mapping():
+    lead = make_user('lead2@example.com')
+    report = User.objects.get(pk=make_user('report2@example.com', approver_1=lead).pk)
+
+    with CaptureQueriesContext(connection) as queries:
+        report.first_name = 'Minh'
+        report.save()
+        report.save(update_fields=['last_login'])
+
+    assert not any('approver_subordinates' in query['sql'] for query in queries.captured_queries)
+    assert build_user_response(lead)['subordinates'][0]['email'] == 'report2@example.com'
+
+
+@pytest.mark.django_db
+def test_team_trips_are_cursor_paginated_over_subordinates():
+    manager = make_user('manager@example.com')
+    reports = [make_user(f'member{index}@example.com', approver_2=manager) for index in range(2)]
+    outsider = make_user('outsider@example.com')
+    start = date(2027, 3, 1)
+    for offset in range(5):
+        for user in [*reports, outsider]:
+            BusinessTrip.objects.create(
+                user=user, city='Osaka', country='Japan',
+                start_date=start + timedelta(days=offset), end_date=start + timedelta(days=offset),
+            )
+    client = APIClient()
+    client.force_authenticate(user=manager)
+
+    seen, cursor = [], None
+    while True:
+        response = client.get('/api/v1/leaves/business-trips/team/', {'page_size': 4, 'cursor': cursor or ''})
+        assert response.status_code == 200
+        assert 'count' not in response.data
+        seen.extend(response.data['results'])
+        cursor = response.data['next_cursor']
+        if not cursor:
+            break
+
+    assert len(seen) == 10
+    assert len({trip['id'] for trip in seen}) == 10
+    assert [trip['start_date'] for trip in seen] == sorted((trip['start_date'] for trip in seen), reverse=True)
+    assert client.get('/api/v1/leaves/business-trips/team/', {'cursor': 'bogus'}).status_code == 400
@@ -0,0 +1,134 @@
+"""Tests for local Google ID token verification against a cached JWKS."""
+import time
+from unittest.mock import patch
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from rest_framework.test import APIClient
+
+from users.services import google_oauth
+from users.services.google_oauth import (
+    JWKS_CACHE_KEY,
+    clear_google_signing_keys,
+    validate_google_id_token,
+)
+
+User = get_user_model()
+
+CLIENT_ID = 'test-client.apps.googleusercontent.com'
+
+
+def make_key(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    jwk.update({'kid': kid, 'alg': 'RS256', 'use': 'sig'})
+    return private_key, jwk
+
+
+def sign(private_key, kid, **claims):
+    payload = {
+        'iss': 'https://accounts.google.com',
+        'aud': CLIENT_ID,
+        'sub': '1234567890',
+        'email': 'oauth@example.com',
+        'email_verified': True,
+        'exp': int(time.time()) + 300,
+        **claims,
+    }
+    return jwt.encode(payload, private_key, algorithm='RS256', headers={'kid': kid})
+
+
+class FakeCertsResponse:
+    def __init__(self, jwks, max_age=3600):
+        self._jwks = jwks
+        self.headers = {'Cache-Control': f'public, max-age={max_age}, must-revalidate'}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._jwks
+
+
+@pytest.fixture
+def key_a():
+    return make_key('key-a')
+
+
+@pytest.fixture
+def certs(key_a, settings):
+    settings.GOOGLE_CLIENT_ID = CLIENT_ID
+    clear_google_signing_keys()
+    documents = [{'keys': [key_a[1]]}]
+    with patch.object(
+        google_oauth.requests, 'get', side_effect=lambda *args, **kwargs: FakeCertsResponse(documents[0])
+    ) as fetch:
+        fetch.documents = documents
+        yield fetch
+    clear_google_signing_keys()
+
+
+@pytest.mark.django_db
+def test_keys_are_fetched_once_and_shared(certs, key_a):
+    token = sign(key_a[0], 'key-a')
+
+    assert validate_google_id_token(token)['email'] == 'oauth@example.com'
+    assert validate_google_id_token(token)['sub'] == '1234567890'
+    assert certs.call_count == 1
+    assert caches['shared'].get(JWKS_CACHE_KEY)['jwks'] == {'keys': [key_a[1]]}
+
+    # Another worker process starts with an empty local cache
+    google_oauth._jwks_state.update({'keys': {}, 'expires_at': 0.0})
+    validate_google_id_token(token)
+    assert certs.call_count == 1
+
+
+@pytest.mark.django_db
+def test_unknown_kid_refreshes_keys_at_most_once_per_interval(certs, key_a, monkeypatch):
+    validate_google_id_token(sign(key_a[0], 'key-a'))
+    key_b = make_key('key-b')
+    certs.documents[0] = {'keys': [key_a[1], key_b[1]]}
+
+    # Inside the refresh interval an unknown kid is rejected without a refetch
+    with pytest.raises(ValueError, match='unknown signing key'):
+        validate_google_id_token(sign(key_b[0], 'key-b'))
+    assert certs.call_count == 1
+
+    monkeypatch.setattr(google_oauth, 'JWKS_MIN_REFRESH_INTERVAL', 0)
+    assert validate_google_id_token(sign(key_b[0], 'key-b'))['sub'] == '1234567890'
+    assert certs.call_count == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('claims,message', [
+    ({'aud': 'someone-else'}, 'audience mismatch'),
+    ({'exp': int(time.time()) - 60}, 'expired'),
+    ({'iss': 'https://evil.example.com'}, 'issuer not Google'),
+])
+def test_rejects_invalid_claims(certs, key_a, claims, message):
+    with pytest.raises(ValueError, match=message):
+        validate_google_id_token(sign(key_a[0], 'key-a', **claims))
+
+
+@pytest.mark.django_db
+def test_rejects_token_signed_by_another_key(certs):
+    forged_key, _ = make_key('key-a')
+
+    with pytest.raises(ValueError, match='signature verification failed'):
+        validate_google_id_token(sign(forged_key, 'key-a'))
+
+
+@pytest.mark.django_db
+def test_google_login_endpoint_uses_local_verification(certs, key_a):
+    User.objects.create_user(email='oauth@example.com', password='TestPass123!')
+
+    response = APIClient().post(
+        '/api/v1/auth/google/', {'id_token': sign(key_a[0], 'key-a')}, format='json'
+    )
+
+    assert response.status_code == 200
+    assert 'access' in response.data['user']['tokens']
+    assert User.objects.get(email='oauth@example.com').google_id == '1234567890'
@@ -0,0 +1,83 @@
+"""Tests for the user_onboarded event that creates initial leave balances."""
+from datetime import date
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from leaves.models import LeaveBalance
+from organizations.models import Department, Entity, Location
+from users.models import User
+from users.signals import user_onboarded
+
+
+@pytest.fixture
+def org():
+    entity = Entity.objects.create(entity_name='Onboarding Co', code='ONB')
+    location = Location.objects.create(
+        entity=entity, location_name='HQ', city='Hanoi', country='Vietnam', timezone='Asia/Ho_Chi_Minh'
+    )
+    department = Department.objects.create(
+        entity=entity, location=location, department_name='Ops', code='ONBOPS'
+    )
+    return {'entity': entity, 'location': location, 'department': department}
+
+
+@pytest.fixture
+def events():
+    received = []
+
+    def listener(sender, user, created, **kwargs):
+        received.append((user.pk, created))
+
+    user_onboarded.connect(listener)
+    yield received
+    user_onboarded.disconnect(listener)
+
+
+def balance_queries(queries):
+    return [query['sql'] for query in queries.captured_queries if '"leave_balances"' in query['sql']]
+
+
+@pytest.mark.django_db
+def test_completing_onboarding_creates_every_balance_type_once(org, events):
+    user = User.objects.create_user(email='new@example.com', password='TestPass123!')
+    assert events == []
+
+    user = User.objects.get(pk=user.pk)
+    user.entity, user.location, user.department = org['entity'], org['location'], org['department']
+    user.save()
+    user.save()
+
+    assert events == [(user.pk, False)]
+    assert set(LeaveBalance.objects.filter(user=user).values_list('balance_type', flat=True)) == set(
+        LeaveBalance.BalanceType.values
+    )
+
+
+@pytest.mark.django_db
+def test_routine_saves_issue_no_balance_queries(org, events):
+    user = User.objects.create_user(email='routine@example.com', password='TestPass123!', **org)
+    assert events == [(user.pk, True)]
+    user = User.objects.get(pk=user.pk)
+
+    with CaptureQueriesContext(connection) as queries:
+        user.save(update_fields=['last_login'])
+        user.first_name = 'Mai'
+        user.save()
+
+    assert balance_queries(queries) == []
+    assert len(events) == 1
+
+
+@pytest.mark.django_db
+def test_join_date_change_fires_event(org, events):
+    user = User.objects.create_user(
+        email='rejoin@example.com', password='TestPass123!', join_date=date(2020, 1, 1), **org
+    )
+    user = User.objects.get(pk=user.pk)
+
+    user.join_date = date(2024, 6, 1)
+    user.save(update_fields=['join_date'])
+
+    assert events == [(user.pk, True), (user.pk, False)]
@@ -0,0 +1,76 @@
+"""Tests for the cached profile payload behind build_user_response."""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from organizations.models import Department, Entity, Location
+from users.models import User
+from users.utils import build_user_response
+
+
+@pytest.fixture
+def org():
+    entity = Entity.objects.create(entity_name='Profile Cache Co', code='PCC')
+    location = Location.objects.create(
+        entity=entity, location_name='HQ', city='Hanoi', country='Vietnam', timezone='Asia/Ho_Chi_Minh'
+    )
+    department = Department.objects.create(
+        entity=entity, location=location, department_name='Ops', code='PCCOPS'
+    )
+    return {'entity': entity, 'location': location, 'department': department}
+
+
+def make_user(email, org, **extra):
+    return User.objects.create_user(email=email, password='TestPass123!', **org, **extra)
+
+
+@pytest.mark.django_db
+def test_second_call_is_served_from_cache(org):
+    manager = make_user('manager@example.com', org)
+    for index in range(3):
+        make_user(f'report{index}@example.com', org, approver_1=manager)
+    manager = User.objects.get(pk=manager.pk)
+
+    with CaptureQueriesContext(connection) as first:
+        cold = build_user_response(manager)
+    manager = User.objects.get(pk=manager.pk)
+    with CaptureQueriesContext(connection) as second:
+        warm = build_user_response(manager)
+
+    assert warm == cold
+    assert cold['is_approver'] is True
+    assert [sub['entity'] for sub in cold['subordinates']] == ['Profile Cache Co'] * 3
+    # Subordinates and their entities come from one query
+    assert sum('"users"' in query['sql'] for query in first.captured_queries) == 1
+    assert len(second) < len(first)
+    assert not any('"users"' in query['sql'] for query in second.captured_queries)
+
+
+@pytest.mark.django_db
+def test_user_and_org_changes_invalidate_payload(org):
+    manager = make_user('lead@example.com', org)
+    report = make_user('member@example.com', org, approver_1=manager)
+    assert build_user_response(report)['approver']['first_name'] == ''
+
+    manager.first_name = 'Lan'
+    manager.save()
+    assert build_user_response(report)['approver']['full_name'] == 'Lan'
+
+    org['entity'].entity_name = 'Renamed Co'
+    org['entity'].save()
+    assert build_user_response(report)['entity_name'] == 'Renamed Co'
+    assert build_user_response(manager)['subordinates'][0]['entity'] == 'Renamed Co'
+
+
+@pytest.mark.django_db
+def test_last_login_save_keeps_cache_and_tokens_are_not_cached(org):
+    user = make_user('login@example.com', org)
+    first = build_user_response(user, include_tokens=True)
+
+    user.save(update_fields=['last_login'])
+    with CaptureQueriesContext(connection) as queries:
+        second = build_user_response(user)
+
+    assert 'tokens' in first
+    assert 'tokens' not in second
+    assert not any('"users"' in query['sql'] for query in queries.captured_queries)
@@ -0,0 +1,139 @@
+"""Tests for the bulk user import pipeline (UserResource / import_users)."""
+from io import StringIO
+
+import pytest
+import tablib
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from leaves.models import LeaveBalance
+from organizations.models import Department, Entity, Location
+from users.models import User
+from users.resources import UserResource
+
+HEADERS = [
+    'Email', 'First_Name', 'Last_Name', 'Employee_Code', 'Entity_Code',
+    'Location_Name', 'Department_Code', 'Approver_Email', 'Join_Date',
+]
+
+
+@pytest.fixture(autouse=True)
+def import_password(monkeypatch):
+    monkeypatch.setenv('DEFAULT_IMPORT_PASSWORD', 'Welcome123!')
+
+
+@pytest.fixture
+def org():
+    entity = Entity.objects.create(entity_name='Import Co', code='IMP')
+    location = Location.objects.create(
+        entity=entity, location_name='Saigon', city='HCMC', country='Vietnam', timezone='Asia/Ho_Chi_Minh'
+    )
+    Department.objects.create(entity=entity, location=location, department_name='Ops', code='OPS')
+    Department.objects.create(entity=entity, location=None, department_name='Finance', code='FIN')
+    return entity
+
+
+def make_dataset(rows):
+    return tablib.Dataset(*rows, headers=HEADERS)
+
+
+def employee_rows(count, offset=0, approver='boss@example.com'):
+    return [
+        (
+            f'new{offset + index}@example.com', 'New', f'Hire{offset + index}', f'E{offset + index:04d}',
+            'IMP', 'Saigon', 'OPS' if index % 2 else 'FIN', approver, '2024-03-01',
+        )
+        for index in range(count)
+    ]
+
+
+def boss_row():
+    return ('boss@example.com', 'Big', 'Boss', 'B0001', 'IMP', 'Saigon', 'OPS', '', '2020-01-01')
+
+
+def run_import(rows, dry_run=False):
+    with CaptureQueriesContext(connection) as queries:
+        result = UserResource().import_data(make_dataset(rows), dry_run=dry_run, use_transactions=True)
+    return result, len(queries)
+
+
+@pytest.mark.django_db
+def test_query_count_does_not_grow_with_row_count(org):
+    small, small_queries = run_import([boss_row()] + employee_rows(3))
+    large, large_queries = run_import(employee_rows(30, offset=100))
+
+    assert not small.has_errors() and not small.has_validation_errors()
+    assert not large.has_errors() and not large.has_validation_errors()
+    assert large_queries <= small_queries
+    assert User.objects.filter(email__startswith='new').count() == 33
+
+
+@pytest.mark.django_db
+def test_import_resolves_org_and_approvers_and_creates_balances(org):
+    result, _ = run_import([boss_row()] + employee_rows(2))
+
+    assert result.totals['new'] == 3
+    hire = User.objects.select_related('department', 'approver_1').get(email='new0@example.com')
+    assert hire.department.code == 'FIN'
+    assert hire.approver_1.email == 'boss@example.com'
+    assert hire.username == hire.email
+    assert hire.first_login is True
+    assert hire.check_password('Welcome123!')
+    assert 'hire0' in hire.search_text
+    assert LeaveBalance.objects.filter(user=hire).count() == len(LeaveBalance.BalanceType.values)
+
+
+@pytest.mark.django_db
+def test_imported_passwords_are_salted_per_user(org):
+    run_import([boss_row()] + employee_rows(3))
+
+    hires = list(User.objects.filter(email__startswith='new'))
+    assert len({hire.password for hire in hires}) == len(hires) == 3
+    assert all(hire.check_password('Welcome123!') for hire in hires)
+
+
+@pytest.mark.django_db
+def test_invalid_rows_are_reported_in_memory(org):
+    User.objects.create_user(email='holder@example.com', password='x', employee_code='E0000')
+    rows = employee_rows(1, offset=1, approver='') + [
+        ('dup@example.com', 'A', 'B', 'E0000', 'IMP', 'Saigon', 'OPS', '', ''),
+        ('ghost@example.com', 'A', 'B', '', 'NOPE', '', '', '', ''),
+        ('late@example.com', 'A', 'B', '', 'IMP', 'Nowhere', '', 'missing@example.com', ''),
+    ]
+
+    result, _ = run_import(rows, dry_run=True)
+
+    errors = {row.number: row.error_dict for row in result.invalid_rows}
+    assert set(errors) == {2, 3, 4}
+    assert 'employee_code' in errors[2]
+    assert errors[3] == {'__all__': ["Entity with code 'NOPE' not found or inactive"]}
+    assert errors[4] == {'__all__': ["Location 'Nowhere' not found for Entity 'IMP'"]}
+
+
+@pytest.mark.django_db
+def test_import_users_command_dry_run_report(org, tmp_path):
+    path = tmp_path / 'onboarding.csv'
+    dataset = make_dataset([boss_row()] + employee_rows(2))
+    path.write_text(dataset.export('csv'))
+    out = StringIO()
+
+    call_command('import_users', str(path), '--dry-run', stdout=out)
+
+    assert 'Dry run: 3 new, 0 updated, 0 unchanged, 0 invalid, 0 errors' in out.getvalue()
+    assert not User.objects.filter(email='boss@example.com').exists()
+
+    call_command('import_users', str(path), stdout=out)
+    assert '3 new' in out.getvalue()
+    assert User.objects.filter(email__in=['boss@example.com', 'new0@example.com', 'new1@example.com']).count() == 3
+
+
+@pytest.mark.django_db
+def test_import_users_command_rolls_back_on_invalid_rows(org, tmp_path):
+    path = tmp_path / 'onboarding.csv'
+    path.write_text(make_dataset(employee_rows(1, approver='missing@example.com')).export('csv'))
+
+    with pytest.raises(CommandError, match='rolled back'):
+        call_command('import_users', str(path), stdout=StringIO())
+    assert not User.objects.filter(email='new0@example.com').exists()
@@ -197,7 +197,7 @@ class UserManagementApiTests(TestCase):
         response = self.client.get('/api/v1/auth/users/')
 
         self.assertEqual(response.status_code, 200)
-        user_ids = {item['id'] for item in response.data}
+        user_ids = {item['id'] for item in response.data['results']}
         self.assertIn(str(self.first_approver.id), user_ids)
         self.assertNotIn(str(self.other_user.id), user_ids)
 
@@ -208,12 +208,12 @@ class UserManagementApiTests(TestCase):
         users_response = self.client.get('/api/v1/auth/users/')
 
         self.assertEqual(options_response.status_code, 200)
-        option_ids = {item['id'] for item in options_response.data}
-        managed_user_ids = {item['id'] for item in users_response.data}
+        option_ids = {item['id'] for item in options_response.data['results']}
+        managed_user_ids = {item['id'] for item in users_response.data['results']}
         self.assertIn(str(self.other_user.id), option_ids)
         self.assertNotIn(str(self.other_user.id), managed_user_ids)
         other_option = next(
-            item for item in options_response.data
+            item for item in options_response.data['results']
             if item['id'] == str(self.other_user.id)
         )
         self.assertEqual(other_option['entity_name'], self.other_entity.entity_name)
@@ -229,7 +229,7 @@ class UserManagementApiTests(TestCase):
         response = self.client.get('/api/v1/auth/users/')
 
         self.assertEqual(response.status_code, 200)
-        user_ids = {item['id'] for item in response.data}
+        user_ids = {item['id'] for item in response.data['results']}
         self.assertIn(str(self.first_approver.id), user_ids)
         self.assertIn(str(self.other_user.id), user_ids)
 
@@ -427,5 +427,73 @@ class UserManagementApiTests(TestCase):
         )
 
         self.assertEqual(list_response.status_code, 200)
-        self.assertEqual(list_response.data, [])
+        self.assertEqual(list_response.data['results'], [])
         self.assertEqual(balance_response.status_code, 404)
+
+    def test_user_list_is_cursor_paginated(self):
+        first_page = self.client.get('/api/v1/auth/users/', {'page_size': 2})
+        second_page = self.client.get(
+            '/api/v1/auth/users/',
+            {'page_size': 2, 'cursor': first_page.data['next_cursor']},
+        )
+
+        self.assertEqual(first_page.status_code, 200)
+        self.assertTrue(first_page.data['has_next'])
+        self.assertEqual(len(first_page.data['results']), 2)
+        first_ids = {item['id'] for item in first_page.data['results']}
+        second_ids = {item['id'] for item in second_page.data['results']}
+        self.assertFalse(first_ids & second_ids)
+        self.assertEqual(
+            self.client.get('/api/v1/auth/users/', {'cursor': 'garbage'}).status_code,
+            400,
+        )
+
+    def test_user_search_matches_name_email_and_employee_code(self):
+        employee = User.objects.create_user(
+            email='nguyen.thao@example.com',
+            password='UserPass123!',
+            first_name='Thảo',
+            last_name='Nguyễn',
+            employee_code='EMP-0042',
+            entity=self.entity,
+        )
+
+        for term in ('thao', 'NGUYEN th', 'emp-004', 'nguyen.thao@'):
+            response = self.client.get('/api/v1/auth/users/', {'search': term})
+            self.assertEqual(
+                [item['id'] for item in response.data['results']], [str(employee.id)], term
+            )
+
+        employee.first_name = 'Linh'
+        employee.save(update_fields=['first_name'])
+        response = self.client.get('/api/v1/auth/users/', {'search': 'linh nguyen'})
+        self.assertEqual([item['id'] for item in response.data['results']], [str(employee.id)])
+
+    def test_user_stats_aggregate_the_visible_directory(self):
+        self.other_user.status = User.Status.INACTIVE
+        self.other_user.save(update_fields=['status'])
+
+        response = self.client.get('/api/v1/auth/users/stats/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data,
+            {'total': 6, 'active': 5, 'without_approver': 4},
+        )
+
+        self.client.force_authenticate(user=self.other_user)
+        self.assertEqual(self.client.get('/api/v1/auth/users/stats/').status_code, 403)
+
+    def test_approver_options_typeahead_projection(self):
+        self.client.force_authenticate(user=self.hr)
+
+        response = self.client.get(
+            '/api/v1/auth/users/approver-options/', {'search': 'approver', 'page_size': 2}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['has_next'])
+        self.assertEqual(
+            set(response.data['results'][0]),
+            {'id', 'email', 'first_name', 'last_name', 'entity_name'},
+        )
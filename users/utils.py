@@ -7,7 +7,6 @@ from typing import Dict, Any
 from zoneinfo import ZoneInfo
 
 from django.contrib.auth import get_user_model
-from django.db.models import Q
 from django.utils import timezone as dj_timezone
 
 User = get_user_model()
@@ -105,6 +104,62 @@ def create_initial_leave_balance(user):
         )
 
 
+def create_initial_leave_balances(users, year=None) -> int:
+    """Bulk variant of create_initial_leave_balance for imports.
+
+    Creates any missing current-year balance rows for ``users`` with a
+    constant number of queries. Returns the number of rows created.
+    """
+    from leaves.models import LeaveBalance
+    from leaves.services import calculate_vacation_hours
+
+    year = year or dj_timezone.now().year
+    users = {user.pk: user for user in users}
+    existing = set(
+        LeaveBalance.objects.filter(user_id__in=users, year=year).values_list('user_id', 'balance_type')
+    )
+    reference_date = date(year, 1, 1)
+    vacation_hours = {}
+    balances = []
+    for user in users.values():
+        for balance_type in LeaveBalance.BalanceType.values:
+            if (user.pk, balance_type) in existing:
+                continue
+            if balance_type == LeaveBalance.BalanceType.VACATION:
+                if user.join_date not in vacation_hours:
+                    vacation_hours[user.join_date] = calculate_vacation_hours(user.join_date, reference_date)
+                hours = vacation_hours[user.join_date]
+            else:
+                hours = FIXED_BALANCE_DEFAULTS.get(balance_type, Decimal('0.00'))
+            balances.append(LeaveBalance(
+                user_id=user.pk, year=year, balance_type=balance_type, allocated_hours=hours,
+            ))
+    LeaveBalance.objects.bulk_create(balances, batch_size=1000, ignore_conflicts=True)
+    return len(balances)
+
+
+def sync_subordinate_links(users) -> None:
+    """Rewrite the ApproverSubordinate rows of ``users`` from their approver fields.
+
+    One DELETE and one INSERT regardless of how many users are passed.
+    """
+    from users.models import ApproverSubordinate
+
+    users = list(users)
+    ApproverSubordinate.objects.filter(subordinate_id__in=[user.pk for user in users]).delete()
+    ApproverSubordinate.objects.bulk_create(
+        [
+            ApproverSubordinate(approver_id=approver_id, subordinate_id=user.pk)
+            for user in users
+            for approver_id in {user.approver_1_id, user.approver_2_id} - {None}
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    for user in users:
+        user.take_approver_snapshot()
+
+
 def blacklist_all_refresh_tokens(user: User) -> None:
     """Blacklist every outstanding refresh token for the user (logout everywhere)."""
     from rest_framework_simplejwt.token_blacklist.models import (
@@ -116,16 +171,54 @@ def blacklist_all_refresh_tokens(user: User) -> None:
         BlacklistedToken.objects.get_or_create(token=token)
 
 
-def build_user_response(user: User, include_tokens: bool = False) -> Dict[str, Any]:
-    """Build standardized user response dict.
+PROFILE_CACHE_NAMESPACE = 'user-profile'
+PROFILE_CACHE_TIMEOUT = 60 * 60
 
-    Args:
-        user: User instance
-        include_tokens: Whether to include JWT tokens in response
+# User columns rendered into the cached profile payload (own or as approver/subordinate).
+PROFILE_USER_FIELDS = frozenset({
+    'employee_code', 'email', 'role', 'status', 'entity', 'location', 'department',
+    'first_name', 'last_name', 'first_login', 'work_shift', 'join_date', 'avatar_url',
+    'approver_1', 'approver_2', 'is_active',
+})
 
-    Returns:
-        Dictionary with user data matching API response format
-    """
+
+def invalidate_user_profiles() -> None:
+    """Drop every cached profile payload (user, approver, org or shift change)."""
+    from core.cache import bump_cache_namespace
+
+    bump_cache_namespace(PROFILE_CACHE_NAMESPACE)
+
+
+def invalidate_user_profiles_for(user_ids) -> None:
+    """Drop the cached profile payloads of ``user_ids`` only (e.g. shift reassignment)."""
+    from django.core.cache import cache
+    from core.cache import cache_namespace_version
+
+    if not user_ids:
+        return
+    version = cache_namespace_version(PROFILE_CACHE_NAMESPACE)
+    cache.delete_many([f"{PROFILE_CACHE_NAMESPACE}:{version}:{user_id}" for user_id in user_ids])
+
+
+def _profile_cache_key(user: User) -> str:
+    from core.cache import cache_namespace_version
+
+    version = cache_namespace_version(PROFILE_CACHE_NAMESPACE)
+    return f"{PROFILE_CACHE_NAMESPACE}:{version}:{user.pk}"
+
+
+def _person_summary(person: User) -> Dict[str, Any]:
+    return {
+        'id': str(person.id),
+        'email': person.email,
+        'first_name': person.first_name,
+        'last_name': person.last_name,
+        'full_name': f"{person.first_name or ''} {person.last_name or ''}".strip() or person.email,
+    }
+
+
+def _build_profile_payload(user: User) -> Dict[str, Any]:
+    """Build the stable, cacheable part of the user response."""
     response = {
         'id': str(user.id),
         'employee_code': user.employee_code,
@@ -155,9 +248,6 @@ def build_user_response(user: User, include_tokens: bool = False) -> Dict[str, A
             'includes_weekends': shift.includes_weekends,
             'cycle_days': shift.cycle_days,
         }
-        work_shift_today = _build_work_shift_today(user)
-        if work_shift_today:
-            response['work_shift_today'] = work_shift_today
 
     # Add optional fields for specific endpoints
     if hasattr(user, 'join_date') and user.join_date:
@@ -167,45 +257,59 @@ def build_user_response(user: User, include_tokens: bool = False) -> Dict[str, A
 
     # Add approver information (for all users)
     if hasattr(user, 'approver_1') and user.approver_1:
-        approver = user.approver_1
-        response['approver'] = {
-            'id': str(approver.id),
-            'email': approver.email,
-            'first_name': approver.first_name,
-            'last_name': approver.last_name,
-            'full_name': f"{approver.first_name or ''} {approver.last_name or ''}".strip() or approver.email,
-        }
+        response['approver'] = _person_summary(user.approver_1)
     if hasattr(user, 'approver_2') and user.approver_2:
-        final_approver = user.approver_2
-        response['final_approver'] = {
-            'id': str(final_approver.id),
-            'email': final_approver.email,
-            'first_name': final_approver.first_name,
-            'last_name': final_approver.last_name,
-            'full_name': f"{final_approver.first_name or ''} {final_approver.last_name or ''}".strip() or final_approver.email,
-        }
+        response['final_approver'] = _person_summary(user.approver_2)
 
     # Check if user is an approver for anyone (controls Manager Ticket visibility)
-    from users.models import User as UserModel
-    subordinates = UserModel.objects.filter(
-        Q(approver_1=user) | Q(approver_2=user),
-        is_active=True
-    ).distinct()
-    response['is_approver'] = subordinates.exists()
-
-    if subordinates.exists():
+    from users.models import ApproverSubordinate, User as UserModel
+    subordinates = list(
+        UserModel.objects.filter(
+            id__in=ApproverSubordinate.subordinate_ids(user),
+            is_active=True
+        ).select_related('entity')
+    )
+    response['is_approver'] = bool(subordinates)
+
+    if subordinates:
         response['subordinates'] = [
             {
-                'id': str(sub.id),
-                'email': sub.email,
-                'first_name': sub.first_name,
-                'last_name': sub.last_name,
-                'full_name': f"{sub.first_name or ''} {sub.last_name or ''}".strip() or sub.email,
+                **_person_summary(sub),
                 'entity': sub.entity.entity_name if sub.entity else None,
             }
             for sub in subordinates
         ]
 
+    return response
+
+
+def build_user_response(user: User, include_tokens: bool = False) -> Dict[str, Any]:
+    """Build standardized user response dict.
+
+    The profile portion is cached per user under the 'user-profile' namespace
+    (see invalidate_user_profiles); today's shift and tokens are computed on
+    every call.
+
+    Args:
+        user: User instance
+        include_tokens: Whether to include JWT tokens in response
+
+    Returns:
+        Dictionary with user data matching API response format
+    """
+    from django.core.cache import cache
+
+    cache_key = _profile_cache_key(user)
+    response = cache.get(cache_key)
+    if response is None:
+        response = _build_profile_payload(user)
+        cache.set(cache_key, response, PROFILE_CACHE_TIMEOUT)
+
+    if 'work_shift' in response:
+        work_shift_today = _build_work_shift_today(user)
+        if work_shift_today:
+            response['work_shift_today'] = work_shift_today
+
     if include_tokens:
         from rest_framework_simplejwt.tokens import RefreshToken
         refresh = RefreshToken.for_user(user)
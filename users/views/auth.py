@@ -3,12 +3,12 @@
 from rest_framework import generics, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.db import IntegrityError
 import logging
 
+from core.throttling import SharedAnonRateThrottle
 from ..utils import build_user_response
 from ..services.google_oauth import validate_google_id_token, extract_user_info
 
@@ -16,7 +16,7 @@ User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
-class GoogleOAuthRateThrottle(AnonRateThrottle):
+class GoogleOAuthRateThrottle(SharedAnonRateThrottle):
     """Rate limit for Google OAuth endpoint to prevent abuse."""
     rate = '10/minute'
 
@@ -6,7 +6,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from users.permissions import IsHROrAdmin
-from leaves.models import LeaveBalance
+from leaves.balance_ledger import record_entry
+from leaves.models import LeaveBalance, LeaveBalanceEntry
 from leaves.constants import DEFAULT_YEARLY_ALLOCATION
 from core.services.notification_service import create_balance_adjusted_notification
 
@@ -86,13 +87,19 @@ class UserBalanceAdjustView(generics.GenericAPIView):
             defaults={'allocated_hours': Decimal(str(DEFAULT_YEARLY_ALLOCATION))}
         )
 
-        # Calculate adjustment
-        old_allocated = balance.allocated_hours
-        balance.allocated_hours = allocated_hours
-        balance.save()
+        # Record the change in the balance ledger instead of rewriting the row
+        delta = allocated_hours - balance.totals.allocated_hours
+        record_entry(
+            balance,
+            LeaveBalanceEntry.EntryType.ADJUSTMENT,
+            allocated_hours=delta,
+            created_by=hr_admin,
+            note=reason,
+        )
+        totals = balance.totals
 
         # Calculate adjustment amount
-        adjustment = float(allocated_hours - old_allocated)
+        adjustment = float(delta)
 
         # Create notification for the user
         if adjustment != 0:
@@ -102,9 +109,9 @@ class UserBalanceAdjustView(generics.GenericAPIView):
             'id': str(balance.id),
             'user_id': str(target_user.id),
             'year': balance.year,
-            'allocated_hours': float(balance.allocated_hours),
-            'used_hours': float(balance.used_hours),
-            'adjusted_hours': float(balance.adjusted_hours),
-            'remaining_hours': float(balance.remaining_hours),
+            'allocated_hours': float(totals.allocated_hours),
+            'used_hours': float(totals.used_hours),
+            'adjusted_hours': float(totals.adjusted_hours),
+            'remaining_hours': float(totals.remaining_hours),
             'message': f'Balance adjusted by {adjustment:+.1f} hours'
         }, status=status.HTTP_200_OK)
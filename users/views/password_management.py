@@ -10,9 +10,9 @@ from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from rest_framework import generics, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle
 
 from core.services.email_service import send_password_reset_email
+from core.throttling import SharedAnonRateThrottle
 from users.utils import blacklist_all_refresh_tokens, build_user_response
 
 User = get_user_model()
@@ -24,7 +24,7 @@ GENERIC_RESET_REQUEST_MESSAGE = (
 INVALID_RESET_LINK_ERROR = "Invalid or expired reset link."
 
 
-class PasswordResetRequestThrottle(AnonRateThrottle):
+class PasswordResetRequestThrottle(SharedAnonRateThrottle):
     """Limit unauthenticated reset requests: 5 per hour per IP."""
 
     # Distinct scope so we do not share the global anon throttle cache key.
@@ -2,28 +2,57 @@
 User ViewSet for HR/Admin user management
 """
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Count, Q
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from .models import User
+from core.pagination import InvalidCursor, keyset_paginate
+
+from .models import ApproverSubordinate, User, normalize_search_text
 from .serializers.serializers import UserSerializer, UserUpdateSerializer, UserCreateSerializer
 
+# Directory pages are keyset-paginated on (first_name, last_name, id)
+DIRECTORY_ORDERING = ('first_name', 'last_name', 'id')
+DIRECTORY_PAGE_SIZE = 100
+DIRECTORY_MAX_PAGE_SIZE = 500
+TYPEAHEAD_PAGE_SIZE = 20
+TYPEAHEAD_MAX_PAGE_SIZE = 50
+MAX_SEARCH_LENGTH = 100
+
+
+def _page_size(params, default, maximum):
+    try:
+        return min(max(int(params.get('page_size', default)), 1), maximum)
+    except (TypeError, ValueError):
+        return default
+
+
+def _search_users(queryset, term):
+    """
+    Filter on User.search_text; every whitespace-separated term must match.
+
+    search_text is stored normalized, so a case-sensitive ``contains`` is
+    enough and stays indexable (trigram on PostgreSQL).
+    """
+    for token in normalize_search_text(term[:MAX_SEARCH_LENGTH]).split():
+        queryset = queryset.filter(search_text__contains=token)
+    return queryset
+
 
 class UserViewSet(viewsets.ModelViewSet):
     """
     ViewSet for user management (HR/Admin only)
 
-    - list: GET /api/v1/auth/users/ - List all users
+    - list: GET /api/v1/auth/users/?search=&cursor=&page_size= - Paginated user directory
     - retrieve: GET /api/v1/auth/users/{id}/ - Get user details
     - update: PUT/PATCH /api/v1/auth/users/{id}/ - Update user (including approver)
     - subordinates: GET /api/v1/auth/users/my-subordinates/ - Get current user's subordinates
     """
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
-    # Disable pagination to return all users at once
+    # list() and approver_options() page with keyset cursors instead
     pagination_class = None
 
     def get_queryset(self):
@@ -45,10 +74,10 @@ class UserViewSet(viewsets.ModelViewSet):
             )
         elif user.role == User.Role.MANAGER:
             return User.objects.filter(
-                Q(approver_1=user) | Q(approver_2=user)
+                id__in=ApproverSubordinate.subordinate_ids(user)
             ).select_related(
                 'entity', 'location', 'department', 'approver_1', 'approver_2'
-            ).distinct()
+            )
         else:
             # Employees can only see themselves
             return User.objects.filter(id=user.id).select_related(
@@ -63,6 +92,28 @@ class UserViewSet(viewsets.ModelViewSet):
             return UserUpdateSerializer
         return UserSerializer
 
+    def list(self, request, *args, **kwargs):
+        """Return one keyset page of the visible users, optionally filtered by ?search=."""
+        params = request.query_params
+        queryset = self.get_queryset()
+        if params.get('search'):
+            queryset = _search_users(queryset, params['search'])
+
+        page_size = _page_size(params, DIRECTORY_PAGE_SIZE, DIRECTORY_MAX_PAGE_SIZE)
+        try:
+            users, next_cursor = keyset_paginate(
+                queryset, DIRECTORY_ORDERING, page_size,
+                cursor=params.get('cursor'), descending=False,
+            )
+        except InvalidCursor:
+            return Response({'error': 'Invalid cursor.'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'page_size': page_size,
+            'has_next': next_cursor is not None,
+            'next_cursor': next_cursor,
+            'results': UserSerializer(users, many=True).data,
+        })
+
     def create(self, request, *args, **kwargs):
         """Create new user (HR/ADMIN only). Auto-sets password with first_login=True."""
         if request.user.role not in [User.Role.HR, User.Role.ADMIN]:
@@ -147,29 +198,74 @@ class UserViewSet(viewsets.ModelViewSet):
 
         return super().destroy(request, *args, **kwargs)
 
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """
+        Directory totals for the user management page (HR/Admin).
+
+        GET /api/v1/auth/users/stats/
+        The directory itself is keyset-paginated without counts, so totals
+        come from one aggregate over the same visible users.
+        """
+        if request.user.role not in [User.Role.HR, User.Role.ADMIN]:
+            return Response(
+                {'error': 'Only HR and Admin can view user statistics.'},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        needs_approver = Q(role__in=[User.Role.EMPLOYEE, User.Role.MANAGER], approver_1__isnull=True)
+        return Response(self.get_queryset().order_by().aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(status=User.Status.ACTIVE)),
+            without_approver=Count('id', filter=needs_approver),
+        ))
+
     @action(detail=False, methods=['get'], url_path='approver-options')
     def approver_options(self, request):
-        """Return active users across entities for HR/Admin approver assignment."""
+        """
+        Typeahead for approver pickers: active users across entities (HR/Admin).
+
+        GET /api/v1/auth/users/approver-options/?search=&cursor=&page_size=
+        Returns a small projection (id, name, email, entity name) per row.
+        """
         if request.user.role not in [User.Role.HR, User.Role.ADMIN]:
             return Response(
                 {'error': 'Only HR and Admin can view approver options.'},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
+        params = request.query_params
         users = User.objects.filter(
             is_active=True,
             status=User.Status.ACTIVE,
-        ).select_related('entity').order_by('first_name', 'last_name', 'email')
-        return Response([
-            {
-                'id': str(user.id),
-                'email': user.email,
-                'first_name': user.first_name,
-                'last_name': user.last_name,
-                'entity_name': user.entity.entity_name if user.entity else None,
-            }
-            for user in users
-        ])
+        ).select_related('entity').only(
+            'id', 'email', 'first_name', 'last_name', 'entity__entity_name',
+        )
+        if params.get('search'):
+            users = _search_users(users, params['search'])
+
+        page_size = _page_size(params, TYPEAHEAD_PAGE_SIZE, TYPEAHEAD_MAX_PAGE_SIZE)
+        try:
+            users, next_cursor = keyset_paginate(
+                users, DIRECTORY_ORDERING, page_size,
+                cursor=params.get('cursor'), descending=False,
+            )
+        except InvalidCursor:
+            return Response({'error': 'Invalid cursor.'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'has_next': next_cursor is not None,
+            'next_cursor': next_cursor,
+            'results': [
+                {
+                    'id': str(user.id),
+                    'email': user.email,
+                    'first_name': user.first_name,
+                    'last_name': user.last_name,
+                    'entity_name': user.entity.entity_name if user.entity else None,
+                }
+                for user in users
+            ],
+        })
 
     @action(detail=False, methods=['get'], url_path='my-subordinates')
     def my_subordinates(self, request):
@@ -179,9 +275,9 @@ class UserViewSet(viewsets.ModelViewSet):
         Returns list of users who have the current user as first or second approver
         """
         subordinates = User.objects.filter(
-            Q(approver_1=request.user) | Q(approver_2=request.user),
+            id__in=ApproverSubordinate.subordinate_ids(request.user),
             is_active=True
-        ).select_related('entity', 'location', 'department', 'approver_1', 'approver_2').distinct()
+        ).select_related('entity', 'location', 'department', 'approver_1', 'approver_2')
 
         serializer = UserSerializer(subordinates, many=True)
         return Response(serializer.data)